@@ -0,0 +1,201 @@
+# 원본: app/baseball_data/driver_pool.py, 복사본: ai/gcp/driver_pool.py (고친 뒤 ai/gcp/sync_shared_modules.py로 동기화)
+import os
+import time
+import queue
+import shutil
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+
+# 풀 크기 / 대여 대기 시간 (환경 변수로 조정 가능)
+DRIVER_POOL_SIZE = int(os.getenv("CRAWL_DRIVER_POOL_SIZE", "3"))
+DRIVER_LEASE_TIMEOUT = float(os.getenv("CRAWL_DRIVER_LEASE_TIMEOUT", "300"))
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path():
+    """
+    chromedriver 경로를 프로세스에서 한 번만 찾음
+    CHROMEDRIVER_PATH 환경 변수 → PATH의 chromedriver → ChromeDriverManager().install() (네트워크 확인) 순서
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            path = os.getenv("CHROMEDRIVER_PATH") or shutil.which("chromedriver")
+            if not path:
+                from webdriver_manager.chrome import ChromeDriverManager
+                path = ChromeDriverManager().install()
+            _driver_path = path
+            print(f"chromedriver 경로: {_driver_path}")
+        return _driver_path
+
+
+def default_chrome_options():
+    """헤드리스 크롬 기본 옵션"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--log-level=3")
+    chrome_options.page_load_strategy = 'eager'
+    return chrome_options
+
+
+def new_driver(options_factory=None):
+    """찾아 둔 chromedriver로 크롬 드라이버 생성"""
+    options = (options_factory or default_chrome_options)()
+    return webdriver.Chrome(service=Service(resolve_driver_path()), options=options)
+
+
+def _percentile(values, ratio):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+class DriverPool:
+    """
+    미리 띄워 둔 헤드리스 브라우저 N개를 빌려 쓰고 돌려주는 풀
+
+    with pool.lease() as driver:
+        pool.load(driver, url)   # 페이지 로딩 시간 기록
+        ...
+
+    빌린 드라이버에서 WebDriverException이 나면 그 드라이버는 종료하고 새로 띄워 풀에 넣습니다.
+    """
+
+    def __init__(self, size=None, options_factory=None, warm=True):
+        self.size = max(1, size or DRIVER_POOL_SIZE)
+        self.options_factory = options_factory
+        self._idle = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._starting = 0
+        self._startup_ms = []
+        self._load_ms = []
+        self._leases = 0
+        self._recycled = 0
+        if warm:
+            self._start(self.size)
+
+    def _new_driver(self):
+        started = time.perf_counter()
+        driver = new_driver(self.options_factory)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._startup_ms.append(elapsed_ms)
+            self._all.append(driver)
+        return driver
+
+    def _start(self, count):
+        """브라우저 count개를 동시에 띄움"""
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            for driver in executor.map(lambda _: self._new_driver(), range(count)):
+                self._idle.put(driver)
+        print(f"브라우저 {count}개 준비 완료 ({time.perf_counter() - started:.2f}초)")
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """드라이버 하나를 빌림. 블록이 끝나면 풀로 돌려줌"""
+        if self._closed:
+            raise RuntimeError("이미 종료된 드라이버 풀입니다.")
+        with self._lock:
+            # 아직 띄우지 않은 자리가 있으면 필요할 때 띄움 (warm=False)
+            start_new = self._idle.empty() and len(self._all) + self._starting < self.size
+            if start_new:
+                self._starting += 1
+        if start_new:
+            try:
+                driver = self._new_driver()
+            finally:
+                with self._lock:
+                    self._starting -= 1
+        else:
+            driver = self._idle.get(timeout=timeout if timeout is not None else DRIVER_LEASE_TIMEOUT)
+        with self._lock:
+            self._leases += 1
+        try:
+            yield driver
+        except WebDriverException:
+            # 브라우저가 망가졌을 수 있으므로 새로 띄운 드라이버로 교체
+            self._discard(driver)
+            driver = None  # 종료한 드라이버는 풀로 돌려주지 않음
+            with self._lock:
+                self._recycled += 1
+            if not self._closed:
+                try:
+                    driver = self._new_driver()
+                except Exception as e:
+                    # 교체에 실패하면 자리를 비워 두고 다음 lease()에서 다시 띄움 (원래 오류를 그대로 전달)
+                    print(f"브라우저 교체 실패: {e}")
+            raise
+        finally:
+            if driver is not None:
+                if self._closed:
+                    self._quit(driver)
+                else:
+                    self._idle.put(driver)
+
+    def load(self, driver, url):
+        """driver.get(url)을 실행하고 로딩 시간을 기록"""
+        started = time.perf_counter()
+        driver.get(url)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._load_ms.append(elapsed_ms)
+        return elapsed_ms
+
+    def stats(self):
+        """브라우저 시작 시간과 페이지 로딩 시간 통계"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "started": len(self._startup_ms),
+                "startup_ms_avg": round(sum(self._startup_ms) / len(self._startup_ms), 1) if self._startup_ms else 0.0,
+                "startup_ms_max": round(max(self._startup_ms), 1) if self._startup_ms else 0.0,
+                "leases": self._leases,
+                "recycled": self._recycled,
+                "page_loads": len(self._load_ms),
+                "page_load_ms_p50": round(_percentile(self._load_ms, 0.5), 1),
+                "page_load_ms_p95": round(_percentile(self._load_ms, 0.95), 1),
+            }
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"브라우저 종료 중 오류: {e}")
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        self._quit(driver)
+
+    def close(self):
+        """풀의 모든 브라우저 종료 (빌려 간 드라이버는 돌려줄 때 종료)"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+        print(f"드라이버 풀 종료: {self.stats()}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -4,7 +4,7 @@ from datetime import date as date_dt
 import threading, time, schedule, datetime, logging, os, json, requests
 
 from daily_summary import generate_daily_message
-from news_crawler import crawl_news, save_to_json
+from news_crawler import crawl_all_news, save_to_json, TEAMS
 from news_daily_highlight_v2 import generate_daily_summary_json, makedirs
 from news_daily_summarization import add_summaries_in_place
 from news_weekly_highlight import generate_weekly_summary_json
@@ -27,13 +27,21 @@ def scheduled_crawling(date):
     # date = (datetime.datetime.now() - datetime.timedelta(days=1)).strftime("%Y%m%d")
 
     # KIA 타이거즈: HT, 삼성 라이온즈: SS, 두산 베어스: OB, 롯데 자이언츠: LT, KT 위즈: KT, SSG 랜더스: SK, 한화 이글스: HH, NC 다이노스: NC, 키움 히어로즈: WO, LG 트윈스: LG
-    for team in ["HT", "SS", "OB", "LT", "KT", "SK", "HH", "NC", "WO", "LG"]:
+    # 미리 띄운 브라우저 풀(CRAWL_DRIVER_POOL_SIZE개)을 팀들이 빌려 쓰며 동시에 크롤링
+    def save_team(team, results):
         try:
-            results = crawl_news(date, team)
             save_to_json(date, team, results)
             logger.info(f"{date} {team} 크롤링 완료. 총 {len(results)}개의 기사를 저장했습니다.")
         except Exception as e:
-            logger.error(f"{team} 크롤링 실패: {e}")
+            logger.error(f"{team} 저장 실패: {e}")
+
+    try:
+        results = crawl_all_news(date, TEAMS, on_result=save_team)
+        for team, result in results.items():
+            if isinstance(result, Exception):
+                logger.error(f"{team} 크롤링 실패: {result}")
+    except Exception as e:
+        logger.error(f"뉴스 크롤링 실패: {e}")
     logger.info("뉴스 크롤링 작업이 완료되었습니다.")
 
 ########################################################################################
@@ -1,15 +1,20 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
+from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
 import time
 import json
 import pandas as pd
 import os
 
+from driver_pool import DriverPool, new_driver
+from html_cache import HtmlCache
+
+TEAMS = ["HT", "SS", "OB", "LT", "KT", "SK", "HH", "NC", "WO", "LG"]
+NEWS_BASE_URL = "https://m.sports.naver.com/kbaseball/news"
+
 # 크롬 드라이버 옵션 설정 함수
-def get_driver():
+def news_chrome_options():
     chrome_options = Options()
     chrome_options.add_argument("--headless")  # GUI 없이 실행
     chrome_options.add_argument("--no-sandbox")
@@ -21,47 +26,86 @@ def get_driver():
     chrome_options.add_argument("--disable-crash-reporter")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-logging", "enable-automation"])
     chrome_options.add_experimental_option("useAutomationExtension", False)
+    return chrome_options
 
-    # ChromeDriver를 자동으로 다운로드 및 설정
-    service = Service(ChromeDriverManager().install())
-    service.log_path = "NUL"
-    return webdriver.Chrome(service=service, options=chrome_options)
+# 크롬 드라이버 생성 (chromedriver 경로는 프로세스에서 한 번만 찾음)
+def get_driver():
+    return new_driver(news_chrome_options)
+
+# 뉴스 크롤링용 드라이버 풀 생성 (브라우저 size개를 미리 띄움)
+def create_news_driver_pool(size=None):
+    return DriverPool(size=size, options_factory=news_chrome_options)
+
+# 페이지 이동 (풀이 있으면 로딩 시간 기록)
+def load_page(driver, url, pool=None):
+    if pool is not None:
+        pool.load(driver, url)
+    else:
+        driver.get(url)
+
+# 페이지 HTML 가져오기 (캐시에 유효한 HTML이 있으면 브라우저를 쓰지 않음)
+def get_page_source(driver, url, pool=None, cache=None, policy=None):
+    """
+    Returns:
+        tuple: (HTML, 캐시에서 읽었는지 여부)
+    """
+    if cache is not None:
+        html = cache.get(url, policy)
+        if html is not None:
+            return html, True
+    load_page(driver, url, pool)
+    time.sleep(2)  # 페이지 로딩 대기
+    return driver.page_source, False
+
+# 기사 목록 HTML에서 제목/링크 추출
+def parse_articles(html):
+    soup = BeautifulSoup(html, "html.parser")
+    articles = []
+    for item in soup.select("#content > div > div.NewsList_comp_news_list__oXAbN > ul > li"):
+        title_element = item.select_one("a > div.NewsItem_info_area__Dj4oW > em")
+        link_element = item.select_one("a.NewsItem_link_news__tD7x3")
+        if title_element is None or link_element is None or not link_element.get("href"):
+            continue
+        articles.append({
+            'news_title': title_element.get_text().strip(),
+            'article_url': urljoin(NEWS_BASE_URL, link_element["href"])
+        })
+    return articles
+
+# 기사 HTML에서 본문 추출
+def parse_article_content(html):
+    soup = BeautifulSoup(html, "html.parser")
+    for br in soup.select("#comp_news_article br"):
+        br.replace_with("\n")
+    paragraphs = [p.get_text().strip() for p in soup.select("#comp_news_article > div")]
+    return " ".join([p for p in paragraphs if p])
 
 # 기사 목록 크롤링 (1페이지만, 최대 60개)
-def crawl_articles(driver, date, team):
-    base_url = "https://m.sports.naver.com/kbaseball/news"
-    url = base_url + f"?sectionId=kbo&team={team}&sort=latest&date={date}&isPhoto=N"
-    driver.get(url)
-    time.sleep(2)  # 페이지 로딩 대기
+def crawl_articles(driver, date, team, pool=None, cache=None):
+    url = NEWS_BASE_URL + f"?sectionId=kbo&team={team}&sort=latest&date={date}&isPhoto=N"
+    html, from_cache = get_page_source(driver, url, pool, cache, "news_list")
 
     articles = []
     # 뉴스 목록 가져오기
     try:
-        news_list = driver.find_elements(By.CSS_SELECTOR, "#content > div > div.NewsList_comp_news_list__oXAbN > ul > li")
-        for item in news_list:
-            title_element = item.find_element(By.CSS_SELECTOR, "a > div.NewsItem_info_area__Dj4oW > em")
-            article_url = item.find_element(By.CSS_SELECTOR, "a.NewsItem_link_news__tD7x3").get_attribute("href")
-
-            articles.append({
-                'news_title': title_element.text.strip(),
-                'article_url': article_url
-            })
+        articles = parse_articles(html)
     except Exception as e:
         print(f"기사 목록 크롤링 중 오류 발생: {e}")
 
+    # 목록을 읽은 페이지만 캐시에 저장 (뉴스 목록은 몇 분 뒤 만료)
+    if cache is not None and not from_cache and articles:
+        cache.put(url, html, "news_list")
     return articles
 
 # 본문 내용 추출
-def get_article_content(driver, article_url):
-    driver.get(article_url)
-    time.sleep(2)  # 페이지 로딩 대기
+def get_article_content(driver, article_url, pool=None, cache=None):
+    html, from_cache = get_page_source(driver, article_url, pool, cache, "news_article")
 
     news_content = ""
     
     try:
         # 일반적인 기사 내용 추출 시도
-        paragraphs = driver.find_elements(By.CSS_SELECTOR, "#comp_news_article > div")
-        news_content = " ".join([p.text.strip() for p in paragraphs if p.text.strip()])
+        news_content = parse_article_content(html)
 
     except Exception as e:
         print(f"기사 내용 추출 중 오류 발생: {e}")
@@ -69,11 +113,13 @@ def get_article_content(driver, article_url):
     # 내용이 없으면 메시지 설정
     if not news_content:
         news_content = "본문 추출 실패"
+    elif cache is not None and not from_cache:
+        cache.put(article_url, html, "news_article")
     
     return news_content
 
-# 뉴스 기사 크롤링
-def crawl_news(date: str, team: str) -> list:
+# 뉴스 기사 크롤링 (pool을 넘기면 풀에서 브라우저를 빌려 쓰고 돌려줌, cache를 넘기면 HTML 캐시를 먼저 읽음)
+def crawl_news(date: str, team: str, pool: DriverPool = None, cache: HtmlCache = None) -> list:
     team_mapping = {
     "HT": "KIA",
     "SS": "삼성",
@@ -92,24 +138,62 @@ def crawl_news(date: str, team: str) -> list:
 
     print(f"날짜: {published_date}, 팀: {team_name},")
 
-    driver = get_driver()
+    own_pool = pool is None
+    if own_pool:
+        pool = create_news_driver_pool(size=1)
     all_articles = []
     
     try:
-        articles = crawl_articles(driver, date, team)
-        for article in articles:
-            content = get_article_content(driver, article['article_url'])
-            all_articles.append({
-                'news_title': article['news_title'],
-                'news_content': content,
-                'published_date': published_date
-            })
-            time.sleep(1)  # 기사별 요청 간 대기
+        with pool.lease() as driver:
+            articles = crawl_articles(driver, date, team, pool, cache)
+            for article in articles:
+                cached = cache is not None and cache.is_fresh(article['article_url'], "news_article")
+                content = get_article_content(driver, article['article_url'], pool, cache)
+                all_articles.append({
+                    'news_title': article['news_title'],
+                    'news_content': content,
+                    'published_date': published_date
+                })
+                if not cached:
+                    time.sleep(1)  # 기사별 요청 간 대기
     finally:
-        driver.quit()
+        if own_pool:
+            pool.close()
     
     return all_articles
 
+# 여러 팀의 뉴스를 드라이버 풀 하나로 동시에 크롤링
+def crawl_all_news(date: str, teams: list = None, pool_size: int = None, on_result=None, cache_dir: str = None) -> dict:
+    """
+    팀마다 풀에서 브라우저를 빌려 동시에 크롤링합니다. (브라우저는 풀 크기만큼만 띄움)
+    HTML 캐시(cache_dir, 기본값 CRAWL_HTML_CACHE_DIR)를 함께 사용하므로 재실행 때는 바뀌지 않은 기사를 다시 받지 않습니다.
+    on_result(team, articles)를 넘기면 팀별 크롤링이 끝날 때마다 호출합니다.
+
+    Returns:
+        dict: 팀 코드 → 기사 목록 (실패한 팀은 예외 객체)
+    """
+    teams = teams or TEAMS
+    results = {}
+    cache = HtmlCache(cache_dir)
+    with create_news_driver_pool(size=pool_size) as pool:
+        def crawl_team(team):
+            try:
+                articles = crawl_news(date, team, pool, cache)
+                if on_result is not None:
+                    on_result(team, articles)
+                return articles
+            except Exception as e:
+                print(f"{team} 크롤링 실패: {e}")
+                return e
+
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            for team, result in zip(teams, executor.map(crawl_team, teams)):
+                results[team] = result
+    print(f"HTML 캐시 통계: {cache.stats}")
+    # 유효 시간이 지난 기사/목록과 최대 크기를 넘는 오래된 항목 삭제
+    cache.prune()
+    return results
+
 # 디렉토리 생성 함수
 def makedirs(path):
     if not os.path.exists(path):
@@ -129,10 +213,11 @@ def main():
     date = input("크롤링할 날짜를 입력하세요 (YYYYMMDD 형식): ")
 
     # KIA 타이거즈: HT, 삼성 라이온즈: SS, 두산 베어스: OB, 롯데 자이언츠: LT, KT 위즈: KT, SSG 랜더스: SK, 한화 이글스: HH, NC 다이노스: NC, 키움 히어로즈: WO, LG 트윈스: LG
-    for team in ["HT", "SS", "OB", "LT", "KT", "SK", "HH", "NC", "WO", "LG"]:
-        results = crawl_news(date, team)
+    def save_team(team, results):
         save_to_json(date, team, results)
         print(f"{date} {team} 크롤링 완료. 총 {len(results)}개의 기사를 저장했습니다.")
 
+    crawl_all_news(date, TEAMS, on_result=save_team)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,65 @@
+"""
+app/baseball_data와 같이 쓰는 모듈 동기화
+
+ai/gcp는 app과 따로 배포되므로(평평한 import) app/baseball_data의 모듈을 복사해서 사용합니다.
+원본은 app/baseball_data 쪽이며, 원본을 고친 뒤 이 스크립트로 복사본을 갱신합니다.
+
+예) python sync_shared_modules.py          # 원본을 ai/gcp로 복사
+    python sync_shared_modules.py --check  # 복사본이 원본과 다르면 종료 코드 1
+"""
+import os
+import sys
+import shutil
+import argparse
+
+GCP_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.normpath(os.path.join(GCP_DIR, "..", "..", "app", "baseball_data"))
+
+# app/baseball_data에서 복사해 쓰는 모듈
+SHARED_MODULES = ["driver_pool.py", "html_cache.py"]
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def find_drift(source_dir=SOURCE_DIR, target_dir=GCP_DIR):
+    """원본과 내용이 다른(또는 없는) 복사본 파일 이름 목록"""
+    drifted = []
+    for name in SHARED_MODULES:
+        target = os.path.join(target_dir, name)
+        if not os.path.exists(target) or _read(target) != _read(os.path.join(source_dir, name)):
+            drifted.append(name)
+    return drifted
+
+
+def sync(source_dir=SOURCE_DIR, target_dir=GCP_DIR):
+    """원본과 다른 복사본을 원본으로 덮어씀. 갱신한 파일 이름 목록을 반환"""
+    drifted = find_drift(source_dir, target_dir)
+    for name in drifted:
+        shutil.copyfile(os.path.join(source_dir, name), os.path.join(target_dir, name))
+    return drifted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="app/baseball_data 공용 모듈을 ai/gcp로 동기화")
+    parser.add_argument("--check", action="store_true", help="복사하지 않고 원본과 다른지만 확인")
+    args = parser.parse_args()
+
+    if args.check:
+        drifted = find_drift()
+        if drifted:
+            print(f"❌ 원본(app/baseball_data)과 다른 파일: {', '.join(drifted)}")
+            print("python sync_shared_modules.py 로 복사본을 갱신하세요.")
+            return 1
+        print("✅ 공용 모듈이 원본과 같습니다.")
+        return 0
+
+    updated = sync()
+    print(f"갱신한 파일: {', '.join(updated)}" if updated else "갱신할 파일이 없습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+import sys
+import os
+
+# 현재 파일 (`DB/` 폴더)에 있으므로, 상위 디렉토리를 sys.path에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text
+from database import engine
+
+# daily_balances에 (ACCOUNT_ID, DATE) 유니크 키 추가 (update_daily_balances의 upsert 기준)
+# 이미 같은 계정/날짜 행이 여러 개 있으면 가장 최근 행(DAILY_BALANCES_ID가 가장 큰 행)만 남김
+with engine.connect() as connection:
+    exists = connection.execute(text(
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'daily_balances' "
+        "AND index_name = 'uq_daily_balances_account_date'"
+    )).scalar()
+
+    if exists:
+        print("유니크 키가 이미 있습니다")
+    else:
+        deleted = connection.execute(text(
+            "DELETE older FROM daily_balances older "
+            "JOIN daily_balances newer ON older.ACCOUNT_ID = newer.ACCOUNT_ID "
+            "AND older.DATE = newer.DATE AND older.DAILY_BALANCES_ID < newer.DAILY_BALANCES_ID"
+        )).rowcount
+        connection.execute(text(
+            "ALTER TABLE daily_balances ADD UNIQUE KEY uq_daily_balances_account_date (ACCOUNT_ID, DATE)"
+        ))
+        connection.commit()
+        print(f"중복 행 {deleted}개 삭제, 유니크 키 추가 성공")
@@ -0,0 +1,228 @@
+"""
+박스스코어 파서 벤치마크
+
+BeautifulSoup 버전(process_batting_data / process_pitching_data / process_log_boxes)과
+lxml 버전(boxscore_parser.parse_boxscore)의 처리 시간을 비교하고, 두 결과 CSV가 같은지 확인합니다.
+
+- 기본: crawled_data의 CSV로 박스스코어 페이지를 다시 만들어 사용 (두 파서의 결과가 기존 CSV와도 같은지 확인)
+- --html-dir: def_crawl_gamelog_with_pitcher.py --save-html 로 저장한 실제 박스스코어 HTML 사용
+
+예) python benchmark_boxscore_parser.py --repeat 5
+    python benchmark_boxscore_parser.py --html-dir html_fixtures
+"""
+import os
+import io
+import csv
+import sys
+import glob
+import json
+import time
+import html as html_lib
+import argparse
+from contextlib import redirect_stdout
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+# 같은 폴더의 모듈 import를 위한 경로 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from boxscore_parser import parse_boxscore, TEAM_TOTAL
+from boxscore_fetcher import is_boxscore_page
+from def_crawl_gamelog_with_pitcher import process_batting_data, process_pitching_data, process_log_boxes
+
+
+def read_csv_rows(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f))
+    return rows[0], rows[1:]
+
+
+def _cell(tag, value, attrs=""):
+    return f"<{tag}{attrs}>{html_lib.escape(value)}</{tag}>"
+
+
+def _team_order(rows, team_col):
+    teams = []
+    for row in rows:
+        if row[team_col] and row[team_col] not in teams:
+            teams.append(row[team_col])
+    return teams
+
+
+def _table(headers, rows):
+    lines = ["<table>", "<tr>" + "".join(_cell("th", h) for h in headers) + "</tr>"]
+    for row in rows:
+        lines.append("<tr>" + row + "</tr>")
+    lines.append("</table>")
+    return "\n".join(lines)
+
+
+def build_boxscore_html(batting_path, pitching_path, log_box_path):
+    """
+    저장된 CSV 세 개로 박스스코어 페이지와 같은 구조의 HTML을 만듦
+    (팀 합계 행은 타순/이름/포지션을 한 칸(colspan=3)으로 합친 원래 형태로 되돌림)
+    """
+    batting_headers, batting_rows = read_csv_rows(batting_path)
+    pitching_headers, pitching_rows = read_csv_rows(pitching_path)
+    log_headers, log_rows = read_csv_rows(log_box_path)
+
+    teams = _team_order(batting_rows, 0)
+    parts = ["<html><head><meta charset='utf-8'><title>박스스코어</title></head><body>"]
+
+    # 타격 기록 (팀 이름 열은 표에 없고 box_head 제목에서 가져옴)
+    order_col = batting_headers.index('타순')
+    for team in teams:
+        rows = []
+        for row in batting_rows:
+            if row[0] != team:
+                continue
+            if row[order_col] == TEAM_TOTAL:
+                rows.append(_cell("th", TEAM_TOTAL, " colspan='3'") + "".join(_cell("td", v) for v in row[4:]))
+            else:
+                rows.append("".join(_cell("td", v) for v in row[1:]))
+        parts.append(f"<div class='box_head'>타격기록 ({html_lib.escape(team)})</div>")
+        parts.append(_table(batting_headers[1:], rows))
+
+    # 투구 기록
+    for team in _team_order(pitching_rows, 0):
+        rows = ["".join(_cell("td", v) for v in row[1:]) for row in pitching_rows if row[0] == team]
+        parts.append(f"<div class='box_head'>투구기록 ({html_lib.escape(team)})</div>")
+        parts.append(_table(pitching_headers[1:], rows))
+
+    # 로그 박스 (1, 2번째: 팀별 타자 기록, 3, 4번째: 사용하지 않음, 5, 6번째: 수비 기록)
+    batter_cols = [i for i, h in enumerate(log_headers) if h.startswith("타자기록")]
+    fielding_cols = [i for i, h in enumerate(log_headers) if h.startswith("수비기록")]
+    for cols in (batter_cols, None, fielding_cols):
+        for row_idx in range(2):
+            row = log_rows[row_idx] if row_idx < len(log_rows) else []
+            divs = "".join(
+                _cell("div", row[i] if i < len(row) else "", " class='log_div'") for i in (cols or [])
+            )
+            parts.append(f"<div class='log_box'>{divs}</div>")
+
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def load_pages_from_csv(data_dir):
+    """crawled_data/<날짜>/<원정>-<홈>_batting.csv 마다 (이름, HTML, 기존 CSV) 생성"""
+    pages = []
+    for batting_path in sorted(glob.glob(os.path.join(data_dir, "*", "*_batting.csv"))):
+        prefix = batting_path[:-len("_batting.csv")]
+        paths = {kind: f"{prefix}_{kind}.csv" for kind in ("batting", "pitching", "log_boxes")}
+        if not all(os.path.exists(path) for path in paths.values()):
+            continue
+        expected = {}
+        for kind, path in paths.items():
+            with open(path, encoding="utf-8-sig") as f:
+                expected[kind] = f.read()
+        html = build_boxscore_html(paths["batting"], paths["pitching"], paths["log_boxes"])
+        pages.append((os.path.relpath(prefix, data_dir), html, expected))
+    return pages
+
+
+def load_pages_from_html(html_dir):
+    """저장된 박스스코어 HTML마다 (이름, HTML, None) 생성 (일정 페이지 등은 건너뜀)"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(html_dir, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        if is_boxscore_page(html):
+            pages.append((os.path.basename(path), html, None))
+    return pages
+
+
+def parse_with_bs4(html):
+    """BeautifulSoup 버전 (save_boxscore_html_bs4와 같은 처리, 저장만 하지 않음)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    df_batting, away_team, home_team = process_batting_data(soup)
+    df_pitching, _, _ = process_pitching_data(soup)
+    log_boxes = soup.find_all('div', class_='log_box')
+    df_log_box = pd.concat([
+        process_log_boxes(log_boxes[:2], [away_team, home_team], prefix="타자기록"),
+        process_log_boxes(log_boxes[4:6], prefix="수비기록")
+    ], axis=1)
+    return {"batting": df_batting, "pitching": df_pitching, "log_boxes": df_log_box}
+
+
+def to_csv_texts(tables):
+    return {kind: tables[kind].to_csv(index=False) for kind in ("batting", "pitching", "log_boxes")}
+
+
+def run_benchmark(pages, repeat):
+    """두 파서를 repeat번씩 실행해 시간을 재고 결과 CSV를 비교"""
+    timings = {"bs4": [], "lxml": []}
+    mismatches = []
+    for name, html, expected in pages:
+        with redirect_stdout(io.StringIO()):  # 기존 함수의 진행 출력 숨김
+            for _ in range(repeat):
+                started = time.perf_counter()
+                old = parse_with_bs4(html)
+                timings["bs4"].append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                new = parse_boxscore(html)
+                timings["lxml"].append((time.perf_counter() - started) * 1000)
+
+        old_csv, new_csv = to_csv_texts(old), to_csv_texts(new)
+        for kind in old_csv:
+            if old_csv[kind] != new_csv[kind]:
+                mismatches.append(f"{name} {kind}: BeautifulSoup 결과와 다름")
+            if expected is not None and new_csv[kind] != expected[kind]:
+                mismatches.append(f"{name} {kind}: 기존 CSV와 다름")
+
+    def summary(values):
+        return {
+            "total_ms": round(sum(values), 1),
+            "per_page_ms": round(sum(values) / len(values), 3) if values else 0.0
+        }
+
+    result = {
+        "pages": len(pages),
+        "repeat": repeat,
+        "bs4": summary(timings["bs4"]),
+        "lxml": summary(timings["lxml"]),
+        "mismatches": mismatches
+    }
+    if timings["lxml"] and sum(timings["lxml"]) > 0:
+        result["speedup"] = round(sum(timings["bs4"]) / sum(timings["lxml"]), 2)
+    return result
+
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='박스스코어 파서 벤치마크 (BeautifulSoup vs lxml)')
+    parser.add_argument('--data-dir', default=os.path.join(base_dir, 'crawled_data'), help='경기 기록 CSV 폴더')
+    parser.add_argument('--html-dir', help='저장된 박스스코어 HTML 폴더 (지정하면 CSV 대신 사용)')
+    parser.add_argument('--repeat', type=int, default=3, help='페이지마다 반복 횟수')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+    args = parser.parse_args()
+
+    pages = load_pages_from_html(args.html_dir) if args.html_dir else load_pages_from_csv(args.data_dir)
+    if not pages:
+        print("벤치마크할 박스스코어가 없습니다.")
+        return 1
+
+    result = run_benchmark(pages, max(1, args.repeat))
+    print(f"박스스코어 {result['pages']}개 × {result['repeat']}회")
+    print(f"BeautifulSoup: 총 {result['bs4']['total_ms']}ms, 페이지당 {result['bs4']['per_page_ms']}ms")
+    print(f"lxml:          총 {result['lxml']['total_ms']}ms, 페이지당 {result['lxml']['per_page_ms']}ms")
+    if "speedup" in result:
+        print(f"속도 향상: {result['speedup']}배")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if result["mismatches"]:
+        print(f"❌ 결과가 다른 표 {len(result['mismatches'])}개")
+        for mismatch in result["mismatches"]:
+            print(f"  - {mismatch}")
+        return 1
+    print("✅ 모든 표의 CSV가 같습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+경기 기록 전처리 벤치마크
+
+crawled_data의 모든 날짜에 대해 기존 행 단위 구현(apply/iterrows, 아래 legacy_*)과
+def_game_preprocessing.build_play_log(열 단위 구현)의 처리 시간을 비교하고,
+두 구현의 -play_log.csv 내용과 순위표 결과가 같은지 확인합니다. (파일은 저장하지 않음)
+
+결과 비교에는 임시 폴더에 만든 예외 경우(한 경기의 팀 합계 기록 칸을 비운 날짜)도 포함합니다.
+
+예) python benchmark_game_preprocessing.py --repeat 5
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+import pandas as pd
+
+# 같은 폴더의 모듈 import를 위한 경로 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from def_game_preprocessing import build_play_log, load_batting_and_log_box_files
+
+
+# ---- 기존 구현 (비교용) ----
+def legacy_process_batting_data(batting_file_path, log_date):
+    batting = pd.read_csv(batting_file_path)
+    df_team_total = batting[batting['타순'] == '팀 합계'].copy()
+
+    df_team_total['BB'] = pd.to_numeric(df_team_total['BB'], errors='coerce').fillna(0)
+    df_team_total['HBP'] = pd.to_numeric(df_team_total['HBP'], errors='coerce').fillna(0)
+    df_team_total['사구'] = df_team_total['BB'] + df_team_total['HBP']
+
+    include_cols = ['H', 'R', 'HR', 'SO', 'GDP', '사구']
+    stat_cols = [col for col in batting.columns if col in include_cols]
+
+    result_data = []
+    for _, row in df_team_total.iterrows():
+        team_name = row['팀 이름']
+        for stat in stat_cols:
+            stat_value = row[stat]
+            if pd.notna(stat_value):
+                result_data.append({'날짜': log_date, '팀': team_name, '기록': stat, '기록값': stat_value})
+    return result_data, df_team_total
+
+
+def legacy_calculate_game_result(df_team_total, away_team, home_team, log_date):
+    team_scores = df_team_total[['팀 이름', 'R']].set_index('팀 이름')['R'].to_dict()
+    away_score, home_score = team_scores.get(away_team, 0), team_scores.get(home_team, 0)
+
+    if away_score > home_score:
+        away_result, home_result = 'W', 'L'
+    elif away_score < home_score:
+        away_result, home_result = 'L', 'W'
+    else:
+        away_result, home_result = 'D', 'D'
+
+    return [
+        {'날짜': log_date, '팀': away_team, '기록': '경기결과', '기록값': away_result},
+        {'날짜': log_date, '팀': home_team, '기록': '경기결과', '기록값': home_result}
+    ], away_result
+
+
+def legacy_update_current_rank(ranking_df, away_result, away_team, home_team):
+    if away_result == 'W':
+        ranking_df.loc[ranking_df['팀'] == away_team, '승'] += 1
+        ranking_df.loc[ranking_df['팀'] == home_team, '패'] += 1
+    elif away_result == 'L':
+        ranking_df.loc[ranking_df['팀'] == away_team, '패'] += 1
+        ranking_df.loc[ranking_df['팀'] == home_team, '승'] += 1
+    elif away_result == 'D':
+        ranking_df.loc[ranking_df['팀'] == away_team, '무'] += 1
+        ranking_df.loc[ranking_df['팀'] == home_team, '무'] += 1
+    return ranking_df
+
+
+def legacy_process_log_box_data(log_box, log_date):
+    def count_keyword_occurrences(row, keyword):
+        count = 0
+        for col in row.index:
+            if isinstance(row[col], str) and keyword in row[col]:
+                keyword_section = row[col].split(f'{keyword} : ')[-1]
+                players = [p.strip() for p in keyword_section.split(')') if p.strip()]
+                count += len(players)
+        return count
+
+    log_box['도루'] = log_box.apply(lambda row: count_keyword_occurrences(row, '도루성공'), axis=1)
+    log_box['실책'] = log_box.apply(lambda row: count_keyword_occurrences(row, '실책'), axis=1)
+
+    result_data = []
+    for _, row in log_box.iterrows():
+        team_name = row['팀명']
+        result_data.extend([
+            {'날짜': log_date, '팀': team_name, '기록': '도루', '기록값': row['도루']},
+            {'날짜': log_date, '팀': team_name, '기록': '실책', '기록값': row['실책']}
+        ])
+    return result_data
+
+
+def legacy_build_play_log(input_folder_path, log_date, ranking_df):
+    batting_files, log_box_files = load_batting_and_log_box_files(input_folder_path)
+
+    result_data = []
+    for batting_file, log_box_file in zip(batting_files, log_box_files):
+        away_team, home_team = batting_file.replace('_batting.csv', '').split('-')
+
+        batting_data, df_team_total = legacy_process_batting_data(os.path.join(input_folder_path, batting_file), log_date)
+        result_data.extend(batting_data)
+
+        game_result, away_result = legacy_calculate_game_result(df_team_total, away_team, home_team, log_date)
+        result_data.extend(game_result)
+
+        ranking_df = legacy_update_current_rank(ranking_df, away_result, away_team, home_team)
+
+        log_box = pd.read_csv(os.path.join(input_folder_path, log_box_file))
+        result_data.extend(legacy_process_log_box_data(log_box, log_date))
+
+    df_log_combined = pd.DataFrame(result_data)
+    return df_log_combined.sort_values(by=['날짜', '팀', '기록']), ranking_df
+# ---- 기존 구현 끝 ----
+
+
+def load_dates(data_dir):
+    """crawled_data/<YYYYMMDD> 중 batting 파일이 있는 날짜 목록"""
+    dates = []
+    for name in sorted(os.listdir(data_dir)):
+        folder = os.path.join(data_dir, name)
+        if len(name) == 8 and name.isdigit() and os.path.isdir(folder):
+            batting_files, _ = load_batting_and_log_box_files(folder)
+            if batting_files:
+                dates.append(name)
+    return dates
+
+
+# 예외 경우: (이름, 비울 기록 열) - 첫 날짜의 첫 경기 팀 합계 행에서 해당 칸을 비움
+EMPTY_CELL_CASES = [('GDP 빈 칸', 'GDP'), ('HR 빈 칸', 'HR'), ('득점 빈 칸', 'R')]
+
+
+def make_empty_cell_day(data_dir, date, column, tmp_dir):
+    """date 폴더를 tmp_dir에 복사하고 첫 batting 파일의 첫 팀 합계 행에서 column 칸을 비운 폴더 경로를 반환"""
+    folder = os.path.join(tmp_dir, f"{date}-{column}")
+    shutil.copytree(os.path.join(data_dir, date), folder)
+    batting_files, _ = load_batting_and_log_box_files(folder)
+    path = os.path.join(folder, batting_files[0])
+    batting = pd.read_csv(path)
+    batting.loc[batting.index[batting['타순'] == '팀 합계'][0], column] = None
+    batting.to_csv(path, index=False)
+    return folder
+
+
+def check_empty_cell_cases(data_dir, date, ranking_df):
+    """예외 경우마다 두 구현의 기록/순위표가 같은지 확인하고, 다른 경우의 이름 목록을 반환"""
+    mismatches = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_date = f"{date[:4]}-{date[4:6]}-{date[6:]}"
+        for name, column in EMPTY_CELL_CASES:
+            folder = make_empty_cell_day(data_dir, date, column, tmp_dir)
+            legacy_log, legacy_rank = legacy_build_play_log(folder, log_date, ranking_df.copy())
+            new_log, new_rank = build_play_log(folder, log_date, ranking_df.copy())
+            if (legacy_log.to_csv(index=False) != new_log.to_csv(index=False)
+                    or legacy_rank.to_csv(index=False) != new_rank.to_csv(index=False)):
+                mismatches.append(f"{date}-play_log.csv ({name})")
+    return mismatches
+
+
+def run_season(build, data_dir, dates, ranking_df):
+    """시즌 전체를 날짜 순서대로 처리 (순위표는 날마다 이어서 갱신)"""
+    outputs = {}
+    ranking_df = ranking_df.copy()
+    for date in dates:
+        log_date = f"{date[:4]}-{date[4:6]}-{date[6:]}"
+        df_sorted, ranking_df = build(os.path.join(data_dir, date), log_date, ranking_df)
+        outputs[date] = df_sorted.to_csv(index=False)
+    return outputs, ranking_df.to_csv(index=False)
+
+
+def run_benchmark(data_dir, rank_path, repeat):
+    dates = load_dates(data_dir)
+    ranking_df = pd.read_csv(rank_path)
+
+    timings = {"legacy": [], "columnar": []}
+    results = {}
+    for _ in range(repeat):
+        for name, build in (("legacy", legacy_build_play_log), ("columnar", build_play_log)):
+            started = time.perf_counter()
+            results[name] = run_season(build, data_dir, dates, ranking_df)
+            timings[name].append((time.perf_counter() - started) * 1000)
+
+    (legacy_logs, legacy_rank), (new_logs, new_rank) = results["legacy"], results["columnar"]
+    mismatches = [f"{date}-play_log.csv" for date in dates if legacy_logs[date] != new_logs[date]]
+    if legacy_rank != new_rank:
+        mismatches.append("순위표")
+    if dates:
+        mismatches.extend(check_empty_cell_cases(data_dir, dates[0], ranking_df))
+
+    result = {
+        "dates": len(dates),
+        "repeat": repeat,
+        "edge_cases": len(EMPTY_CELL_CASES) if dates else 0,
+        "legacy_ms": round(min(timings["legacy"]), 1),
+        "columnar_ms": round(min(timings["columnar"]), 1),
+        "mismatches": mismatches
+    }
+    if result["columnar_ms"] > 0:
+        result["speedup"] = round(result["legacy_ms"] / result["columnar_ms"], 2)
+    return result
+
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='경기 기록 전처리 벤치마크 (행 단위 vs 열 단위)')
+    parser.add_argument('--data-dir', default=os.path.join(base_dir, 'crawled_data'), help='경기 기록 CSV 폴더')
+    parser.add_argument('--rank', default=os.path.join(base_dir, 'current_rank.csv'), help='시작 순위표 (읽기만 함)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (가장 빠른 시간 사용)')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.data_dir, args.rank, max(1, args.repeat))
+    if not result["dates"]:
+        print("벤치마크할 날짜가 없습니다.")
+        return 1
+
+    print(f"{result['dates']}일치 경기 기록 × {result['repeat']}회 (가장 빠른 시간)")
+    print(f"기존(apply/iterrows): {result['legacy_ms']}ms")
+    print(f"열 단위:              {result['columnar_ms']}ms")
+    if "speedup" in result:
+        print(f"속도 향상: {result['speedup']}배")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if result["mismatches"]:
+        print(f"❌ 결과가 다른 파일: {', '.join(result['mismatches'])}")
+        return 1
+    print(f"✅ 모든 날짜(예외 경우 {result['edge_cases']}개 포함)의 -play_log.csv와 순위표가 같습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
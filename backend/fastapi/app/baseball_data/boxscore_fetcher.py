@@ -0,0 +1,230 @@
+import os
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+# 동시 요청 수 / 타임아웃 / 재시도 (환경 변수로 조정 가능)
+FETCH_WORKERS = int(os.getenv("CRAWL_FETCH_WORKERS", "4"))
+FETCH_TIMEOUT = float(os.getenv("CRAWL_FETCH_TIMEOUT", "10"))
+FETCH_RETRIES = int(os.getenv("CRAWL_FETCH_RETRIES", "3"))
+FETCH_RETRY_DELAY = float(os.getenv("CRAWL_FETCH_RETRY_DELAY", "2"))
+
+# 저장해 둔 HTML로 오프라인 실행할 때 사용하는 폴더 (설정하면 네트워크에 접속하지 않음)
+HTML_FIXTURE_DIR = os.getenv("CRAWL_HTML_FIXTURE_DIR")
+
+# 경기 상태 문구 (종료 문구가 있고 진행 중/중단 문구가 없을 때만 끝난 경기로 봄, 쉼표로 구분해 환경 변수로 조정 가능)
+GAME_FINAL_MARKERS = tuple(filter(None, os.getenv("CRAWL_GAME_FINAL_MARKERS", "경기종료").split(",")))
+GAME_UNFINISHED_MARKERS = tuple(filter(None, os.getenv(
+    "CRAWL_GAME_UNFINISHED_MARKERS", "경기중,경기전,서스펜디드,일시정지"
+).split(",")))
+
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/122.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+
+
+def fixture_file_name(url):
+    """URL에 해당하는 HTML 파일 이름 (URL의 sha1 앞 16자리)"""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + ".html"
+
+
+def is_boxscore_page(html):
+    """박스스코어 표가 HTML에 들어 있는지 확인 (없으면 자바스크립트로 그려지는 페이지로 보고 브라우저로 다시 받음)"""
+    return bool(html) and "box_head" in html and "<table" in html
+
+
+def is_schedule_page(html):
+    """일정 페이지에 박스스코어 링크가 들어 있는지 확인"""
+    return bool(html) and "박스스코어" in html
+
+
+def _final_marker_count(html):
+    """종료 문구 수 (진행 중/중단 문구가 하나라도 있으면 0)"""
+    if not html or any(marker in html for marker in GAME_UNFINISHED_MARKERS):
+        return 0
+    return sum(html.count(marker) for marker in GAME_FINAL_MARKERS)
+
+
+def is_final_boxscore(html):
+    """끝난 경기의 박스스코어인지 확인 (끝난 경기만 바뀌지 않는 페이지로 보고 계속 캐시)"""
+    return is_boxscore_page(html) and _final_marker_count(html) > 0
+
+
+def is_final_schedule(html):
+    """일정 페이지의 박스스코어가 있는 모든 경기가 끝났는지 확인 (종료 문구 수 >= 박스스코어 링크 수)"""
+    if not is_schedule_page(html):
+        return False
+    return _final_marker_count(html) >= len(parse_boxscore_links(html))
+
+
+def parse_boxscore_links(html, base_url="https://statiz.sporki.com/schedule/"):
+    """일정 페이지 HTML에서 박스스코어 링크 추출"""
+    soup = BeautifulSoup(html, 'html.parser')
+    links = []
+    for a in soup.find_all('a'):
+        if a.get_text(strip=True) == "박스스코어" and a.get('href'):
+            links.append(requests.compat.urljoin(base_url, a['href']))
+    return links
+
+
+class PageFetcher:
+    """
+    HTTP 커넥션 풀로 여러 페이지를 동시에 받아오고,
+    정적 HTML에 내용이 없는 페이지만 브라우저로 다시 받아오는 수집기.
+    driver_pool(driver_pool.DriverPool)을 지정하면 풀에서 브라우저를 빌려 동시에 받고,
+    driver_factory만 지정하면 브라우저 하나를 띄워 순서대로 재사용합니다.
+
+    fixture_dir를 지정하면 네트워크 대신 저장된 HTML 파일을 읽고(오프라인 테스트용),
+    save_dir를 지정하면 받아온 HTML을 같은 이름 규칙으로 저장합니다.
+    cache(html_cache.HtmlCache)를 지정하면 fetch의 cache_policy에 따라 캐시를 먼저 읽고, 받아온 HTML을 캐시에 저장합니다.
+    """
+
+    def __init__(self, driver_factory=None, max_workers=None, fixture_dir=None, save_dir=None, driver_pool=None,
+                 cache=None):
+        self.driver_factory = driver_factory
+        self.driver_pool = driver_pool
+        self.cache = cache
+        self.max_workers = max(1, max_workers or FETCH_WORKERS)
+        self.fixture_dir = fixture_dir if fixture_dir is not None else HTML_FIXTURE_DIR
+        self.save_dir = save_dir
+        self._driver = None
+        self._driver_lock = threading.Lock()
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.stats = {"cache": 0, "http": 0, "browser": 0, "fixture": 0, "failed": 0}
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _session(self):
+        # requests.Session은 스레드 간 공유가 안전하지 않으므로 작업 스레드마다 하나씩 사용
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(REQUEST_HEADERS)
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def _read_fixture(self, url):
+        path = os.path.join(self.fixture_dir, fixture_file_name(url))
+        if not os.path.exists(path):
+            print(f"저장된 HTML 없음: {url} ({path})")
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def _save(self, url, html):
+        if self.save_dir and html:
+            os.makedirs(self.save_dir, exist_ok=True)
+            with open(os.path.join(self.save_dir, fixture_file_name(url)), "w", encoding="utf-8") as f:
+                f.write(html)
+
+    def fetch_http(self, url):
+        """HTTP로 페이지를 받아옴. 실패하면 None"""
+        for attempt in range(FETCH_RETRIES):
+            try:
+                response = self._session().get(url, timeout=FETCH_TIMEOUT)
+                response.raise_for_status()
+                response.encoding = 'utf-8'
+                return response.text
+            except requests.RequestException as e:
+                print(f"URL 요청 실패: {e}. {attempt + 1}/{FETCH_RETRIES} 재시도 중...")
+                time.sleep(FETCH_RETRY_DELAY)
+        print(f"최대 재시도 횟수 초과: {url}")
+        return None
+
+    def fetch_browser(self, url):
+        """브라우저로 페이지를 받아옴 (풀에서 빌리거나, 처음 필요할 때 한 번만 띄워 재사용). 실패하면 None"""
+        if self.driver_pool is not None:
+            try:
+                with self.driver_pool.lease() as driver:
+                    self.driver_pool.load(driver, url)
+                    return driver.page_source
+            except Exception as e:
+                print(f"브라우저 로딩 실패: {url} ({e})")
+                return None
+        if self.driver_factory is None:
+            return None
+        with self._driver_lock:
+            try:
+                if self._driver is None:
+                    self._driver = self.driver_factory()
+                self._driver.get(url)
+                return self._driver.page_source
+            except Exception as e:
+                print(f"브라우저 로딩 실패: {url} ({e})")
+                return None
+
+    def fetch(self, url, is_complete=is_boxscore_page, cache_policy=None):
+        """
+        페이지 하나를 받아옴. HTTP 응답에 필요한 내용이 없으면(is_complete가 False) 브라우저로 다시 받아옴
+
+        Args:
+            url (str): 페이지 URL
+            is_complete (callable): HTML에 필요한 내용이 있는지 확인하는 함수
+            cache_policy (str | callable, optional): html_cache.CACHE_POLICIES의 키. None이면 캐시를 사용하지 않음
+                HTML을 받아 키를 돌려주는 함수를 넘기면 내용에 따라 저장할 policy를 정함 (캐시를 읽을 때는 저장한 policy 사용)
+
+        Returns:
+            str: HTML (실패하면 None)
+        """
+        if self.fixture_dir:
+            html = self._read_fixture(url)
+            self._count("fixture" if html else "failed")
+            return html
+
+        use_cache = self.cache is not None and cache_policy is not None
+        if use_cache:
+            html = self.cache.get(url, None if callable(cache_policy) else cache_policy)
+            if html is not None and is_complete(html):
+                self._count("cache")
+                self._save(url, html)
+                return html
+
+        html = self.fetch_http(url)
+        if html is not None and is_complete(html):
+            self._count("http")
+        else:
+            print(f"정적 HTML에 내용 없음, 브라우저로 다시 시도: {url}")
+            html = self.fetch_browser(url)
+            if html is None or not is_complete(html):
+                self._count("failed")
+                return None
+            self._count("browser")
+        self._save(url, html)
+        if use_cache:
+            self.cache.put(url, html, cache_policy(html) if callable(cache_policy) else cache_policy)
+        return html
+
+    def fetch_all(self, urls, is_complete=is_boxscore_page, cache_policy=None):
+        """
+        여러 페이지를 동시에 받아옴 (최대 max_workers개)
+
+        Returns:
+            dict: URL → HTML (실패한 URL은 None), urls 순서 유지
+        """
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, len(urls)))) as executor:
+            pages = list(executor.map(lambda url: self.fetch(url, is_complete, cache_policy), urls))
+        print(f"페이지 {len(urls)}개 수집 완료 ({time.perf_counter() - started:.2f}초): {self.stats}")
+        return dict(zip(urls, pages))
+
+    def close(self):
+        """재사용하던 브라우저 종료 (driver_pool은 만든 쪽에서 종료)"""
+        with self._driver_lock:
+            if self._driver is not None:
+                try:
+                    self._driver.quit()
+                finally:
+                    self._driver = None
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+from lxml import etree
+
+# 주석은 파싱할 때 제거 (BeautifulSoup의 get_text()도 주석은 제외)
+_PARSER = etree.HTMLParser(encoding="utf-8", remove_comments=True, remove_pis=True)
+
+# 박스스코어 페이지에서 사용하는 XPath (모듈 로딩 때 한 번만 컴파일)
+_TABLES = etree.XPath("//table")
+_BOX_HEADS = etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), ' box_head ')]")
+_LOG_BOXES = etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), ' log_box ')]")
+_LOG_DIVS = etree.XPath("div[contains(concat(' ', normalize-space(@class), ' '), ' log_div ')]")
+_ROWS = etree.XPath(".//tr")
+_HEADER_CELLS = etree.XPath(".//th")
+_CELLS = etree.XPath(".//*[self::td or self::th]")
+
+TEAM_TOTAL = "팀 합계"
+
+
+def _text(element):
+    """BeautifulSoup의 get_text(strip=True)와 같은 결과"""
+    return "".join(text.strip() for text in element.itertext())
+
+
+def _stripped_text(element):
+    """BeautifulSoup의 " ".join(stripped_strings)와 같은 결과"""
+    return " ".join(text for text in (text.strip() for text in element.itertext()) if text)
+
+
+def _team_names(root, keyword):
+    """box_head 중 keyword(타격기록/투구기록)가 들어간 제목에서 팀 이름 추출"""
+    team_names = []
+    for box_head in _BOX_HEADS(root):
+        text = _text(box_head)
+        if keyword in text:
+            team_names.append(text.split("(")[-1].replace(")", "").strip())
+    return team_names
+
+
+def _tables_to_array(tables, away_team, home_team):
+    """
+    표들의 행을 (행 × 열) object 배열로 추출 (마지막 열은 팀 이름)
+    칸이 모자란 행(팀 합계 등)은 뒤쪽이 None으로 채워짐 (pd.DataFrame(행 목록)과 같음)
+
+    Returns:
+        tuple: (열 이름 목록, 배열)
+    """
+    headers = []
+    rows = []
+    for idx, table in enumerate(tables):
+        table_rows = _ROWS(table)
+        headers = [_text(th) for th in _HEADER_CELLS(table_rows[0])] + ['팀 이름']
+        team_name = away_team if idx == 0 else home_team
+        rows.extend([_text(cell) for cell in _CELLS(row)] + [team_name] for row in table_rows[1:])
+
+    values = np.empty((len(rows), len(headers)), dtype=object)
+    for i, row in enumerate(rows):
+        if len(row) > len(headers):
+            raise ValueError(f"표 행의 칸 수({len(row)})가 열 이름 수({len(headers)})보다 많습니다.")
+        values[i, :len(row)] = row
+    return headers, values
+
+
+def _move_team_name_first(columns, values):
+    """팀 이름 열을 첫 번째로 이동"""
+    team_col = columns.index('팀 이름')
+    order = [team_col] + [i for i in range(len(columns)) if i != team_col]
+    return [columns[i] for i in order], values[:, order]
+
+
+def _shift_team_totals(columns, values, order_col):
+    """
+    order_col이 '팀 합계'인 행을 배열 연산으로 처리 (values를 직접 수정)
+    (팀 합계 행은 타순/이름/포지션이 한 칸으로 합쳐져 있어 기록이 두 칸 앞당겨져 있음)
+    """
+    totals = values[:, columns.index(order_col)] == TEAM_TOTAL
+    if not totals.any():
+        return values
+
+    values[totals, 4:] = values[totals, 2:-2]
+    values[totals, 2:4] = ''
+
+    # 팀 합계 행의 팀 이름은 앞쪽 행들 중 마지막 팀 이름 (팀 이름이 있는 마지막 행 번호를 누적 최대값으로 구함)
+    team_col = columns.index('팀 이름')
+    teams = values[:, team_col]
+    known = pd.notna(teams) & (teams != '')
+    last_known = np.maximum.accumulate(np.where(known, np.arange(len(teams)), -1))
+    values[totals, team_col] = np.where(last_known >= 0, teams[np.maximum(last_known, 0)], None)[totals]
+    return values
+
+
+def shift_team_total_rows(df, order_col):
+    """타순이 '팀 합계'인 행 데이터 처리 (def_crawl_gamelog_with_pitcher.shift_team_total_rows와 같은 결과)"""
+    columns = df.columns.tolist()
+    values = _shift_team_totals(columns, df.to_numpy(dtype=object, copy=True), order_col)
+    return pd.DataFrame(values, columns=df.columns)
+
+
+def _log_boxes_to_array(log_boxes, team_names=None, prefix=None):
+    """
+    로그 박스들을 (행 × 열) object 배열로 추출 (def_crawl_gamelog_with_pitcher.process_log_boxes와 같은 결과)
+
+    Returns:
+        tuple: (열 이름 목록, 행 목록)
+    """
+    texts = [[_stripped_text(log_div) for log_div in _LOG_DIVS(log_box)] for log_box in log_boxes]
+    max_div_count = max((len(row) for row in texts), default=0)
+
+    columns = [f'{prefix}{i}' for i in range(1, max_div_count + 1)]
+    if team_names:
+        columns = ['팀명'] + columns
+        texts = [
+            [team_names[idx] if idx < len(team_names) else f"팀명 없음 {idx + 1}"] + row
+            for idx, row in enumerate(texts)
+        ]
+    return columns, texts
+
+
+def _log_boxes_to_frame(parts):
+    """여러 로그 박스 배열을 옆으로 붙임 (pd.concat(axis=1)과 같음, 행 수가 다르면 빈 칸은 None)"""
+    columns = [column for part_columns, _ in parts for column in part_columns]
+    values = np.empty((max((len(rows) for _, rows in parts), default=0), len(columns)), dtype=object)
+    start = 0
+    for part_columns, rows in parts:
+        for i, row in enumerate(rows):
+            values[i, start:start + len(row)] = row
+        start += len(part_columns)
+    return pd.DataFrame(values, columns=columns)
+
+
+def parse_boxscore(html):
+    """
+    박스스코어 페이지 HTML에서 타격/투수/로그 박스 표를 추출합니다.
+    BeautifulSoup으로 처리하던 결과(process_batting_data, process_pitching_data, process_log_boxes)와 같은 CSV를 만듭니다.
+
+    Args:
+        html (str): 박스스코어 페이지 HTML
+
+    Returns:
+        dict: {"away_team", "home_team", "batting", "pitching", "log_boxes"} (표는 DataFrame)
+    """
+    root = etree.fromstring(html.encode("utf-8"), _PARSER)
+    tables = _TABLES(root)
+
+    # 타격 기록 (표 1, 2)
+    batting_teams = _team_names(root, "타격기록")
+    away_team, home_team = batting_teams[0], batting_teams[1]
+    columns, values = _tables_to_array(tables[:2], away_team, home_team)
+    columns, values = _move_team_name_first(columns, values)
+    values = _shift_team_totals(columns, values, '타순')
+    df_batting = pd.DataFrame(values, columns=columns)
+
+    # 투수 기록 (표 3, 4)
+    pitching_teams = _team_names(root, "투구기록")
+    columns, values = _tables_to_array(tables[2:4], pitching_teams[0], pitching_teams[1])
+    columns, values = _move_team_name_first(columns, values)
+    df_pitching = pd.DataFrame(values, columns=columns)
+    # '이름' 컬럼에서 괄호와 괄호 안의 내용을 제거
+    if "이름" in df_pitching.columns:
+        df_pitching["이름"] = df_pitching["이름"].str.replace(r"\(.*?\)", "", regex=True).str.strip()
+
+    # 로그 박스 (1, 2번째는 팀별 타자 기록, 5, 6번째는 수비 기록)
+    log_boxes = _LOG_BOXES(root)
+    df_log_box = _log_boxes_to_frame([
+        _log_boxes_to_array(log_boxes[:2], [away_team, home_team], prefix="타자기록"),
+        _log_boxes_to_array(log_boxes[4:6], prefix="수비기록")
+    ])
+
+    return {
+        "away_team": away_team,
+        "home_team": home_team,
+        "batting": df_batting,
+        "pitching": df_pitching,
+        "log_boxes": df_log_box
+    }
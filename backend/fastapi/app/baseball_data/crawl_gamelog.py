@@ -4,7 +4,7 @@ import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_pool import resolve_driver_path
 from selenium.common.exceptions import WebDriverException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -55,7 +55,7 @@ try:
     chrome_options.add_argument("--enable-unsafe-swiftshader")
     
     # 새 WebDriver 인스턴스 생성
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+    driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=chrome_options)
     
     # 메인 페이지 접속
     driver.get(url)
@@ -4,13 +4,17 @@ import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import WebDriverException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 import pandas as pd
+import sys
+
+# 같은 폴더의 모듈 import를 위한 경로 설정 (스크립트 실행/패키지 import 모두)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from driver_pool import resolve_driver_path
 
 # 날짜 관련 함수
 def get_yesterday_date():
@@ -46,7 +50,7 @@ def setup_webdriver():
     chrome_options.page_load_strategy = 'eager'
     chrome_options.add_argument("--enable-unsafe-swiftshader")
     
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+    return webdriver.Chrome(service=Service(resolve_driver_path()), options=chrome_options)
 
 # 박스스코어 링크 가져오기 함수
 def get_boxscore_links(driver):
@@ -4,13 +4,20 @@ import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import WebDriverException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 import pandas as pd
+import sys
+
+# 같은 폴더의 모듈 import를 위한 경로 설정 (스크립트 실행/패키지 import 모두)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from boxscore_fetcher import PageFetcher, parse_boxscore_links, is_schedule_page, is_final_schedule, is_final_boxscore
+from driver_pool import DriverPool, new_driver
+from html_cache import HtmlCache
+from boxscore_parser import parse_boxscore
 
 # 날짜 관련 함수
 def get_yesterday_date():
@@ -37,16 +44,19 @@ def create_date_folder(date):
     return target_folder
 
 # 웹드라이버 설정 함수
-def setup_webdriver():
-    """크롬 웹드라이버 설정 및 반환"""
+def chrome_options_for_gamelog():
+    """경기 기록 크롤링용 크롬 옵션"""
     chrome_options = Options()
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--headless")
     chrome_options.page_load_strategy = 'eager'
     chrome_options.add_argument("--enable-unsafe-swiftshader")
-    
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+    return chrome_options
+
+def setup_webdriver():
+    """크롬 웹드라이버 설정 및 반환 (chromedriver 경로는 프로세스에서 한 번만 찾음)"""
+    return new_driver(chrome_options_for_gamelog)
 
 # 박스스코어 링크 가져오기 함수
 def get_boxscore_links(driver):
@@ -207,23 +217,82 @@ def save_data_to_csv(df, file_path):
     df.to_csv(file_path, index=False, encoding='utf-8-sig')
     print(f"✅ 데이터 저장 완료: {file_path}")
 
+# 박스스코어 HTML 처리 함수 (BeautifulSoup 버전, 결과 비교/벤치마크용)
+def save_boxscore_html_bs4(html, folder_name):
+    """박스스코어 페이지 HTML에서 타격/투수/로그 박스 데이터를 BeautifulSoup으로 추출해 CSV로 저장"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 타격 데이터 처리
+    df_batting, away_team, home_team = process_batting_data(soup)
+    file_path_batting = f'{folder_name}/{away_team}-{home_team}_batting.csv'
+    save_data_to_csv(df_batting, file_path_batting)
+
+    # **투수 데이터 처리**
+    df_pitching, _, _ = process_pitching_data(soup)
+    file_path_pitching = f'{folder_name}/{away_team}-{home_team}_pitching.csv'
+    save_data_to_csv(df_pitching, file_path_pitching)
+
+    # 로그 박스 데이터 처리
+    log_boxes_1_2 = soup.find_all('div', class_='log_box')[:2]
+    log_boxes_4_6 = soup.find_all('div', class_='log_box')[4:6]
+    
+    team_names = [away_team, home_team]
+    df_log_box_1_2 = process_log_boxes(log_boxes_1_2, team_names, prefix="타자기록")
+    df_log_box_4_6 = process_log_boxes(log_boxes_4_6, prefix="수비기록")
+    
+    df_log_box_combined = pd.concat([df_log_box_1_2, df_log_box_4_6], axis=1)
+    file_path_combined_log_box = f'{folder_name}/{away_team}-{home_team}_log_boxes.csv'
+    save_data_to_csv(df_log_box_combined, file_path_combined_log_box)
+
+# 박스스코어 HTML 처리 함수
+def save_boxscore_html(html, folder_name):
+    """박스스코어 페이지 HTML에서 타격/투수/로그 박스 데이터를 추출해 CSV로 저장 (lxml 파서, BeautifulSoup 버전과 같은 CSV)"""
+    boxscore = parse_boxscore(html)
+    away_team, home_team = boxscore["away_team"], boxscore["home_team"]
+    print(f"원정팀: {away_team}, 홈팀: {home_team}")
+    
+    save_data_to_csv(boxscore["batting"], f'{folder_name}/{away_team}-{home_team}_batting.csv')
+    save_data_to_csv(boxscore["pitching"], f'{folder_name}/{away_team}-{home_team}_pitching.csv')
+    save_data_to_csv(boxscore["log_boxes"], f'{folder_name}/{away_team}-{home_team}_log_boxes.csv')
+
 # 메인 크롤링 함수
-def crawl_gamelog(date=None):
-    """특정 날짜의 게임 로그 크롤링"""
+def crawl_gamelog(date=None, fixture_dir=None, save_html_dir=None, max_workers=None, cache_dir=None):
+    """
+    특정 날짜의 게임 로그 크롤링
+    일정/박스스코어 페이지는 HTTP로 동시에 받아오고, 정적 HTML에 내용이 없는 페이지만 드라이버 풀의 브라우저로 다시 받음
+    (브라우저는 처음 필요할 때 띄우므로 HTTP로 모두 받으면 브라우저를 띄우지 않음)
+    지난 날짜의 끝난 경기 일정/박스스코어는 html_cache에 저장해 두고 재시도/재실행 때 네트워크 없이 다시 사용
+    (cache_dir를 지정하지 않으면 CRAWL_HTML_CACHE_DIR, 빈 문자열이면 캐시 사용 안 함)
+    fixture_dir를 지정하면 저장된 HTML로 오프라인 실행 (save_html_dir로 저장한 HTML 사용)
+    """
     if date is None:
         date = get_yesterday_date()
     
     formatted_date = format_date(date)
     url = f"https://statiz.sporki.com/schedule/?m=daily&date={formatted_date}"
     
-    driver = None
+    # 지난 날짜라도 페이지에서 경기 종료가 확인된 경우에만 계속 캐시 (진행 중/중단/정정 중인 경기와 오늘 경기는 짧게만 캐시)
+    past_date = date.date() < datetime.now().date()
+    
+    def schedule_policy(html):
+        return "schedule_past" if past_date and is_final_schedule(html) else "live"
+    
+    def boxscore_policy(html):
+        return "boxscore" if past_date and is_final_boxscore(html) else "live"
+    
+    driver_pool = DriverPool(options_factory=chrome_options_for_gamelog, warm=False)
+    fetcher = PageFetcher(
+        driver_pool=driver_pool,
+        max_workers=max_workers,
+        fixture_dir=fixture_dir,
+        save_dir=save_html_dir,
+        cache=HtmlCache(cache_dir)
+    )
     try:
-        driver = setup_webdriver()
-        driver.get(url)
+        schedule_html = fetcher.fetch(url, is_complete=is_schedule_page, cache_policy=schedule_policy)
         print(f"메인 페이지 로딩 완료: {url}")
-        time.sleep(3)
         
-        boxscore_links = get_boxscore_links(driver)
+        boxscore_links = parse_boxscore_links(schedule_html) if schedule_html else []
         print('box', boxscore_links)
         
         if not boxscore_links:
@@ -232,39 +301,15 @@ def crawl_gamelog(date=None):
         
         folder_name = create_date_folder(date)
         
-        for href in boxscore_links:
+        pages = fetcher.fetch_all(boxscore_links, cache_policy=boxscore_policy)
+        for href, html in pages.items():
             print('here', href)
-            
-            if retry_get(driver, href):
-                try:
-                    soup = BeautifulSoup(driver.page_source, 'html.parser')
-                    
-                    # 타격 데이터 처리
-                    df_batting, away_team, home_team = process_batting_data(soup)
-                    file_path_batting = f'{folder_name}/{away_team}-{home_team}_batting.csv'
-                    save_data_to_csv(df_batting, file_path_batting)
-
-                    # **투수 데이터 처리**
-                    df_pitching, _, _ = process_pitching_data(soup)
-                    file_path_pitching = f'{folder_name}/{away_team}-{home_team}_pitching.csv'
-                    save_data_to_csv(df_pitching, file_path_pitching)
-
-                    # 로그 박스 데이터 처리
-                    log_boxes_1_2 = soup.find_all('div', class_='log_box')[:2]
-                    log_boxes_4_6 = soup.find_all('div', class_='log_box')[4:6]
-                    
-                    team_names = [away_team, home_team]
-                    df_log_box_1_2 = process_log_boxes(log_boxes_1_2, team_names, prefix="타자기록")
-                    df_log_box_4_6 = process_log_boxes(log_boxes_4_6, prefix="수비기록")
-                    
-                    df_log_box_combined = pd.concat([df_log_box_1_2, df_log_box_4_6], axis=1)
-                    file_path_combined_log_box = f'{folder_name}/{away_team}-{home_team}_log_boxes.csv'
-                    save_data_to_csv(df_log_box_combined, file_path_combined_log_box)
-                    
-                except Exception as e:
-                    print(f"{href} 이동 중 오류 발생: {e}")
-            
-            time.sleep(2)
+            if html is None:
+                continue
+            try:
+                save_boxscore_html(html, folder_name)
+            except Exception as e:
+                print(f"{href} 이동 중 오류 발생: {e}")
         
         print(f"✅ {formatted_date} 날짜의 모든 경기 데이터 저장이 완료되었습니다!")
         return True
@@ -273,9 +318,22 @@ def crawl_gamelog(date=None):
         print(f"오류 발생: {e}")
         return False
     finally:
-        if driver:
-            driver.quit()
+        fetcher.close()
+        driver_pool.close()
+        if fetcher.cache is not None:
+            fetcher.cache.prune()
 
 # 스크립트를 직접 실행할 때만 실행
 if __name__ == "__main__":
-    crawl_gamelog()
+    import argparse
+    parser = argparse.ArgumentParser(description='경기 기록 크롤링')
+    parser.add_argument('--date', type=str, help='크롤링 날짜 (YYYY-MM-DD 형식, 기본값: 어제)')
+    parser.add_argument('--fixture-dir', type=str, help='저장된 HTML 폴더 (오프라인 실행)')
+    parser.add_argument('--save-html', type=str, help='받아온 HTML을 저장할 폴더')
+    parser.add_argument('--workers', type=int, help='동시 요청 수')
+    parser.add_argument('--cache-dir', type=str, help='HTML 캐시 폴더 (빈 문자열이면 캐시 사용 안 함)')
+    args = parser.parse_args()
+
+    crawl_date = datetime.strptime(args.date, '%Y-%m-%d') if args.date else None
+    crawl_gamelog(crawl_date, fixture_dir=args.fixture_dir, save_html_dir=args.save_html, max_workers=args.workers,
+                  cache_dir=args.cache_dir)
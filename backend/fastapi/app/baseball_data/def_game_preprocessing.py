@@ -1,4 +1,5 @@
 import os
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
@@ -18,10 +19,67 @@ def load_batting_and_log_box_files(input_folder_path):
     log_box_files = [f for f in os.listdir(input_folder_path) if '_log_boxes.csv' in f]
     return batting_files, log_box_files
 
-def process_batting_data(batting_file_path, log_date):
-    """batting 데이터 처리"""
-    batting = pd.read_csv(batting_file_path)
-    df_team_total = batting[batting['타순'] == '팀 합계'].copy()
+# 일일 경기 기록(-play_log.csv) 열
+PLAY_LOG_COLUMNS = ['날짜', '팀', '기록', '기록값']
+
+# batting 파일에서 읽을 열 (팀 합계 행 찾기 + 기록)
+BATTING_COLUMNS = ['팀 이름', '타순', 'H', 'R', 'HR', 'SO', 'GDP', 'BB', 'HBP']
+
+def load_day_games(input_folder_path):
+    """
+    하루치 경기 파일을 한 번에 읽어 경기 목록과 batting/log_box 표를 만듭니다. (경기 순서 = 파일 목록 순서)
+
+    Returns:
+        tuple: (경기 DataFrame(경기/원정팀/홈팀), batting DataFrame, log_box DataFrame) - 두 표에는 '경기' 열 추가
+    """
+    batting_files, log_box_files = load_batting_and_log_box_files(input_folder_path)
+    pairs = list(zip(batting_files, log_box_files))
+    
+    games = pd.DataFrame(
+        [batting_file.replace('_batting.csv', '').split('-') for batting_file, _ in pairs],
+        columns=['원정팀', '홈팀']
+    )
+    games.insert(0, '경기', range(len(pairs)))
+    
+    def read_all(files, usecols=None, as_object=False):
+        frames = [pd.read_csv(os.path.join(input_folder_path, f), usecols=usecols) for f in files]
+        if as_object:
+            # 경기마다 읽은 dtype의 값을 그대로 유지 (합친 뒤에는 한 경기의 빈 칸 때문에 다른 경기의 정수 기록도 실수가 됨)
+            frames = [frame.astype(object) for frame in frames]
+        if not frames:
+            return pd.DataFrame(columns=['경기'])
+        # 하루에 한 번만 concat 하고, 각 행의 경기 번호는 파일별 행 수만큼 반복
+        day = pd.concat(frames, ignore_index=True)
+        day.insert(0, '경기', np.repeat(np.arange(len(frames)), [len(frame) for frame in frames]))
+        return day
+    
+    batting = read_all(
+        [batting_file for batting_file, _ in pairs], usecols=lambda col: col in BATTING_COLUMNS, as_object=True
+    )
+    log_box = read_all([log_box_file for _, log_box_file in pairs])
+    return games, batting, log_box
+
+def _play_log_frame(log_date, teams, records, values):
+    """팀/기록/기록값 배열로 일일 경기 기록 DataFrame 생성"""
+    return pd.DataFrame({'날짜': log_date, '팀': teams, '기록': records, '기록값': values}, columns=PLAY_LOG_COLUMNS)
+
+def _melt_values(teams, records, values):
+    """
+    (팀 × 기록) 값 배열을 세로로 펼침 (DataFrame.melt와 같은 순서: 기록마다 모든 팀)
+
+    Returns:
+        tuple: (팀 배열, 기록 배열, 기록값 배열)
+    """
+    return np.tile(teams, len(records)), np.repeat(records, len(teams)), values.ravel(order='F')
+
+def process_batting_data(batting, log_date):
+    """
+    batting 데이터 처리 (팀 합계 행의 기록을 팀/기록/기록값 세로 형태로 변환)
+
+    Returns:
+        tuple: (기록 DataFrame, 팀 합계 DataFrame)
+    """
+    df_team_total = batting[batting['타순'].to_numpy() == '팀 합계'].copy()
     
     df_team_total['BB'] = pd.to_numeric(df_team_total['BB'], errors='coerce').fillna(0)
     df_team_total['HBP'] = pd.to_numeric(df_team_total['HBP'], errors='coerce').fillna(0)
@@ -30,72 +88,118 @@ def process_batting_data(batting_file_path, log_date):
     include_cols = ['H', 'R', 'HR', 'SO', 'GDP', '사구']
     stat_cols = [col for col in batting.columns if col in include_cols]
     
-    result_data = []
-    for _, row in df_team_total.iterrows():
-        team_name = row['팀 이름']
-        for stat in stat_cols:
-            stat_value = row[stat]
-            if pd.notna(stat_value):
-                result_data.append({
-                    '날짜': log_date,
-                    '팀': team_name,
-                    '기록': stat,
-                    '기록값': stat_value
-                })
+    # 기록마다 dtype이 달라도 값이 그대로 저장되도록 object 배열로 펼침 (값이 없는 기록은 제외)
+    teams, records, values = _melt_values(
+        df_team_total['팀 이름'].to_numpy(), stat_cols, df_team_total[stat_cols].to_numpy(dtype=object)
+    )
+    has_value = pd.notna(values)
+    result_data = _play_log_frame(log_date, teams[has_value], records[has_value], values[has_value])
     return result_data, df_team_total
 
-def calculate_game_result(df_team_total, away_team, home_team, log_date):
-    """경기 결과 계산"""
-    team_scores = df_team_total[['팀 이름', 'R']].set_index('팀 이름')['R'].to_dict()
-    away_score, home_score = team_scores.get(away_team, 0), team_scores.get(home_team, 0)
-    
-    if away_score > home_score:
-        away_result, home_result = 'W', 'L'
-    elif away_score < home_score:
-        away_result, home_result = 'L', 'W'
-    else:
-        away_result, home_result = 'D', 'D'
-    
-    return [
-        {'날짜': log_date, '팀': away_team, '기록': '경기결과', '기록값': away_result},
-        {'날짜': log_date, '팀': home_team, '기록': '경기결과', '기록값': home_result}
-    ], away_result
-
-def update_current_rank(ranking_df, away_result, away_team, home_team):
-    """current_rank.csv 업데이트"""
-    if away_result == 'W':
-        ranking_df.loc[ranking_df['팀'] == away_team, '승'] += 1
-        ranking_df.loc[ranking_df['팀'] == home_team, '패'] += 1
-    elif away_result == 'L':
-        ranking_df.loc[ranking_df['팀'] == away_team, '패'] += 1
-        ranking_df.loc[ranking_df['팀'] == home_team, '승'] += 1
-    elif away_result == 'D':
-        ranking_df.loc[ranking_df['팀'] == away_team, '무'] += 1
-        ranking_df.loc[ranking_df['팀'] == home_team, '무'] += 1
+def _team_scores(df_team_total, games, team_col):
+    """경기마다 team_col 팀의 팀 합계 득점 (같은 경기에 같은 팀이 여러 번 있으면 마지막 값, 없으면 0)"""
+    # 득점 비교용 실수 배열 (빈 칸은 NaN - 기존처럼 어느 쪽과 비교해도 무승부)
+    total_runs = df_team_total['R'].to_numpy(dtype=float)
+    if not len(total_runs):
+        return np.zeros(len(games))
+    # (팀 합계 행 × 경기) 일치 행렬에서 경기마다 마지막으로 일치한 행을 고름
+    matches = (
+        (df_team_total['경기'].to_numpy()[:, None] == games['경기'].to_numpy()[None, :])
+        & (df_team_total['팀 이름'].to_numpy()[:, None] == games[team_col].to_numpy()[None, :])
+    )
+    last_match = len(total_runs) - 1 - matches[::-1].argmax(axis=0)
+    return np.where(matches.any(axis=0), total_runs[last_match], 0)
+
+def calculate_game_result(df_team_total, games, log_date):
+    """
+    경기 결과 계산 (팀 합계 득점 비교, 득점을 찾을 수 없는 팀은 0점)
+
+    Returns:
+        tuple: (경기결과 DataFrame, '원정결과' 열을 추가한 경기 DataFrame)
+    """
+    away_score = _team_scores(df_team_total, games, '원정팀')
+    home_score = _team_scores(df_team_total, games, '홈팀')
+    away_result = np.select([away_score > home_score, away_score < home_score], ['W', 'L'], 'D')
+    home_result = np.select([away_score < home_score, away_score > home_score], ['W', 'L'], 'D')
+    
+    # 경기마다 원정팀, 홈팀 순서
+    result_data = _play_log_frame(
+        log_date,
+        np.column_stack([games['원정팀'].to_numpy(), games['홈팀'].to_numpy()]).ravel(),
+        '경기결과',
+        np.column_stack([away_result, home_result]).ravel()
+    )
+    return result_data, games.assign(원정결과=away_result)
+
+def update_current_rank(ranking_df, games):
+    """current_rank.csv 업데이트 (경기 결과별 승/무/패 수를 팀마다 한 번에 더함)"""
+    away_result = games['원정결과'].to_numpy()
+    teams = np.concatenate([games['원정팀'].to_numpy(), games['홈팀'].to_numpy()])
+    results = np.concatenate([
+        np.select([away_result == 'W', away_result == 'L'], ['승', '패'], '무'),
+        np.select([away_result == 'W', away_result == 'L'], ['패', '승'], '무')
+    ])
+    
+    # (순위표 팀 × 경기 팀) 일치 행렬에서 결과별로 열을 골라 합산
+    matches = ranking_df['팀'].to_numpy()[:, None] == teams[None, :]
+    for column in ['승', '패', '무']:
+        ranking_df[column] += matches[:, results == column].sum(axis=1).astype(ranking_df[column].dtype)
     return ranking_df
 
+def count_keyword_occurrences(cells, keyword, index):
+    """
+    행마다 keyword가 들어간 칸의 선수 수를 셉니다. ('도루성공 : 김도영 (1회, 1호) , 박찬호 (3회, 2호)' → 2)
+    칸에서 마지막 'keyword : ' 뒤를 ')'로 나눈 조각 중 공백이 아닌 조각 수의 합입니다.
+
+    Args:
+        cells (pd.Series): log_box의 칸을 세로로 쌓은 Series (첫 번째 인덱스 레벨 = 행)
+        keyword (str): '도루성공', '실책' 등
+        index (pd.Index): log_box의 인덱스
+
+    Returns:
+        np.ndarray: 행별 개수 (index 순서)
+    """
+    cells = cells[cells.str.contains(keyword, regex=False, na=False)]
+    sections = cells.str.rsplit(f'{keyword} : ', n=1).str[-1]
+    # ')'로 나눈 조각 중 공백이 아닌 문자가 있는 조각 수 (조각마다 한 번만 매칭)
+    counts = sections.str.count(r'[^)\s][^)]*')
+    return counts.groupby(level=0).sum().reindex(index, fill_value=0).to_numpy(dtype='int64')
+
 def process_log_box_data(log_box, log_date):
-    """log_box 데이터 처리"""
-    def count_keyword_occurrences(row, keyword):
-        count = 0
-        for col in row.index:
-            if isinstance(row[col], str) and keyword in row[col]:
-                keyword_section = row[col].split(f'{keyword} : ')[-1]
-                players = [p.strip() for p in keyword_section.split(')') if p.strip()]
-                count += len(players)
-        return count
-    
-    log_box['도루'] = log_box.apply(lambda row: count_keyword_occurrences(row, '도루성공'), axis=1)
-    log_box['실책'] = log_box.apply(lambda row: count_keyword_occurrences(row, '실책'), axis=1)
-    
-    result_data = []
-    for _, row in log_box.iterrows():
-        team_name = row['팀명']
-        result_data.extend([
-            {'날짜': log_date, '팀': team_name, '기록': '도루', '기록값': row['도루']},
-            {'날짜': log_date, '팀': team_name, '기록': '실책', '기록값': row['실책']}
-        ])
-    return result_data
+    """log_box 데이터 처리 (팀별 도루/실책 수)"""
+    # 문자열 칸은 한 번만 쌓아서 두 키워드에 같이 사용
+    cells = log_box.select_dtypes(include='object').stack()
+    counts = np.column_stack([
+        count_keyword_occurrences(cells, '도루성공', log_box.index),
+        count_keyword_occurrences(cells, '실책', log_box.index)
+    ])
+    teams, records, values = _melt_values(log_box['팀명'].to_numpy(), ['도루', '실책'], counts)
+    return _play_log_frame(log_date, teams, records, values)
+
+def build_play_log(input_folder_path, log_date, ranking_df):
+    """
+    하루치 경기 파일로 일일 경기 기록을 만들고 순위표에 경기 결과를 반영합니다.
+    그날의 모든 경기를 한 표로 읽어 열 단위로 처리하고, 기록은 하루에 한 번 concat 합니다.
+
+    Args:
+        input_folder_path (str): crawled_data/<YYYYMMDD> 폴더
+        log_date (str): 기록 날짜 (YYYY-MM-DD)
+        ranking_df (DataFrame): current_rank.csv 순위표
+
+    Returns:
+        tuple: (날짜/팀/기록 순으로 정렬한 기록 DataFrame, 갱신한 순위표)
+    """
+    games, batting, log_box = load_day_games(input_folder_path)
+    
+    batting_data, df_team_total = process_batting_data(batting, log_date)
+    game_result, games = calculate_game_result(df_team_total, games, log_date)
+    ranking_df = update_current_rank(ranking_df, games)
+    log_box_data = process_log_box_data(log_box, log_date)
+    
+    df_log_combined = pd.concat([batting_data, game_result, log_box_data], ignore_index=True)
+    # 여러 열 정렬은 안정 정렬이고 각 표는 경기 순서이므로, 더블헤더의 같은 기록은 경기 순서대로 남음
+    df_log_combined_sorted = df_log_combined.sort_values(by=['날짜', '팀', '기록'])
+    return df_log_combined_sorted, ranking_df
 
 def save_final_dataframe(df_log_combined_sorted, output_file_path):
     """최종 DataFrame 저장"""
@@ -122,31 +226,9 @@ def main():
     output_folder_path = 'processed_data'
     
     create_output_folder(output_folder_path)
-    batting_files, log_box_files = load_batting_and_log_box_files(input_folder_path)
     
-    result_data = []
     ranking_df = pd.read_csv('current_rank.csv')
-    
-    for batting_file, log_box_file in zip(batting_files, log_box_files):
-        batting_file_path = os.path.join(input_folder_path, batting_file)
-        log_box_file_path = os.path.join(input_folder_path, log_box_file)
-        
-        away_team, home_team = batting_file.replace('_batting.csv', '').split('-')
-        
-        batting_data, df_team_total = process_batting_data(batting_file_path, log_date)
-        result_data.extend(batting_data)
-        
-        game_result, away_result = calculate_game_result(df_team_total, away_team, home_team, log_date)
-        result_data.extend(game_result)
-        
-        ranking_df = update_current_rank(ranking_df, away_result, away_team, home_team)
-        
-        log_box = pd.read_csv(log_box_file_path)
-        log_box_data = process_log_box_data(log_box, log_date)
-        result_data.extend(log_box_data)
-    
-    df_log_combined = pd.DataFrame(result_data)
-    df_log_combined_sorted = df_log_combined.sort_values(by=['날짜', '팀', '기록'])
+    df_log_combined_sorted, ranking_df = build_play_log(input_folder_path, log_date, ranking_df)
     
     output_file_path = os.path.join(output_folder_path, f'{current_date}-play_log.csv')
     save_final_dataframe(df_log_combined_sorted, output_file_path)
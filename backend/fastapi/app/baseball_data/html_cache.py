@@ -0,0 +1,238 @@
+# 원본: app/baseball_data/html_cache.py, 복사본: ai/gcp/html_cache.py (고친 뒤 ai/gcp/sync_shared_modules.py로 동기화)
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+
+# 캐시 폴더 (빈 문자열이면 캐시 사용 안 함)
+HTML_CACHE_DIR = os.getenv("CRAWL_HTML_CACHE_DIR", "html_cache")
+
+# 캐시 최대 크기(MB). prune()이 넘는 만큼 오래된 항목부터 삭제 (0이면 크기 제한 없음)
+HTML_CACHE_MAX_MB = float(os.getenv("CRAWL_HTML_CACHE_MAX_MB", "512"))
+
+# 출처별 유효 시간(초). None이면 바뀌지 않는 페이지로 보고 계속 사용
+CACHE_POLICIES = {
+    "boxscore": None,                                               # 종료가 확인된 경기의 박스스코어
+    "schedule_past": None,                                          # 모든 경기의 종료가 확인된 지난 날짜의 일정
+    "live": int(os.getenv("CRAWL_LIVE_CACHE_TTL", "60")),          # 오늘 경기 일정/박스스코어
+    "news_list": int(os.getenv("CRAWL_NEWS_LIST_CACHE_TTL", "300")),  # 뉴스 목록
+    "news_article": int(os.getenv("CRAWL_NEWS_ARTICLE_CACHE_TTL", "86400")),  # 뉴스 본문
+}
+
+
+def url_key(url):
+    """URL 인덱스 키 (URL의 sha1)"""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def content_hash(html):
+    """HTML 본문 키 (내용의 sha256). 내용이 같은 페이지는 한 번만 저장됨"""
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path, text):
+    # 동시에 같은 파일을 쓰거나 중간에 중단돼도 깨진 파일이 남지 않도록 임시 파일에 쓰고 교체
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class HtmlCache:
+    """
+    URL과 내용 해시로 찾는 디스크 HTML 캐시
+
+    html_cache/index/ab/<url sha1>.json     URL → 내용 해시, 받은 시각
+    html_cache/objects/cd/<sha256>.html     HTML 본문 (내용 해시 이름)
+
+    get(url, policy)는 policy의 유효 시간(CACHE_POLICIES)이 지나지 않은 경우에만 HTML을 돌려주므로
+    재시도(retry_job)나 과거 날짜 재실행 때 바뀌지 않는 페이지는 네트워크 요청 없이 읽습니다.
+    policy를 생략하면 저장할 때 기록한 policy를 사용합니다. (내용을 보고 policy를 정해 저장한 페이지)
+    prune()은 유효 시간이 지난 항목과 최대 크기(HTML_CACHE_MAX_MB)를 넘는 오래된 항목을 삭제합니다.
+    """
+
+    def __init__(self, root=None):
+        self.root = HTML_CACHE_DIR if root is None else root
+        self._stats_lock = threading.Lock()
+        self.stats = {"hit": 0, "stale": 0, "miss": 0, "stored": 0, "deduplicated": 0}
+
+    @property
+    def enabled(self):
+        return bool(self.root)
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _index_path(self, url):
+        key = url_key(url)
+        return os.path.join(self.root, "index", key[:2], key + ".json")
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest + ".html")
+
+    def _read_entry(self, url):
+        try:
+            with open(self._index_path(url), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # sha1 충돌 대비 URL 확인
+        return entry if entry.get("url") == url else None
+
+    @staticmethod
+    def _expired(entry, policy=None, now=None):
+        ttl = CACHE_POLICIES.get(policy or entry.get("policy"))
+        return ttl is not None and (now or time.time()) - entry["fetched_at"] > ttl
+
+    def is_fresh(self, url, policy=None):
+        """캐시에 유효한 HTML이 있는지 확인"""
+        if not self.enabled:
+            return False
+        entry = self._read_entry(url)
+        return entry is not None and not self._expired(entry, policy)
+
+    def get(self, url, policy=None):
+        """
+        캐시에서 HTML을 읽음
+
+        Args:
+            url (str): 페이지 URL
+            policy (str, optional): CACHE_POLICIES의 키 (None이면 저장할 때 기록한 policy)
+
+        Returns:
+            str: HTML (없거나 유효 시간이 지났으면 None)
+        """
+        if not self.enabled:
+            return None
+        entry = self._read_entry(url)
+        if entry is None:
+            self._count("miss")
+            return None
+        if self._expired(entry, policy):
+            self._count("stale")
+            return None
+        try:
+            with open(self._object_path(entry["content_hash"]), encoding="utf-8") as f:
+                html = f.read()
+        except OSError:
+            self._count("miss")
+            return None
+        self._count("hit")
+        return html
+
+    def put(self, url, html, policy):
+        """HTML을 캐시에 저장 (같은 내용은 본문 파일 하나를 공유)"""
+        if not self.enabled or not html:
+            return
+        digest = content_hash(html)
+        object_path = self._object_path(digest)
+        if os.path.exists(object_path):
+            self._count("deduplicated")
+        else:
+            _write_atomic(object_path, html)
+        _write_atomic(self._index_path(url), json.dumps({
+            "url": url,
+            "content_hash": digest,
+            "policy": policy,
+            "fetched_at": time.time()
+        }, ensure_ascii=False))
+        self._count("stored")
+
+    def _entries(self):
+        """(인덱스 파일 경로, 항목) 목록 (읽을 수 없는 인덱스 파일은 항목 None)"""
+        entries = []
+        for dir_path, _, file_names in os.walk(os.path.join(self.root, "index")):
+            for file_name in file_names:
+                if not file_name.endswith(".json"):
+                    continue
+                path = os.path.join(dir_path, file_name)
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        entries.append((path, json.load(f)))
+                except (OSError, ValueError):
+                    entries.append((path, None))
+        return entries
+
+    def _objects(self):
+        """내용 해시 → (본문 파일 경로, 크기)"""
+        objects = {}
+        for dir_path, _, file_names in os.walk(os.path.join(self.root, "objects")):
+            for file_name in file_names:
+                if file_name.endswith(".html"):
+                    path = os.path.join(dir_path, file_name)
+                    objects[file_name[:-len(".html")]] = (path, os.path.getsize(path))
+        return objects
+
+    def prune(self, max_mb=None):
+        """
+        캐시 정리
+        1. 유효 시간이 지난 항목(다음 get()에서 어차피 다시 받는 페이지)과 읽을 수 없는 항목 삭제
+        2. 어떤 항목도 가리키지 않는 본문 파일 삭제
+        3. 본문 전체 크기가 max_mb를 넘으면 받은 시각이 오래된 항목부터 삭제
+           (유효 시간이 있는 항목(뉴스 등)을 먼저, 그래도 넘으면 바뀌지 않는 페이지도 삭제)
+
+        Args:
+            max_mb (float, optional): 최대 크기(MB). None이면 HTML_CACHE_MAX_MB, 0이면 크기 제한 없음
+
+        Returns:
+            dict: 삭제한 항목 수, 본문 파일 수, 확보한 크기(byte)
+        """
+        result = {"removed_entries": 0, "removed_objects": 0, "freed_bytes": 0}
+        if not self.enabled or not os.path.isdir(self.root):
+            return result
+        max_bytes = (HTML_CACHE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+
+        def remove(path):
+            try:
+                os.remove(path)
+                return True
+            except OSError:
+                return False
+
+        now = time.time()
+        live = []
+        for path, entry in self._entries():
+            if entry is None or "content_hash" not in entry or self._expired(entry, now=now):
+                result["removed_entries"] += remove(path)
+            else:
+                live.append((path, entry))
+
+        objects = self._objects()
+        referenced = {entry["content_hash"] for _, entry in live}
+        for digest, (path, size) in objects.items():
+            if digest not in referenced and remove(path):
+                result["removed_objects"] += 1
+                result["freed_bytes"] += size
+        objects = {digest: value for digest, value in objects.items() if digest in referenced}
+
+        total = sum(size for _, size in objects.values())
+        if max_bytes and total > max_bytes:
+            # 유효 시간이 있는 항목 먼저, 그 안에서는 오래된 순서
+            live.sort(key=lambda item: (CACHE_POLICIES.get(item[1].get("policy")) is None, item[1]["fetched_at"]))
+            users = {}
+            for _, entry in live:
+                users[entry["content_hash"]] = users.get(entry["content_hash"], 0) + 1
+            for path, entry in live:
+                if total <= max_bytes:
+                    break
+                result["removed_entries"] += remove(path)
+                digest = entry["content_hash"]
+                users[digest] -= 1
+                # 본문은 마지막으로 가리키던 항목을 지울 때 삭제 (같은 내용을 공유하는 URL이 있을 수 있음)
+                if users[digest] == 0 and digest in objects and remove(objects[digest][0]):
+                    total -= objects[digest][1]
+                    result["removed_objects"] += 1
+                    result["freed_bytes"] += objects[digest][1]
+
+        if result["removed_entries"] or result["removed_objects"]:
+            print(f"HTML 캐시 정리: {result}")
+        return result
@@ -37,6 +37,7 @@ from router.saving_rule.saving_rule_router import router as saving_rule_router
 from router.report.report_router import router as report_router
 from router.game.game_router import router as game_router
 from utils.process_saving import process_savings_for_date
+from utils.catalog_cache import catalog_cache
 
 # 데이터베이스 초기화
 from database import engine
@@ -74,6 +75,11 @@ async def lifespan(app: FastAPI):
             logger.info("스케줄러 정상 종료됨")
         except Exception as e:
             logger.error(f"스케줄러 종료 중 오류 발생: {str(e)}")
+        try:
+            from utils.bank_http_client import close_bank_client
+            await close_bank_client()
+        except Exception as e:
+            logger.error(f"금융 API 클라이언트 종료 중 오류 발생: {str(e)}")
 
 app = FastAPI(
     title="야금야금 서비스 API",
@@ -286,6 +292,10 @@ def run_update_game_log():
         
         # 함수 실행
         process_json_game_logs()
+
+        # 백테스트용 시즌 기록 캐시 갱신
+        from utils.saving_backtest import season_history_cache
+        season_history_cache.invalidate()
         
         logger.info("경기 로그 저장 작업 성공")
         return True
@@ -309,6 +319,10 @@ def run_save_player_record():
         
         # 함수 실행
         process_game_data_folder()
+
+        # 백테스트용 시즌 기록 캐시 갱신
+        from utils.saving_backtest import season_history_cache
+        season_history_cache.invalidate()
         
         logger.info("선수 기록 저장 작업 성공")
         return True
@@ -377,7 +391,15 @@ def run_saving():
         
         # 함수 실행 (예외 처리 추가)
         try:
-            result = process_savings_for_date(None)
+            # SAVING_SHARDS가 2 이상이면 계정을 나눠 여러 프로세스에서 병렬 처리
+            num_shards = int(os.getenv("SAVING_SHARDS", "1"))
+            if num_shards > 1:
+                result = process_savings_for_date(None, mode="sharded", num_shards=num_shards)
+                if result.get("failed_shards"):
+                    logger.error(f"적립 처리 실패 샤드: {result['failed_shards']}")
+                    return False
+            else:
+                result = process_savings_for_date(None, mode="bulk")
             logger.info(f"처리 결과: {result}")
             return True
         except Exception as e:
@@ -427,6 +449,9 @@ def sync_run_trsnfer():
     try:
         return loop.run_until_complete(run_transfer())
     finally:
+        # 이 루프에서 만든 금융 API 클라이언트 연결 정리
+        from utils.bank_http_client import close_bank_client
+        loop.run_until_complete(close_bank_client())
         loop.close()
 
 def run_game_data_pipeline(**kwargs):
@@ -639,5 +664,16 @@ except Exception as e:
 async def root():
     return {"message": "야금야금 서비스 API에 오신 것을 환영합니다"}
 
+@app.get("/catalog-cache/stats")
+async def get_catalog_cache_stats():
+    """참조 데이터 캐시 적중/미적중 통계"""
+    return catalog_cache.stats()
+
+@app.get("/bank-api/scheduler/stats")
+async def get_bank_api_scheduler_stats():
+    """금융 API 호출 스케줄러의 분류별 토큰/대기열 길이/대기 시간 통계"""
+    from utils.bank_rate_limiter import bank_call_scheduler
+    return bank_call_scheduler.stats()
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="localhost", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,254 @@
+# mock_bank/load_test.py
+"""
+mock 금융 API 서버를 상대로 이체/잔액 조회 경로의 처리량과 지연 시간을 측정합니다.
+user_ssafy_api_utils → bank_post(공유 클라이언트, 토큰 버킷) 경로를 그대로 사용합니다.
+
+예시:
+    # mock 서버를 같은 프로세스에서 띄우고 이체 500건을 동시 16개로 실행
+    python -m mock_bank.load_test --spawn --mode transfer --requests 500 --concurrency 16 --latency lognormal:40,0.5
+
+    # 이미 떠 있는 mock 서버로 실제 DB의 이체 처리(process_actual_transfers) 실행
+    SSAFY_API_BASE_URL=http://localhost:8090 python -m mock_bank.load_test --mode process --date 2025-04-01
+
+    # CI 회귀 검사: p95가 200ms를 넘거나 처리량이 초당 50건 미만이면 종료 코드 1
+    python -m mock_bank.load_test --spawn --mode transfer --max-p95-ms 200 --min-throughput 50 --output result.json
+
+클라이언트 쪽 호출 한도(bank_rate_limiter)도 그대로 적용되므로, 서버 한계를 보려면
+BANK_RATE_TRANSFER / BANK_RATE_INQUIRY 환경 변수(또는 --client-rate)로 한도를 올려서 실행하세요.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import threading
+from datetime import date, datetime
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def percentile(values, ratio):
+    """정렬된 값 목록에서 백분위 값을 반환합니다. (최근접 순위)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(ratio * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def summarize(mode, outcomes, elapsed):
+    """결과 목록 {"success", "elapsed_ms", "error_code"}로 처리량/지연 통계를 만듭니다."""
+    latencies = sorted(outcome["elapsed_ms"] for outcome in outcomes)
+    succeeded = sum(1 for outcome in outcomes if outcome["success"])
+    error_codes = {}
+    for outcome in outcomes:
+        if not outcome["success"]:
+            code = outcome.get("error_code") or "NO_RESPONSE"
+            error_codes[code] = error_codes.get(code, 0) + 1
+    return {
+        "mode": mode,
+        "requests": len(outcomes),
+        "succeeded": succeeded,
+        "failed": len(outcomes) - succeeded,
+        "error_codes": error_codes,
+        "elapsed_sec": round(elapsed, 3),
+        "throughput_per_sec": round(len(outcomes) / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+    }
+
+
+async def run_transfer_load(requests_count, concurrency, accounts):
+    """가상의 계좌 쌍으로 이체를 실행합니다. (배치 우선순위, 멱등 키 사용 - process_actual_transfers와 같은 방식)"""
+    from router.user.user_ssafy_api_utils import transfer_money
+    from utils.api_header_utils import generate_institution_transaction_unique_no
+    from utils.transfer_executor import run_transfers
+    from utils.bank_rate_limiter import batch_priority
+
+    jobs = [
+        {
+            "account_id": index,
+            "kwargs": {
+                "user_key": f"loadtest-{index % accounts}",
+                "withdrawal_account": f"9990000000{index % accounts:06d}",
+                "deposit_account": f"9991000000{index % accounts:06d}",
+                "amount": 1000,
+                "llm_text": "부하 테스트",
+                "unique_no": generate_institution_transaction_unique_no(),
+            },
+        }
+        for index in range(requests_count)
+    ]
+    started = time.perf_counter()
+    with batch_priority():
+        outcomes = await run_transfers(jobs, transfer_money, concurrency=concurrency)
+    return outcomes, time.perf_counter() - started
+
+
+async def run_balance_load(requests_count, concurrency, accounts):
+    """잔액 조회를 동시에 실행합니다. (사용자 요청 우선순위 - 계좌 조회 엔드포인트와 같은 경로)"""
+    from router.user.user_ssafy_api_utils import get_account_balance
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(index):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await get_account_balance(f"loadtest-{index % accounts}", f"9990000000{index % accounts:06d}")
+                outcome = {"success": True, "error_code": None}
+            except Exception as e:
+                outcome = {"success": False, "error_code": getattr(e, "code", None)}
+            outcome["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return outcome
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(run_one(index) for index in range(requests_count)))
+    return outcomes, time.perf_counter() - started
+
+
+async def run_process_load(date_param, concurrency):
+    """실제 DB의 DailyTransfer로 process_actual_transfers를 실행합니다. (DB 연결 필요)"""
+    from database import SessionLocal
+    from utils.process_transfer import process_actual_transfers
+
+    outcomes = []
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        summary = await process_actual_transfers(db, date_param, concurrency=concurrency)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+    # 건별 지연은 process_actual_transfers가 기록하지 않으므로 건수/처리량만 집계
+    for _ in range(summary.get("processed_accounts", 0)):
+        outcomes.append({"success": True, "error_code": None, "elapsed_ms": 0.0})
+    for _ in range(summary.get("failed_accounts", 0)):
+        outcomes.append({"success": False, "error_code": None, "elapsed_ms": 0.0})
+    return outcomes, elapsed, summary
+
+
+def start_mock_server(host, port, latency, error_rate, rate_limit):
+    """mock 서버를 백그라운드 스레드에서 띄우고 요청을 받을 수 있을 때까지 기다립니다."""
+    import uvicorn
+    from mock_bank.server import MockBankConfig, create_app
+
+    env_config = MockBankConfig.from_env()
+    config = MockBankConfig(
+        latency=latency or env_config.latency,
+        error_rate=error_rate if error_rate is not None else env_config.error_rate,
+        rate_limit=rate_limit or env_config.rate_limit,
+        initial_balance=env_config.initial_balance,
+    )
+    server = uvicorn.Server(uvicorn.Config(create_app(config), host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError(f"mock 서버를 시작하지 못했습니다. ({host}:{port})")
+        time.sleep(0.05)
+    logger.info(f"mock 서버 시작: http://{host}:{port} (지연 {config.latency}, 오류율 {config.error_rate}, "
+                f"한도 {config.rate_limit})")
+    return server, thread
+
+
+async def run(args):
+    from utils.bank_http_client import close_bank_client
+    from utils.bank_rate_limiter import bank_call_scheduler
+
+    summary = None
+    try:
+        if args.mode == "transfer":
+            outcomes, elapsed = await run_transfer_load(args.requests, args.concurrency, args.accounts)
+        elif args.mode == "balance":
+            outcomes, elapsed = await run_balance_load(args.requests, args.concurrency, args.accounts)
+        else:
+            date_param = datetime.strptime(args.date, "%Y-%m-%d").date() if args.date else date.today()
+            outcomes, elapsed, summary = await run_process_load(date_param, args.concurrency)
+    finally:
+        await close_bank_client()
+
+    result = summarize(args.mode, outcomes, elapsed)
+    result["concurrency"] = args.concurrency
+    result["client_scheduler"] = bank_call_scheduler.stats()
+    if summary is not None:
+        result["transfer_summary"] = {key: str(value) if isinstance(value, date) else value
+                                      for key, value in summary.items()}
+    return result
+
+
+def check_thresholds(result, max_p95_ms=None, min_throughput=None, max_error_rate=None):
+    """회귀 기준을 넘은 항목 목록을 반환합니다. (비어 있으면 통과)"""
+    violations = []
+    if max_p95_ms is not None and result["latency_ms"]["p95"] > max_p95_ms:
+        violations.append(f"p95 {result['latency_ms']['p95']}ms > {max_p95_ms}ms")
+    if min_throughput is not None and result["throughput_per_sec"] < min_throughput:
+        violations.append(f"처리량 {result['throughput_per_sec']}/s < {min_throughput}/s")
+    if max_error_rate is not None and result["requests"]:
+        error_rate = result["failed"] / result["requests"]
+        if error_rate > max_error_rate:
+            violations.append(f"실패율 {error_rate:.3f} > {max_error_rate}")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='mock 금융 API 부하 테스트')
+    parser.add_argument('--mode', choices=['transfer', 'balance', 'process'], default='transfer',
+                        help='transfer: 가상 이체, balance: 잔액 조회, process: 실제 DB로 process_actual_transfers 실행')
+    parser.add_argument('--requests', type=int, default=200, help='요청 수 (transfer/balance)')
+    parser.add_argument('--concurrency', type=int, default=8, help='동시 요청 수')
+    parser.add_argument('--accounts', type=int, default=50, help='가상 계좌 수 (transfer/balance)')
+    parser.add_argument('--date', type=str, help='이체 날짜 (YYYY-MM-DD, process 모드)')
+    parser.add_argument('--spawn', action='store_true', help='mock 서버를 이 프로세스에서 띄움')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', type=str, help='mock 서버 지연 분포 (--spawn)')
+    parser.add_argument('--error-rate', type=float, help='mock 서버 일시적 오류 비율 (--spawn)')
+    parser.add_argument('--rate-limit', type=str, help='mock 서버 요청 한도 "<초당>,<버킷>" (--spawn)')
+    parser.add_argument('--client-rate', type=str, help='클라이언트 호출 한도 "<초당>,<버킷>" (이체/조회 분류에 적용)')
+    parser.add_argument('--output', type=str, help='결과 JSON 파일 경로')
+    parser.add_argument('--max-p95-ms', type=float, help='p95 지연 상한 (넘으면 종료 코드 1)')
+    parser.add_argument('--min-throughput', type=float, help='초당 처리량 하한 (못 미치면 종료 코드 1)')
+    parser.add_argument('--max-error-rate', type=float, help='실패율 상한 0~1 (넘으면 종료 코드 1)')
+
+    args = parser.parse_args()
+
+    # 금융 API 모듈은 import 시점에 환경 변수를 읽으므로 import 전에 설정
+    if args.spawn:
+        os.environ["SSAFY_API_BASE_URL"] = f"http://{args.host}:{args.port}"
+        start_mock_server(args.host, args.port, args.latency, args.error_rate, args.rate_limit)
+    elif not os.getenv("SSAFY_API_BASE_URL"):
+        parser.error("--spawn 또는 SSAFY_API_BASE_URL 환경 변수가 필요합니다.")
+    if args.client_rate:
+        os.environ["BANK_RATE_TRANSFER"] = args.client_rate
+        os.environ["BANK_RATE_INQUIRY"] = args.client_rate
+    os.environ.setdefault("SSAFY_API_KEY", "loadtest")
+
+    result = asyncio.run(run(args))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    violations = check_thresholds(result, args.max_p95_ms, args.min_throughput, args.max_error_rate)
+    if violations:
+        logger.error(f"회귀 기준 초과: {', '.join(violations)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+# mock_bank/server.py
+"""
+SSAFY 금융 API 대역(mock) 서버.
+user_ssafy_api_utils가 사용하는 요청/응답 형식을 그대로 흉내 내며, 상태는 메모리에만 보관합니다.
+
+실행:
+    python -m mock_bank.server --port 8090 --latency lognormal:40,0.5 --error-rate 0.01 --rate-limit 50,50
+    SSAFY_API_BASE_URL=http://localhost:8090 으로 API 서버/배치 작업을 실행하면 이 서버로 요청이 갑니다.
+
+환경 변수 (명령행 인자가 우선):
+    MOCK_BANK_LATENCY      지연 분포. fixed:<ms> | uniform:<최소ms>,<최대ms> | lognormal:<중앙값ms>,<sigma> (기본 fixed:0)
+    MOCK_BANK_ERROR_RATE   일시적 오류(503) 비율 0~1 (기본 0)
+    MOCK_BANK_RATE_LIMIT   "<초당 요청>,<버킷 크기>" 초과 시 429 (기본 제한 없음)
+    MOCK_BANK_BALANCE      처음 보는 계좌의 초기 잔액 (기본 1000000000)
+"""
+import os
+import math
+import time
+import random
+import asyncio
+import logging
+import secrets
+import threading
+from datetime import datetime
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 헤더 필수 항목 (수시입출금 API는 userKey도 필요)
+REQUIRED_HEADER_FIELDS = (
+    "apiName", "transmissionDate", "transmissionTime", "institutionCode",
+    "fintechAppNo", "apiServiceCode", "institutionTransactionUniqueNo", "apiKey"
+)
+
+
+class MockBankConfig:
+    def __init__(self, latency="fixed:0", error_rate=0.0, rate_limit=None, initial_balance=1_000_000_000):
+        self.latency = latency
+        self.error_rate = float(error_rate)
+        self.rate_limit = rate_limit
+        self.initial_balance = int(initial_balance)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            latency=os.getenv("MOCK_BANK_LATENCY", "fixed:0"),
+            error_rate=os.getenv("MOCK_BANK_ERROR_RATE", "0"),
+            rate_limit=os.getenv("MOCK_BANK_RATE_LIMIT") or None,
+            initial_balance=os.getenv("MOCK_BANK_BALANCE", "1000000000"),
+        )
+
+    def sample_latency(self):
+        """설정된 분포에서 응답 지연(초)을 뽑습니다."""
+        kind, _, params = self.latency.partition(":")
+        values = [float(value) for value in params.split(",") if value]
+        if kind == "uniform":
+            return random.uniform(values[0], values[1]) / 1000
+        if kind == "lognormal":
+            median, sigma = values[0], (values[1] if len(values) > 1 else 0.5)
+            return random.lognormvariate(math.log(max(median, 0.001)), sigma) / 1000
+        return (values[0] if values else 0) / 1000
+
+
+class MockBankState:
+    """사용자/계좌/거래 내역/사용된 기관거래고유번호를 메모리에 보관합니다."""
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.users = {}          # userId -> {"userId", "userKey", "created"}
+        self.accounts = {}       # accountNo -> {"userKey", "balance", "holder", "history": []}
+        self.unique_nos = set()
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "by_api": {}}
+        self._tokens = None
+        self._updated = time.monotonic()
+        if config.rate_limit:
+            rate, _, burst = config.rate_limit.partition(",")
+            self._rate = float(rate)
+            self._burst = int(burst or max(1, int(self._rate)))
+            self._tokens = float(self._burst)
+
+    def take_token(self):
+        """요청 한도를 확인합니다. 한도가 없으면 항상 True"""
+        if self._tokens is None:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def account(self, account_no, user_key=None):
+        """계좌를 반환합니다. 처음 보는 계좌는 초기 잔액으로 만듭니다. (실DB 계좌로 부하 테스트할 수 있도록)"""
+        account = self.accounts.get(account_no)
+        if account is None:
+            account = {"userKey": user_key, "balance": self.config.initial_balance,
+                       "holder": "테스트", "history": []}
+            self.accounts[account_no] = account
+        return account
+
+
+def _error(code, message, status_code=400):
+    return JSONResponse(status_code=status_code, content={"responseCode": code, "responseMessage": message})
+
+
+def _ok(header, rec):
+    response_header = {
+        "responseCode": "H0000",
+        "responseMessage": "정상처리 되었습니다.",
+        "apiName": header.get("apiName"),
+        "transmissionDate": header.get("transmissionDate"),
+        "transmissionTime": header.get("transmissionTime"),
+        "institutionCode": header.get("institutionCode"),
+        "apiKey": header.get("apiKey"),
+        "apiServiceCode": header.get("apiServiceCode"),
+        "institutionTransactionUniqueNo": header.get("institutionTransactionUniqueNo"),
+    }
+    return {"Header": response_header, "REC": rec}
+
+
+def _new_account_no():
+    return "999" + "".join(str(secrets.randbelow(10)) for _ in range(13))
+
+
+def _record(account, transaction_type, type_name, amount, summary):
+    now = datetime.now()
+    account["history"].append({
+        "transactionUniqueNo": str(len(account["history"]) + 1),
+        "transactionDate": now.strftime("%Y%m%d"),
+        "transactionTime": now.strftime("%H%M%S"),
+        "transactionType": transaction_type,
+        "transactionTypeName": type_name,
+        "transactionBalance": str(amount),
+        "transactionAfterBalance": str(account["balance"]),
+        "transactionSummary": summary or "",
+    })
+    return account["history"][-1]
+
+
+def create_app(config=None):
+    """설정을 받아 mock 금융 API 앱을 만듭니다."""
+    config = config or MockBankConfig.from_env()
+    state = MockBankState(config)
+    app = FastAPI(title="Mock SSAFY 금융 API")
+    app.state.bank = state
+
+    async def simulate(api_name):
+        """지연/한도/일시적 오류를 흉내 냅니다. 오류 응답이면 반환, 정상이면 None"""
+        state.stats["requests"] += 1
+        state.stats["by_api"][api_name] = state.stats["by_api"].get(api_name, 0) + 1
+        if not state.take_token():
+            state.stats["rate_limited"] += 1
+            return _error("Q1000", "요청 한도를 초과했습니다.", status_code=429)
+        delay = config.sample_latency()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if config.error_rate and random.random() < config.error_rate:
+            state.stats["errors"] += 1
+            return _error("Q1001", "일시적인 오류입니다.", status_code=503)
+        return None
+
+    def validate_header(body, api_name):
+        """공통 헤더를 검사합니다. 오류면 (None, 오류 응답)"""
+        header = body.get("Header")
+        if not isinstance(header, dict):
+            return None, _error("H1000", "HEADER 정보가 유효하지 않습니다.")
+        for field in REQUIRED_HEADER_FIELDS:
+            if not header.get(field):
+                return None, _error("H1000", f"HEADER 정보가 유효하지 않습니다. ({field})")
+        if header["apiName"] != api_name or header["apiServiceCode"] != api_name:
+            return None, _error("H1001", "API 이름이 유효하지 않습니다.")
+        unique_no = str(header["institutionTransactionUniqueNo"])
+        if len(unique_no) != 20 or not unique_no.isdigit():
+            return None, _error("H1007", "기관거래고유번호가 유효하지 않습니다.")
+        # 실DB의 사용자로도 부하 테스트할 수 있도록 등록하지 않은 userKey도 형식만 확인
+        if not header.get("userKey"):
+            return None, _error("E4004", "userKey가 유효하지 않습니다.")
+        with state.lock:
+            if unique_no in state.unique_nos:
+                return None, _error("H1008", "기관거래고유번호가 중복된 값입니다.")
+            state.unique_nos.add(unique_no)
+        return header, None
+
+    # --- 사용자 ---
+
+    @app.post("/member/search")
+    async def search_member(request: Request):
+        body = await request.json()
+        error = await simulate("member/search")
+        if error:
+            return error
+        user = state.users.get(body.get("userId"))
+        if user is None:
+            return _error("E4003", "존재하지 않는 ID입니다.")
+        return user
+
+    @app.post("/member")
+    async def create_member(request: Request):
+        body = await request.json()
+        error = await simulate("member")
+        if error:
+            return error
+        user_id = body.get("userId")
+        if not user_id:
+            return _error("E4001", "ID가 유효하지 않습니다.")
+        with state.lock:
+            if user_id in state.users:
+                return _error("E4002", "이미 존재하는 ID입니다.")
+            user_key = secrets.token_hex(18)
+            state.users[user_id] = {"userId": user_id, "userKey": user_key,
+                                    "created": datetime.now().isoformat()}
+        return state.users[user_id]
+
+    # --- 수시입출금 ---
+
+    @app.post("/edu/demandDeposit/createDemandDepositAccount")
+    async def create_demand_deposit_account(request: Request):
+        body = await request.json()
+        error = await simulate("createDemandDepositAccount")
+        if error:
+            return error
+        header, error = validate_header(body, "createDemandDepositAccount")
+        if error:
+            return error
+        account_no = _new_account_no()
+        with state.lock:
+            state.accounts[account_no] = {"userKey": header["userKey"], "balance": 0,
+                                          "holder": "테스트", "history": []}
+        return _ok(header, {"bankCode": "999", "accountNo": account_no, "currency": {"currency": "KRW"}})
+
+    @app.post("/edu/demandDeposit/updateDemandDepositAccountDeposit")
+    async def deposit(request: Request):
+        body = await request.json()
+        error = await simulate("updateDemandDepositAccountDeposit")
+        if error:
+            return error
+        header, error = validate_header(body, "updateDemandDepositAccountDeposit")
+        if error:
+            return error
+        amount = int(body.get("transactionBalance", 0))
+        with state.lock:
+            account = state.account(body.get("accountNo"), header["userKey"])
+            account["balance"] += amount
+            transaction = _record(account, "1", "입금", amount, body.get("transactionSummary"))
+        return _ok(header, {"transactionUniqueNo": transaction["transactionUniqueNo"],
+                            "transactionDate": transaction["transactionDate"]})
+
+    @app.post("/edu/demandDeposit/updateDemandDepositAccountTransfer")
+    async def transfer(request: Request):
+        body = await request.json()
+        error = await simulate("updateDemandDepositAccountTransfer")
+        if error:
+            return error
+        header, error = validate_header(body, "updateDemandDepositAccountTransfer")
+        if error:
+            return error
+        try:
+            amount = int(body.get("transactionBalance"))
+        except (TypeError, ValueError):
+            return _error("A1011", "거래금액이 유효하지 않습니다.")
+        with state.lock:
+            withdrawal = state.account(body.get("withdrawalAccountNo"), header["userKey"])
+            deposit_account = state.account(body.get("depositAccountNo"))
+            if withdrawal["balance"] < amount:
+                return _error("A1014", "계좌잔액이 부족하여 거래가 실패했습니다.")
+            withdrawal["balance"] -= amount
+            deposit_account["balance"] += amount
+            withdrawal_tx = _record(withdrawal, "2", "출금(이체)", amount, body.get("withdrawalTransactionSummary"))
+            deposit_tx = _record(deposit_account, "1", "입금(이체)", amount, body.get("depositTransactionSummary"))
+        return _ok(header, [
+            {"transactionUniqueNo": withdrawal_tx["transactionUniqueNo"], "accountNo": body.get("withdrawalAccountNo"),
+             "transactionDate": withdrawal_tx["transactionDate"], "transactionType": "2",
+             "transactionTypeName": "출금(이체)", "transactionAccountNo": body.get("depositAccountNo")},
+            {"transactionUniqueNo": deposit_tx["transactionUniqueNo"], "accountNo": body.get("depositAccountNo"),
+             "transactionDate": deposit_tx["transactionDate"], "transactionType": "1",
+             "transactionTypeName": "입금(이체)", "transactionAccountNo": body.get("withdrawalAccountNo")},
+        ])
+
+    @app.post("/edu/demandDeposit/inquireDemandDepositAccountBalance")
+    async def balance(request: Request):
+        body = await request.json()
+        error = await simulate("inquireDemandDepositAccountBalance")
+        if error:
+            return error
+        header, error = validate_header(body, "inquireDemandDepositAccountBalance")
+        if error:
+            return error
+        with state.lock:
+            account = state.account(body.get("accountNo"), header["userKey"])
+        return _ok(header, {"bankCode": "999", "accountNo": body.get("accountNo"),
+                            "accountBalance": str(account["balance"]), "currency": "KRW"})
+
+    @app.post("/edu/demandDeposit/inquireTransactionHistoryList")
+    async def transaction_history(request: Request):
+        body = await request.json()
+        error = await simulate("inquireTransactionHistoryList")
+        if error:
+            return error
+        header, error = validate_header(body, "inquireTransactionHistoryList")
+        if error:
+            return error
+        start_date = body.get("startDate", "00000000")
+        end_date = body.get("endDate", "99999999")
+        transaction_type = body.get("transactionType", "A")
+        with state.lock:
+            account = state.account(body.get("accountNo"), header["userKey"])
+            transactions = [
+                tx for tx in account["history"]
+                if start_date <= tx["transactionDate"] <= end_date
+                and (transaction_type == "A"
+                     or (transaction_type == "M" and tx["transactionType"] == "1")
+                     or (transaction_type == "D" and tx["transactionType"] == "2"))
+            ]
+        if body.get("orderByType", "DESC") == "DESC":
+            transactions = list(reversed(transactions))
+        return _ok(header, {"totalCount": str(len(transactions)), "list": transactions})
+
+    @app.post("/edu/demandDeposit/inquireDemandDepositAccountHolderName")
+    async def holder_name(request: Request):
+        body = await request.json()
+        error = await simulate("inquireDemandDepositAccountHolderName")
+        if error:
+            return error
+        header, error = validate_header(body, "inquireDemandDepositAccountHolderName")
+        if error:
+            return error
+        account = state.accounts.get(body.get("accountNo"))
+        if account is None:
+            return _error("A1003", "계좌번호가 유효하지 않습니다.")
+        return _ok(header, {"bankCode": "999", "bankName": "테스트은행",
+                            "accountNo": body.get("accountNo"), "userName": account["holder"]})
+
+    # --- 통계 ---
+
+    @app.get("/mock/stats")
+    async def mock_stats():
+        return {**state.stats, "accounts": len(state.accounts), "users": len(state.users)}
+
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description='Mock SSAFY 금융 API 서버')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', type=str, help='지연 분포 (예: fixed:20, uniform:10,80, lognormal:40,0.5)')
+    parser.add_argument('--error-rate', type=float, help='일시적 오류(503) 비율 0~1')
+    parser.add_argument('--rate-limit', type=str, help='"<초당 요청>,<버킷 크기>" 초과 시 429')
+
+    args = parser.parse_args()
+    env_config = MockBankConfig.from_env()
+    config = MockBankConfig(
+        latency=args.latency or env_config.latency,
+        error_rate=args.error_rate if args.error_rate is not None else env_config.error_rate,
+        rate_limit=args.rate_limit or env_config.rate_limit,
+        initial_balance=env_config.initial_balance,
+    )
+    logger.info(f"Mock 금융 API 시작: 지연 {config.latency}, 오류율 {config.error_rate}, 한도 {config.rate_limit}")
+    uvicorn.run(create_app(config), host=args.host, port=args.port)
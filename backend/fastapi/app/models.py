@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Float, ForeignKey, Date, Text, DateTime, func
+from sqlalchemy import Boolean, Column, Integer, String, Float, ForeignKey, Date, Text, DateTime, UniqueConstraint, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -251,6 +251,10 @@ class TicketNumber(Base):
 # 일일 잔액 테이블
 class DailyBalances(Base):
     __tablename__ = "daily_balances"
+    # 계정별 날짜당 한 행 (일일 잔액 upsert 기준)
+    __table_args__ = (
+        UniqueConstraint("ACCOUNT_ID", "DATE", name="uq_daily_balances_account_date"),
+    )
 
     DAILY_BALANCES_ID = Column(Integer, primary_key=True)
     ACCOUNT_ID = Column(Integer, ForeignKey("account.ACCOUNT_ID"), nullable=False)
@@ -461,3 +465,42 @@ class DailyTransfer(Base):
     
     # 관계 정의
     account = relationship("Account", back_populates="daily_transfers")
+
+# 이체 저널 테이블 (DailyTransfer 행별 실제 이체 진행 상태, 중단 후 이어서 처리하는 기준)
+# 같은 계정/날짜에 DailyTransfer가 여러 개여도(적립 재실행 등) 이체마다 멱등 키가 따로 발급됨
+class TransferJournal(Base):
+    __tablename__ = "transfer_journal"
+    __table_args__ = (
+        UniqueConstraint("DAILY_TRANSFER_ID", name="uq_transfer_journal_daily_transfer"),
+        Index("ix_transfer_journal_account_date", "ACCOUNT_ID", "DATE"),
+    )
+
+    TRANSFER_JOURNAL_ID = Column(Integer, primary_key=True)
+    DAILY_TRANSFER_ID = Column(Integer, ForeignKey("daily_transfer.DAILY_TRANSFER_ID"), nullable=False)
+    ACCOUNT_ID = Column(Integer, ForeignKey("account.ACCOUNT_ID"), nullable=False)
+    DATE = Column(Date, nullable=False)
+    AMOUNT = Column(Integer)
+    IDEMPOTENCY_KEY = Column(String(20), nullable=False, unique=True)  # institutionTransactionUniqueNo
+    STATUS = Column(String(20), nullable=False)  # PENDING / COMPLETED / FAILED
+    ATTEMPTS = Column(Integer, default=0)
+    ERROR_MESSAGE = Column(String(255))
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    # 관계 정의
+    account = relationship("Account")
+
+# 계정별 적용 이자율 테이블 (기본 + 미션 우대 이자율을 미리 계산해 둔 값, used_mission 변경 시 함께 갱신)
+class AccountInterestRate(Base):
+    __tablename__ = "account_interest_rate"
+
+    ACCOUNT_ID = Column(Integer, ForeignKey("account.ACCOUNT_ID", ondelete="CASCADE"), primary_key=True)
+    # 파이썬에서 계산한 값을 그대로 보관하도록 배정밀도(DOUBLE) 사용
+    BASE_INTEREST_RATE = Column(Float(precision=53))
+    MISSION_INTEREST_RATE = Column(Float(precision=53))
+    TOTAL_INTEREST_RATE = Column(Float(precision=53))
+    MISSION_DETAILS = Column(Text)  # 미션별 내역 (JSON)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    # 관계 정의
+    account = relationship("Account")
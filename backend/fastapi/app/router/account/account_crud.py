@@ -4,6 +4,8 @@ from typing import Optional, List, Dict, Any
 import os
 
 import models
+from utils.rule_index import rule_index
+from utils.account_rate import refresh_account_rates
 from router.account.account_schema import AccountCreate, AccountUpdate, BalanceUpdate,TransactionMessageCreate,TransactionMessageUpdate
 
 def get_account_by_id(db: Session, account_id: int):
@@ -70,8 +72,14 @@ def update_account(db: Session, account_id: int, account_update: AccountUpdate):
     for key, value in update_data.items():
         setattr(db_account, key, value)
     
+    # 기본 이자율이 바뀌면 적용 이자율도 같은 트랜잭션으로 갱신
+    if "INTEREST_RATE" in update_data:
+        refresh_account_rates(db, [account_id])
+    
     db.commit()
     db.refresh(db_account)
+    if "TEAM_ID" in update_data:
+        rule_index.invalidate()
     return db_account
 
 def delete_account(db: Session, account_id: int):
@@ -82,6 +90,7 @@ def delete_account(db: Session, account_id: int):
     
     db.delete(db_account)
     db.commit()
+    rule_index.invalidate()
     return True
 
 def update_account_balance(db: Session, account_id: int, balance_update: BalanceUpdate):
@@ -11,6 +11,9 @@ import models
 from router.account import account_schema, account_crud
 from router.user.user_router import get_current_user
 from router.player import player_schema
+from utils.catalog_cache import catalog_cache
+from utils.rule_index import rule_index
+from utils.account_rate import get_account_rate
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -226,6 +229,8 @@ async def create_account(
         # 최종 커밋
         db.commit()
         db.refresh(db_account)
+        # 새 계정의 규칙이 추가되었으므로 규칙 색인을 다시 만들도록 함
+        rule_index.invalidate()
         
         logger.info(f"적금 계좌 생성 완료: 계정 ID {db_account.ACCOUNT_ID}, 계좌번호 {account_num}")
         
@@ -348,46 +353,28 @@ async def get_my_daily_savings_detail(
         # 결과 목록
         result = []
         
+        # 사용자 적금 규칙 (적립 금액 단위 확인용) - 계정 단위로 한 번만 조회
+        user_rules_by_detail = {}
+        for user_rule in db.query(models.UserSavingRule).filter(
+            models.UserSavingRule.ACCOUNT_ID == account_id
+        ).all():
+            user_rules_by_detail.setdefault(user_rule.SAVING_RULE_DETAIL_ID, user_rule)
+        
         for saving in daily_savings:
-            # 적금 규칙 타입 조회
-            rule_type = db.query(models.SavingRuleType).filter(
-                models.SavingRuleType.SAVING_RULE_TYPE_ID == saving.SAVING_RULED_TYPE_ID
-            ).first()
-            
-            # 적금 규칙 상세 조회
-            rule_detail = db.query(models.SavingRuleDetail).filter(
-                models.SavingRuleDetail.SAVING_RULE_DETAIL_ID == saving.SAVING_RULED_DETAIL_ID
-            ).first()
+            # 적금 규칙 타입 / 상세 / 기록 타입 조회 (카탈로그 캐시)
+            rule_type = catalog_cache.get_saving_rule_type(db, saving.SAVING_RULED_TYPE_ID)
+            rule_detail = catalog_cache.get_saving_rule_detail(db, saving.SAVING_RULED_DETAIL_ID)
+            record_type = catalog_cache.get_record_type_of_detail(db, saving.SAVING_RULED_DETAIL_ID)
             
             # 규칙 설명 가져오기
             rule_description = rule_detail.RULE_DESCRIPTION if rule_detail else "알 수 없는 규칙"
             
-            # 적금 규칙 조회
-            saving_rule = None
-            record_type = None
-            if rule_detail:
-                saving_rule = db.query(models.SavingRuleList).filter(
-                    models.SavingRuleList.SAVING_RULE_ID == rule_detail.SAVING_RULE_ID
-                ).first()
-                
-                if saving_rule:
-                    # 기록 타입 조회
-                    record_type = db.query(models.RecordType).filter(
-                        models.RecordType.RECORD_TYPE_ID == saving_rule.RECORD_TYPE_ID
-                    ).first()
-            
-            # 사용자 적금 규칙 조회 (적립 금액 단위 확인용)
-            user_rule = db.query(models.UserSavingRule).filter(
-                models.UserSavingRule.ACCOUNT_ID == account_id,
-                models.UserSavingRule.SAVING_RULE_DETAIL_ID == saving.SAVING_RULED_DETAIL_ID
-            ).first()
+            user_rule = user_rules_by_detail.get(saving.SAVING_RULED_DETAIL_ID)
             
             # 선수 정보 (해당되는 경우)
             player = None
             if user_rule and user_rule.PLAYER_ID:
-                player = db.query(models.Player).filter(
-                    models.Player.PLAYER_ID == user_rule.PLAYER_ID
-                ).first()
+                player = catalog_cache.get_player(db, user_rule.PLAYER_ID)
                 
                 # 선수 이름을 규칙 설명에 포함
                 if player and "이(가)" in rule_description:
@@ -429,27 +416,20 @@ async def read_account_detail(
         account = await get_user_account(db, current_user)
         account_id = account.ACCOUNT_ID
         
-        # 이자율 정보 계산
-        from router.mission import mission_crud  # 순환 참조 방지를 위해 여기서 import
-        interest_details = mission_crud.calculate_account_interest_details(db, account_id)
-        
-        # 사용자의 미션 조회 (진행 중 또는 완료된 미션)
-        used_missions = db.query(models.UsedMission).filter(
-            models.UsedMission.ACCOUNT_ID == account_id
-        ).all()
+        # 이자율 정보 조회 (미션 변경 시 갱신되는 적용 이자율을 기본 키로 조회)
+        interest_details = get_account_rate(db, account_id)
         
-        # 활성 미션 정보 구성
+        # 활성 미션 정보 구성 (저장된 미션별 내역 사용)
         active_missions = []
-        for used_mission in used_missions:
-            mission = used_mission.mission
+        for mission_detail in interest_details['mission_details']:
             active_missions.append({
-                "MISSION_ID": mission.MISSION_ID,
-                "MISSION_NAME": mission.MISSION_NAME,
-                "MISSION_MAX_COUNT": mission.MISSION_MAX_COUNT,
-                "MISSION_RATE": mission.MISSION_RATE,
-                "COUNT": used_mission.COUNT,
-                "CURRENT_COUNT": used_mission.COUNT,
-                "MAX_COUNT": used_mission.MAX_COUNT
+                "MISSION_ID": mission_detail["MISSION_ID"],
+                "MISSION_NAME": mission_detail["MISSION_NAME"],
+                "MISSION_MAX_COUNT": mission_detail["MISSION_MAX_COUNT"],
+                "MISSION_RATE": mission_detail["MISSION_RATE"],
+                "COUNT": mission_detail["CURRENT_COUNT"],
+                "CURRENT_COUNT": mission_detail["CURRENT_COUNT"],
+                "MAX_COUNT": mission_detail["MAX_COUNT"]
             })
         
         # 계정 상세 정보 구성
@@ -484,35 +464,27 @@ async def get_account_interest_details(
         account = await get_user_account(db, current_user)
         account_id = account.ACCOUNT_ID
         
-        # 이자율 정보 계산
-        from router.mission import mission_crud  # 순환 참조 방지를 위해 여기서 import
-        interest_details = mission_crud.calculate_account_interest_details(db, account_id)
-        
-        # 필수 필드가 없어서 발생하는 에러 해결을 위해 필드 추가
-        if 'total_mission_rate' not in interest_details:
+        # 이자율 정보 조회 (미션 변경 시 갱신되는 적용 이자율을 기본 키로 조회)
+        rate = get_account_rate(db, account_id)
+        interest_details = {
+            'base_interest_rate': rate['base_interest_rate'],
+            'mission_interest_rate': rate['mission_interest_rate'],
+            'total_interest_rate': rate['total_interest_rate'],
             # total_mission_rate는 mission_interest_rate와 동일하게 처리
-            interest_details['total_mission_rate'] = interest_details.get('mission_interest_rate', 0)
-        
-        if 'mission_details' not in interest_details:
-            # 미션 상세 정보 조회
-            used_missions = db.query(models.UsedMission).filter(
-                models.UsedMission.ACCOUNT_ID == account_id
-            ).all()
-            
-            mission_details = []
-            for used_mission in used_missions:
-                mission = used_mission.mission
-                mission_detail = {
-                    "mission_id": mission.MISSION_ID,
-                    "mission_name": mission.MISSION_NAME,
-                    "mission_rate": mission.MISSION_RATE,
-                    "current_count": used_mission.COUNT,
-                    "max_count": used_mission.MAX_COUNT,
-                    "is_completed": used_mission.COUNT >= used_mission.MAX_COUNT
+            'total_mission_rate': rate['mission_interest_rate'],
+            # 미션 상세 정보 (저장된 미션별 내역 사용)
+            'mission_details': [
+                {
+                    "mission_id": mission_detail["MISSION_ID"],
+                    "mission_name": mission_detail["MISSION_NAME"],
+                    "mission_rate": mission_detail["MISSION_RATE"],
+                    "current_count": mission_detail["CURRENT_COUNT"],
+                    "max_count": mission_detail["MAX_COUNT"],
+                    "is_completed": mission_detail["CURRENT_COUNT"] >= mission_detail["MAX_COUNT"]
                 }
-                mission_details.append(mission_detail)
-            
-            interest_details['mission_details'] = mission_details
+                for mission_detail in rate['mission_details']
+            ]
+        }
         
         return interest_details
         
@@ -555,6 +527,8 @@ async def setup_account(
         
         db.commit()
         db.refresh(account)
+        # 응원팀이 바뀌면 팀/상대팀 규칙의 색인 키도 바뀜
+        rule_index.invalidate()
         
         logger.info(f"계좌 설정 완료: 계정 ID {account_id}")
         return account
@@ -623,46 +597,24 @@ async def get_saving_rules(
         # ORM 모델을 딕셔너리로 변환하면서 관련 정보 포함
         result = []
         for rule in rules:
-            # 적금 규칙 타입 이름 조회
-            rule_type = db.query(models.SavingRuleType).filter(
-                models.SavingRuleType.SAVING_RULE_TYPE_ID == rule.SAVING_RULE_TYPE_ID
-            ).first()
+            # 적금 규칙 타입 이름 조회 (카탈로그 캐시)
+            rule_type = catalog_cache.get_saving_rule_type(db, rule.SAVING_RULE_TYPE_ID)
             rule_type_name = rule_type.SAVING_RULE_TYPE_NAME if rule_type else None
             
-            # 적금 규칙 상세 조회
-            rule_detail = db.query(models.SavingRuleDetail).filter(
-                models.SavingRuleDetail.SAVING_RULE_DETAIL_ID == rule.SAVING_RULE_DETAIL_ID
-            ).first()
-            
-            # 기록 유형 이름 조회
-            record_name = None
-            if rule_detail:
-                # 적금 규칙 조회
-                saving_rule = db.query(models.SavingRuleList).filter(
-                    models.SavingRuleList.SAVING_RULE_ID == rule_detail.SAVING_RULE_ID
-                ).first()
-                
-                if saving_rule:
-                    # 기록 유형 이름 조회
-                    record_type = db.query(models.RecordType).filter(
-                        models.RecordType.RECORD_TYPE_ID == saving_rule.RECORD_TYPE_ID
-                    ).first()
-                    record_name = record_type.RECORD_NAME if record_type else None
+            # 기록 유형 이름 조회 (규칙 상세 → 규칙 목록 → 기록 유형)
+            record_type = catalog_cache.get_record_type_of_detail(db, rule.SAVING_RULE_DETAIL_ID)
+            record_name = record_type.RECORD_NAME if record_type else None
             
             # 선수 타입 이름 조회
             player_type = None
             if rule.PLAYER_TYPE_ID:
-                player_type_obj = db.query(models.PlayerType).filter(
-                    models.PlayerType.PLAYER_TYPE_ID == rule.PLAYER_TYPE_ID
-                ).first()
+                player_type_obj = catalog_cache.get_player_type(db, rule.PLAYER_TYPE_ID)
                 player_type = player_type_obj.PLAYER_TYPE_NAME if player_type_obj else None
             
             # 선수 이름 조회
             player_name = None
             if rule.PLAYER_ID:
-                player = db.query(models.Player).filter(
-                    models.Player.PLAYER_ID == rule.PLAYER_ID
-                ).first()
+                player = catalog_cache.get_player(db, rule.PLAYER_ID)
                 player_name = player.PLAYER_NAME if player else None
             
             # 결과 딕셔너리 구성
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 
 import models
+from utils.account_rate import get_account_rate, refresh_account_rates, refresh_mission_accounts
 from router.mission.mission_schema import MissionCreate, MissionUpdate, UsedMissionCreate, UsedMissionUpdate
 
 def get_mission_by_id(db: Session, mission_id: int):
@@ -41,6 +42,10 @@ def update_mission(db: Session, mission_id: int, mission: MissionUpdate):
     for key, value in update_data.items():
         setattr(db_mission, key, value)
     
+    # 미션 이자율/정보가 바뀌면 이 미션을 등록한 계정들의 적용 이자율과 내역도 갱신
+    if update_data.keys() & {"MISSION_RATE", "MISSION_NAME", "MISSION_MAX_COUNT"}:
+        refresh_mission_accounts(db, mission_id)
+    
     db.commit()
     db.refresh(db_mission)
     return db_mission
@@ -97,6 +102,7 @@ def create_used_mission(db: Session, used_mission: UsedMissionCreate):
         created_at=datetime.now()
     )
     db.add(db_used_mission)
+    refresh_account_rates(db, [used_mission.ACCOUNT_ID])
     db.commit()
     db.refresh(db_used_mission)
     return db_used_mission
@@ -116,6 +122,7 @@ def update_used_mission(db: Session, used_mission_id: int, used_mission: UsedMis
     if db_used_mission.COUNT > db_used_mission.MAX_COUNT:
         db_used_mission.COUNT = db_used_mission.MAX_COUNT
     
+    refresh_account_rates(db, [db_used_mission.ACCOUNT_ID])
     db.commit()
     db.refresh(db_used_mission)
     return db_used_mission
@@ -126,7 +133,9 @@ def delete_used_mission(db: Session, used_mission_id: int):
     if not db_used_mission:
         return False
     
+    account_id = db_used_mission.ACCOUNT_ID
     db.delete(db_used_mission)
+    refresh_account_rates(db, [account_id])
     db.commit()
     return True
 
@@ -143,6 +152,7 @@ def increment_mission_count(db: Session, account_id: int, mission_id: int):
     
     # 카운트 증가
     db_used_mission.COUNT += 1
+    refresh_account_rates(db, [account_id])
     db.commit()
     db.refresh(db_used_mission)
     return db_used_mission
@@ -229,6 +239,7 @@ def calculate_account_interest_rate(db: Session, account_id: int):
 def calculate_account_interest_details(db: Session, account_id: int):
     """
     계정의 기본 이자율과 미션으로 인한 추가 이자율 계산
+    미션 변경 시 함께 갱신되는 account_interest_rate에서 기본 키로 읽습니다. (utils.account_rate)
     
     Args:
         db (Session): 데이터베이스 세션
@@ -237,39 +248,12 @@ def calculate_account_interest_details(db: Session, account_id: int):
     Returns:
         dict: 기본 이자율, 미션의 이자율 정보
     """
-    # 계정 정보 조회
-    account = db.query(models.Account).filter(models.Account.ACCOUNT_ID == account_id).first()
-    if not account:
+    rate = get_account_rate(db, account_id)
+    if rate is None:
         return None
     
-    # 모든 사용자 미션 조회 (진행 중 또는 완료된 미션)
-    used_missions = db.query(models.UsedMission).filter(
-        models.UsedMission.ACCOUNT_ID == account_id
-    ).all()
-    
-    # 미션 이자율 계산 (count와 mission_rate를 곱한 값의 합)
-    mission_details = []
-    total_mission_rate = 0
-    
-    for used_mission in used_missions:
-        mission = used_mission.mission
-        
-        # 실제 추가될 이자율 계산 (count * mission_rate)
-        additional_rate = min(used_mission.COUNT, used_mission.MAX_COUNT) * mission.MISSION_RATE
-        
-        mission_details.append({
-            "MISSION_ID": mission.MISSION_ID,
-            "MISSION_NAME": mission.MISSION_NAME,
-            "MISSION_MAX_COUNT": mission.MISSION_MAX_COUNT,
-            "MISSION_RATE": mission.MISSION_RATE,
-            "CURRENT_COUNT": used_mission.COUNT,
-            "ADDITIONAL_RATE": additional_rate
-        })
-        
-        total_mission_rate += additional_rate
-    
     return {
-        'base_interest_rate': account.INTEREST_RATE,
-        'mission_interest_rate': total_mission_rate,
-        'total_interest_rate': account.INTEREST_RATE+total_mission_rate,
+        'base_interest_rate': rate['base_interest_rate'],
+        'mission_interest_rate': rate['mission_interest_rate'],
+        'total_interest_rate': rate['total_interest_rate'],
     }
@@ -17,6 +17,7 @@ from datetime import datetime
 
 # OCR 모듈 import
 from utils.ticket_certificate import decode_qr_and_barcodes, clova_ocr
+from utils.account_rate import refresh_account_rates
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -328,15 +329,16 @@ async def check_ocr(
                     error=f"티켓은 인증되었으나, 미션 최대 적용 횟수({used_mission.MAX_COUNT}회)에 도달하여 금리가 추가 적용되지 않았습니다."
                 )
             
-            # 미션 카운트 증가
+            # 미션 카운트 증가 (적용 이자율도 같은 트랜잭션으로 갱신)
             used_mission.COUNT += 1
+            refresh_account_rates(db, [account.ACCOUNT_ID])
             
             # 변경사항 커밋
             db.commit()
             
-            # 이전에 호출하던 이자율 업데이트 함수 대신, 이자 재계산 함수 호출
+            # 이전에 호출하던 이자율 업데이트 함수 대신, 이자 재계산 함수 호출 (인증한 날부터 새 금리 적용)
             from utils.interest_utils import recalculate_interest_history
-            await recalculate_interest_history(db,account.ACCOUNT_ID)
+            await recalculate_interest_history(db, account.ACCOUNT_ID, from_date=datetime.now().date())
             
             # 성공 응답
             logger.info(f"티켓 인증 및 미션 적용 성공: 계정 ID {account.ACCOUNT_ID}, 티켓 번호 {ticket_number}")
@@ -4,6 +4,7 @@ from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
 
 import models
+from utils.catalog_cache import catalog_cache
 from router.player.player_schema import PlayerCreate, PlayerUpdate, PlayerRecordCreate, DailyReportCreate
 
 def get_player_by_id(db: Session, player_id: int):
@@ -42,6 +43,7 @@ def create_player(db: Session, player: PlayerCreate):
     )
     db.add(db_player)
     db.commit()
+    catalog_cache.invalidate("player")
     db.refresh(db_player)
     return db_player
 
@@ -57,6 +59,7 @@ def update_player(db: Session, player_id: int, player: PlayerUpdate):
         setattr(db_player, key, value)
     
     db.commit()
+    catalog_cache.invalidate("player")
     db.refresh(db_player)
     return db_player
 
@@ -68,6 +71,7 @@ def delete_player(db: Session, player_id: int):
     
     db.delete(db_player)
     db.commit()
+    catalog_cache.invalidate("player")
     return True
 
 def increase_player_like(db: Session, player_id: int):
@@ -78,6 +82,7 @@ def increase_player_like(db: Session, player_id: int):
     
     db_player.LIKE_COUNT += 1
     db.commit()
+    # 좋아요 수는 카탈로그 캐시에 넣지 않으므로 캐시를 비우지 않음
     db.refresh(db_player)
     return db_player
 
@@ -171,9 +176,7 @@ def get_player_monthly_stats(db: Session, player_id: int, year: int, month: int)
     
     result = {}
     for record in records:
-        record_type = db.query(models.RecordType).filter(
-            models.RecordType.RECORD_TYPE_ID == record.RECORD_TYPE_ID
-        ).first()
+        record_type = catalog_cache.get_record_type(db, record.RECORD_TYPE_ID)
         
         if record_type:
             result[record_type.RECORD_NAME] = record.total
@@ -9,6 +9,10 @@ from database import get_db
 import models
 from router.report import report_schema, report_crud
 from router.user.user_router import get_current_user
+from utils.account_stream import iter_account_chunks, JobMemory
+from utils.catalog_cache import catalog_cache
+from utils.saving_engine import SWEEP_RECORD_TYPE_ID
+from utils.series_analysis import analyze_series
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -1063,12 +1067,15 @@ async def get_all_system_accounts_summary(
         
         # 금융 API 유틸리티 import
         from router.user.user_ssafy_api_utils import get_account_balance
+        
+        # 팀별 시리즈 분석 (스윕 여부) - 날짜당 한 번
+        series = analyze_series(db, game_date)
 
         for account in accounts:
             account_id = account.ACCOUNT_ID
             
             # 팀 정보 조회
-            our_team = db.query(models.Team).filter(models.Team.TEAM_ID == account.TEAM_ID).first()
+            our_team = catalog_cache.get_team(db, account.TEAM_ID)
             if not our_team:
                 logger.warning(f"팀 ID {account.TEAM_ID}를 찾을 수 없습니다.")
                 continue
@@ -1096,12 +1103,12 @@ async def get_all_system_accounts_summary(
             
             # 상대팀 정보 조회
             opposing_team_id = game_schedule.AWAY_TEAM_ID if game_schedule.HOME_TEAM_ID == account.TEAM_ID else game_schedule.HOME_TEAM_ID
-            opposing_team = db.query(models.Team).filter(models.Team.TEAM_ID == opposing_team_id).first()
+            opposing_team = catalog_cache.get_team(db, opposing_team_id)
             
             # 최애 선수 정보 조회
             favorite_player = None
             if account.FAVORITE_PLAYER_ID:
-                favorite_player = db.query(models.Player).filter(models.Player.PLAYER_ID == account.FAVORITE_PLAYER_ID).first()
+                favorite_player = catalog_cache.get_player(db, account.FAVORITE_PLAYER_ID)
             
             # 적금 규칙 조회
             user_saving_rules = db.query(models.UserSavingRule).filter(
@@ -1113,30 +1120,20 @@ async def get_all_system_accounts_summary(
             expected_records = {}  # 예상되는 기록 키 저장
             
             for rule in user_saving_rules:
-                # 규칙 유형 조회
-                rule_type = db.query(models.SavingRuleType).filter(
-                    models.SavingRuleType.SAVING_RULE_TYPE_ID == rule.SAVING_RULE_TYPE_ID
-                ).first()
-                
-                # 규칙 상세 조회
-                rule_detail = db.query(models.SavingRuleDetail).filter(
-                    models.SavingRuleDetail.SAVING_RULE_DETAIL_ID == rule.SAVING_RULE_DETAIL_ID
-                ).first()
+                # 규칙 유형 / 상세 조회 (카탈로그 캐시)
+                rule_type = catalog_cache.get_saving_rule_type(db, rule.SAVING_RULE_TYPE_ID)
+                rule_detail = catalog_cache.get_saving_rule_detail(db, rule.SAVING_RULE_DETAIL_ID)
                 
                 if not rule_detail or not rule_type:
                     continue
                 
                 # 기록 유형 조회
-                saving_rule = db.query(models.SavingRuleList).filter(
-                    models.SavingRuleList.SAVING_RULE_ID == rule_detail.SAVING_RULE_ID
-                ).first()
+                saving_rule = catalog_cache.get_saving_rule(db, rule_detail.SAVING_RULE_ID)
                 
                 if not saving_rule:
                     continue
                     
-                record_type = db.query(models.RecordType).filter(
-                    models.RecordType.RECORD_TYPE_ID == saving_rule.RECORD_TYPE_ID
-                ).first()
+                record_type = catalog_cache.get_record_type(db, saving_rule.RECORD_TYPE_ID)
                 
                 if not record_type:
                     continue
@@ -1151,7 +1148,7 @@ async def get_all_system_accounts_summary(
                     expected_records[rule_name] = 0  # 기본값 0으로 설정
                 elif rule.PLAYER_ID:
                     # 선수 정보 조회
-                    player = db.query(models.Player).filter(models.Player.PLAYER_ID == rule.PLAYER_ID).first()
+                    player = catalog_cache.get_player(db, rule.PLAYER_ID)
                     if player and (favorite_player and player.PLAYER_ID == favorite_player.PLAYER_ID):
                         rule_name = f"선수_{record_type.RECORD_NAME}"
                         expected_records[rule_name] = 0  # 기본값 0으로 설정
@@ -1185,20 +1182,23 @@ async def get_all_system_accounts_summary(
             
             # 경기 결과 업데이트 (우리팀)
             for log in our_team_logs:
-                record_type = db.query(models.RecordType).filter(
-                    models.RecordType.RECORD_TYPE_ID == log.RECORD_TYPE_ID
-                ).first()
+                record_type = catalog_cache.get_record_type(db, log.RECORD_TYPE_ID)
                 
                 if record_type:
                     key = f"우리팀_{record_type.RECORD_NAME}"
                     if key in game_results:  # savings_rules에 있는 경우만 업데이트
                         game_results[key] = log.COUNT
             
+            # 스윕은 경기 기록이 아니라 시리즈 분석 결과로 판정
+            sweep_record_type = catalog_cache.get_record_type(db, SWEEP_RECORD_TYPE_ID)
+            if sweep_record_type:
+                key = f"우리팀_{sweep_record_type.RECORD_NAME}"
+                if key in game_results:
+                    game_results[key] = 1 if account.TEAM_ID in series["sweeps"] else 0
+            
             # 경기 결과 업데이트 (상대팀)
             for log in opposing_team_logs:
-                record_type = db.query(models.RecordType).filter(
-                    models.RecordType.RECORD_TYPE_ID == log.RECORD_TYPE_ID
-                ).first()
+                record_type = catalog_cache.get_record_type(db, log.RECORD_TYPE_ID)
                 
                 if record_type:
                     key = f"상대팀_{record_type.RECORD_NAME}"
@@ -1208,9 +1208,7 @@ async def get_all_system_accounts_summary(
             # 경기 결과 업데이트 (최애선수)
             if favorite_player:
                 for record in favorite_player_records:
-                    record_type = db.query(models.RecordType).filter(
-                        models.RecordType.RECORD_TYPE_ID == record.RECORD_TYPE_ID
-                    ).first()
+                    record_type = catalog_cache.get_record_type(db, record.RECORD_TYPE_ID)
                     
                     if record_type:
                         key = f"선수_{record_type.RECORD_NAME}"
@@ -1312,10 +1310,10 @@ async def get_weekly_report_data(
     """
     try:
         logger.info("모든 사용자의 주간 레포트 데이터 조회")
+        memory = JobMemory()
         
-        # 모든 계정 조회
-        accounts = db.query(models.Account).all()
-        if not accounts:
+        # 계정 존재 여부만 먼저 확인 (전체 계정은 아래에서 청크 단위로 조회)
+        if db.query(models.Account.ACCOUNT_ID).first() is None:
             logger.warning("조회할 계정이 없음")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1337,104 +1335,76 @@ async def get_weekly_report_data(
         previous_week_start = current_week_start - timedelta(days=7)  # 지난 주 월요일
         previous_week_end = current_week_start - timedelta(days=1)  # 지난 주 일요일
         
+        # 팀별 주간 전적 (승리 1 / 패배 2 / 무승부 3) - 계정마다가 아니라 팀 단위로 한 번
+        def weekly_team_records(week_start, week_end):
+            records = {}
+            for team_id, record_type_id, total in db.query(
+                models.GameLog.TEAM_ID, models.GameLog.RECORD_TYPE_ID, func.sum(models.GameLog.COUNT)
+            ).filter(
+                models.GameLog.RECORD_TYPE_ID.in_([1, 2, 3]),
+                models.GameLog.DATE >= week_start,
+                models.GameLog.DATE <= week_end
+            ).group_by(models.GameLog.TEAM_ID, models.GameLog.RECORD_TYPE_ID).all():
+                records[(team_id, record_type_id)] = int(total or 0)
+            return records
+        
+        current_week_records = weekly_team_records(current_week_start, current_week_end)
+        previous_week_records = weekly_team_records(previous_week_start, previous_week_end)
+        
         # 모든 계정에 대한 데이터 수집
         all_accounts_data = []
         
-        for account in accounts:
-            # 사용자 정보 가져오기
-            user = db.query(models.User).filter(models.User.USER_ID == account.USER_ID).first()
-            user_name = user.NAME if user else "Unknown User"
-            
-            # 팀 정보 가져오기
-            team = db.query(models.Team).filter(models.Team.TEAM_ID == account.TEAM_ID).first()
-            team_name = team.TEAM_NAME if team else "Unknown Team"
-            
-            # 이번 주 송금 금액 계산 (DailyTransfer 테이블 사용)
-            current_week_transfers = db.query(func.sum(models.DailyTransfer.AMOUNT)).filter(
-                models.DailyTransfer.ACCOUNT_ID == account.ACCOUNT_ID,
-                models.DailyTransfer.DATE >= current_week_start,
-                models.DailyTransfer.DATE <= current_week_end
-            ).scalar() or 0
-            
-            # 지난 주 송금 금액 계산 (DailyTransfer 테이블 사용)
-            previous_week_transfers = db.query(func.sum(models.DailyTransfer.AMOUNT)).filter(
-                models.DailyTransfer.ACCOUNT_ID == account.ACCOUNT_ID,
-                models.DailyTransfer.DATE >= previous_week_start,
-                models.DailyTransfer.DATE <= previous_week_end
-            ).scalar() or 0
-            
-            # 이번 주 팀 전적 계산
-            current_week_wins = db.query(func.sum(models.GameLog.COUNT)).filter(
-                models.GameLog.TEAM_ID == account.TEAM_ID,
-                models.GameLog.RECORD_TYPE_ID == 1,  # 승리
-                models.GameLog.DATE >= current_week_start,
-                models.GameLog.DATE <= current_week_end
-            ).scalar() or 0
-            
-            current_week_losses = db.query(func.sum(models.GameLog.COUNT)).filter(
-                models.GameLog.TEAM_ID == account.TEAM_ID,
-                models.GameLog.RECORD_TYPE_ID == 2,  # 패배
-                models.GameLog.DATE >= current_week_start,
-                models.GameLog.DATE <= current_week_end
-            ).scalar() or 0
-            
-            current_week_draws = db.query(func.sum(models.GameLog.COUNT)).filter(
-                models.GameLog.TEAM_ID == account.TEAM_ID,
-                models.GameLog.RECORD_TYPE_ID == 3,  # 무승부
-                models.GameLog.DATE >= current_week_start,
-                models.GameLog.DATE <= current_week_end
-            ).scalar() or 0
-            
-            # 지난 주 팀 전적 계산
-            previous_week_wins = db.query(func.sum(models.GameLog.COUNT)).filter(
-                models.GameLog.TEAM_ID == account.TEAM_ID,
-                models.GameLog.RECORD_TYPE_ID == 1,  # 승리
-                models.GameLog.DATE >= previous_week_start,
-                models.GameLog.DATE <= previous_week_end
-            ).scalar() or 0
-            
-            previous_week_losses = db.query(func.sum(models.GameLog.COUNT)).filter(
-                models.GameLog.TEAM_ID == account.TEAM_ID,
-                models.GameLog.RECORD_TYPE_ID == 2,  # 패배
-                models.GameLog.DATE >= previous_week_start,
-                models.GameLog.DATE <= previous_week_end
-            ).scalar() or 0
-            
-            previous_week_draws = db.query(func.sum(models.GameLog.COUNT)).filter(
-                models.GameLog.TEAM_ID == account.TEAM_ID,
-                models.GameLog.RECORD_TYPE_ID == 3,  # 무승부
-                models.GameLog.DATE >= previous_week_start,
-                models.GameLog.DATE <= previous_week_end
-            ).scalar() or 0
-            
-            # 현재 총 적립액
-            current_total_savings = account.TOTAL_AMOUNT
-            
-            # 적금 목표액
-            target_amount = account.SAVING_GOAL
-            
-            # 계정별 데이터 구성
-            account_data = {
-                "account_id": account.ACCOUNT_ID,
-                "user_name": user_name,
-                "team_name": team_name,
-                "weekly_saving": int(current_week_transfers),  # DailyTransfer 금액으로 변경
-                "before_weekly_saving": int(previous_week_transfers),  # DailyTransfer 금액으로 변경
-                "weekly_record": {
-                    "win": int(current_week_wins),
-                    "lose": int(current_week_losses),
-                    "draw": int(current_week_draws)
-                },
-                "before_weekly_record": {
-                    "win": int(previous_week_wins),
-                    "lose": int(previous_week_losses),
-                    "draw": int(previous_week_draws)
-                },
-                "current_savings": int(current_total_savings),
-                "target_amount": int(target_amount)
-            }
-            
-            all_accounts_data.append(account_data)
+        # 계정 + 사용자 이름을 ACCOUNT_ID 순으로 청크 단위 조회
+        account_query = db.query(
+            models.Account.ACCOUNT_ID, models.Account.TEAM_ID,
+            models.Account.TOTAL_AMOUNT, models.Account.SAVING_GOAL,
+            models.User.NAME
+        ).outerjoin(models.User, models.User.USER_ID == models.Account.USER_ID)
+        
+        for accounts in iter_account_chunks(account_query, memory=memory):
+            account_ids = [account.ACCOUNT_ID for account in accounts]
+            
+            # 청크에 속한 계정들의 주간 송금 금액 (DailyTransfer 테이블 사용)
+            def weekly_transfers(week_start, week_end):
+                return dict(db.query(
+                    models.DailyTransfer.ACCOUNT_ID, func.sum(models.DailyTransfer.AMOUNT)
+                ).filter(
+                    models.DailyTransfer.ACCOUNT_ID.in_(account_ids),
+                    models.DailyTransfer.DATE >= week_start,
+                    models.DailyTransfer.DATE <= week_end
+                ).group_by(models.DailyTransfer.ACCOUNT_ID).all())
+            
+            current_week_transfers = weekly_transfers(current_week_start, current_week_end)
+            previous_week_transfers = weekly_transfers(previous_week_start, previous_week_end)
+            
+            for account in accounts:
+                # 사용자 / 팀 정보
+                user_name = account.NAME if account.NAME else "Unknown User"
+                team = catalog_cache.get_team(db, account.TEAM_ID)
+                team_name = team.TEAM_NAME if team else "Unknown Team"
+                
+                # 계정별 데이터 구성
+                account_data = {
+                    "account_id": account.ACCOUNT_ID,
+                    "user_name": user_name,
+                    "team_name": team_name,
+                    "weekly_saving": int(current_week_transfers.get(account.ACCOUNT_ID) or 0),  # DailyTransfer 금액으로 변경
+                    "before_weekly_saving": int(previous_week_transfers.get(account.ACCOUNT_ID) or 0),  # DailyTransfer 금액으로 변경
+                    "weekly_record": {
+                        "win": current_week_records.get((account.TEAM_ID, 1), 0),
+                        "lose": current_week_records.get((account.TEAM_ID, 2), 0),
+                        "draw": current_week_records.get((account.TEAM_ID, 3), 0)
+                    },
+                    "before_weekly_record": {
+                        "win": previous_week_records.get((account.TEAM_ID, 1), 0),
+                        "lose": previous_week_records.get((account.TEAM_ID, 2), 0),
+                        "draw": previous_week_records.get((account.TEAM_ID, 3), 0)
+                    },
+                    "current_savings": int(account.TOTAL_AMOUNT),
+                    "target_amount": int(account.SAVING_GOAL)
+                }
+                
+                all_accounts_data.append(account_data)
             
         # 결과 데이터 구성
         result = {
@@ -1443,7 +1413,7 @@ async def get_weekly_report_data(
             "report_date": report_date.isoformat()
         }
         
-        logger.info(f"모든 사용자의 주간 레포트 데이터 조회 완료: 총 {len(all_accounts_data)}개 계정")
+        logger.info(f"모든 사용자의 주간 레포트 데이터 조회 완료: 총 {len(all_accounts_data)}개 계정, 메모리 증가 {memory.summary()['rss_delta_mb']}MB")
         return result
         
     except HTTPException:
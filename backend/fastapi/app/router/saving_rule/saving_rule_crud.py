@@ -4,6 +4,9 @@ from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
 
 import models
+from utils.catalog_cache import catalog_cache
+from utils.limit_ledger import LimitLedger
+from utils.rule_index import rule_index
 from router.saving_rule.saving_rule_schema import (
     SavingRuleTypeCreate, SavingRuleListCreate, SavingRuleDetailCreate,
     UserSavingRuleCreate, DailySavingCreate, SavingRuleTypeUpdate,
@@ -33,6 +36,8 @@ def create_saving_rule_type(db: Session, saving_rule_type: SavingRuleTypeCreate)
     )
     db.add(db_saving_rule_type)
     db.commit()
+    catalog_cache.invalidate("saving_rule")
+    rule_index.invalidate()
     db.refresh(db_saving_rule_type)
     return db_saving_rule_type
 
@@ -44,6 +49,8 @@ def update_saving_rule_type(db: Session, saving_rule_type_id: int, saving_rule_t
     
     db_saving_rule_type.SAVING_RULE_TYPE_NAME = saving_rule_type.SAVING_RULE_TYPE_NAME
     db.commit()
+    catalog_cache.invalidate("saving_rule")
+    rule_index.invalidate()
     db.refresh(db_saving_rule_type)
     return db_saving_rule_type
 
@@ -74,6 +81,8 @@ def delete_saving_rule_type(db: Session, saving_rule_type_id: int):
     
     db.delete(db_saving_rule_type)
     db.commit()
+    catalog_cache.invalidate("saving_rule")
+    rule_index.invalidate()
     return True
 
 def get_record_type_by_id(db: Session, record_type_id: int):
@@ -116,6 +125,8 @@ def create_saving_rule(db: Session, saving_rule: SavingRuleListCreate):
     )
     db.add(db_saving_rule)
     db.commit()
+    catalog_cache.invalidate("saving_rule")
+    rule_index.invalidate()
     db.refresh(db_saving_rule)
     return db_saving_rule
 
@@ -131,6 +142,8 @@ def update_saving_rule(db: Session, saving_rule_id: int, saving_rule: SavingRule
         setattr(db_saving_rule, key, value)
     
     db.commit()
+    catalog_cache.invalidate("saving_rule")
+    rule_index.invalidate()
     db.refresh(db_saving_rule)
     return db_saving_rule
 
@@ -152,6 +165,8 @@ def delete_saving_rule(db: Session, saving_rule_id: int):
     
     db.delete(db_saving_rule)
     db.commit()
+    catalog_cache.invalidate("saving_rule")
+    rule_index.invalidate()
     return True
 
 def get_saving_rule_detail_by_id(db: Session, saving_rule_detail_id: int):
@@ -192,6 +207,8 @@ def create_saving_rule_detail(db: Session, saving_rule_detail: SavingRuleDetailC
     )
     db.add(db_saving_rule_detail)
     db.commit()
+    catalog_cache.invalidate("saving_rule")
+    rule_index.invalidate()
     db.refresh(db_saving_rule_detail)
     return db_saving_rule_detail
 
@@ -207,6 +224,8 @@ def update_saving_rule_detail(db: Session, saving_rule_detail_id: int, saving_ru
         setattr(db_saving_rule_detail, key, value)
     
     db.commit()
+    catalog_cache.invalidate("saving_rule")
+    rule_index.invalidate()
     db.refresh(db_saving_rule_detail)
     return db_saving_rule_detail
 
@@ -231,6 +250,8 @@ def delete_saving_rule_detail(db: Session, saving_rule_detail_id: int):
     
     db.delete(db_saving_rule_detail)
     db.commit()
+    catalog_cache.invalidate("saving_rule")
+    rule_index.invalidate()
     return True
 
 def get_user_saving_rule_by_id(db: Session, user_saving_rule_id: int):
@@ -271,6 +292,7 @@ def create_user_saving_rule(db: Session, user_saving_rule: UserSavingRuleCreate)
     db.add(db_user_saving_rule)
     db.commit()
     db.refresh(db_user_saving_rule)
+    rule_index.upsert(db, db_user_saving_rule.USER_SAVING_RULED_ID)
     return db_user_saving_rule
 
 def update_user_saving_rule(db: Session, user_saving_rule_id: int, user_saving_rule: UserSavingRuleUpdate):
@@ -286,6 +308,7 @@ def update_user_saving_rule(db: Session, user_saving_rule_id: int, user_saving_r
     
     db.commit()
     db.refresh(db_user_saving_rule)
+    rule_index.upsert(db, user_saving_rule_id)
     return db_user_saving_rule
 
 def delete_user_saving_rule(db: Session, user_saving_rule_id: int):
@@ -296,6 +319,7 @@ def delete_user_saving_rule(db: Session, user_saving_rule_id: int):
     
     db.delete(db_user_saving_rule)
     db.commit()
+    rule_index.remove(user_saving_rule_id)
     return True
 
 def get_daily_saving_by_id(db: Session, daily_saving_id: int):
@@ -647,38 +671,33 @@ def get_available_saving_rules_for_account(db: Session, account_id: int):
     
     return result
 
-def check_daily_limit(db: Session, account_id: int, amount: int):
-    """계정의 일일 적립 한도 확인"""
+def check_daily_limit(db: Session, account_id: int, amount: int, ledger: Optional[LimitLedger] = None):
+    """계정의 일일 적립 한도 확인 (여러 번 확인할 때는 같은 ledger를 넘겨 재사용)"""
     # 계정 정보 조회
     account = db.query(models.Account).filter(models.Account.ACCOUNT_ID == account_id).first()
     if not account:
         return False
     
-    # 오늘 날짜의 적립 금액 합계 계산
-    today = datetime.now().date()
-    today_savings = get_daily_savings_by_account_and_date(db, account_id, today)
-    today_total = sum(saving.DAILY_SAVING_AMOUNT for saving in today_savings)
+    # 오늘 날짜의 적립 금액 합계 (GROUP BY 집계)
+    if ledger is None:
+        ledger = LimitLedger.load(db, datetime.now().date(), source="saving", account_ids=[account_id])
     
     # 적립 한도 체크
-    return (today_total + amount) <= account.DAILY_LIMIT
+    return ledger.fits_daily(account_id, amount, account.DAILY_LIMIT)
 
-def check_monthly_limit(db: Session, account_id: int, amount: int):
-    """계정의 월간 적립 한도 확인"""
+def check_monthly_limit(db: Session, account_id: int, amount: int, ledger: Optional[LimitLedger] = None):
+    """계정의 월간 적립 한도 확인 (여러 번 확인할 때는 같은 ledger를 넘겨 재사용)"""
     # 계정 정보 조회
     account = db.query(models.Account).filter(models.Account.ACCOUNT_ID == account_id).first()
     if not account:
         return False
     
-    # 이번 달 시작일과 오늘 날짜
-    today = datetime.now().date()
-    month_start = date(today.year, today.month, 1)
-    
-    # 이번 달 적립 금액 합계 계산
-    month_savings = get_daily_savings_by_account_and_date_range(db, account_id, month_start, today)
-    month_total = sum(saving.DAILY_SAVING_AMOUNT for saving in month_savings)
+    # 이번 달 적립 금액 합계 (GROUP BY 집계)
+    if ledger is None:
+        ledger = LimitLedger.load(db, datetime.now().date(), source="saving", account_ids=[account_id])
     
     # 적립 한도 체크
-    return (month_total + amount) <= account.MONTH_LIMIT
+    return ledger.fits_monthly(account_id, amount, account.MONTH_LIMIT)
 
 def get_player_saving_rules(db: Session, player_id: int):
     """선수에 등록된 모든 적금 규칙 조회"""
@@ -8,6 +8,8 @@ from database import get_db
 import models
 from router.saving_rule import saving_rule_schema, saving_rule_crud
 from router.user.user_router import get_current_user
+from utils.catalog_cache import catalog_cache
+from utils.saving_backtest import season_history_cache, run_backtest, rule_subject
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -768,3 +770,75 @@ async def get_account_saving_summary(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"계정 적금 요약 정보 조회 중 오류 발생: {str(e)}"
         )
+
+# 적금 규칙 백테스트 (후보 규칙을 시즌 경기 기록에 적용했을 때의 예상 적립액)
+@router.post("/backtest", response_model=saving_rule_schema.SavingBacktestResponse)
+async def backtest_saving_rules(
+    request: saving_rule_schema.SavingBacktestRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    try:
+        # 응원팀/한도 기본값은 사용자의 첫 번째 계정에서 가져옴
+        account = db.query(models.Account).filter(models.Account.USER_ID == current_user.USER_ID).first()
+        team_id = request.TEAM_ID if request.TEAM_ID is not None else (account.TEAM_ID if account else None)
+        if team_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="응원팀 ID가 필요합니다"
+            )
+        daily_limit = request.DAILY_LIMIT if request.DAILY_LIMIT is not None else (account.DAILY_LIMIT if account else None)
+        month_limit = request.MONTH_LIMIT if request.MONTH_LIMIT is not None else (account.MONTH_LIMIT if account else None)
+
+        end_date = request.end_date or (datetime.now().date() - timedelta(days=1))
+        start_date = request.start_date or end_date.replace(month=1, day=1)
+        if start_date > end_date or start_date.year != end_date.year:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="백테스트 기간은 같은 시즌 안에서 시작일이 종료일보다 앞서야 합니다"
+            )
+
+        # 규칙 타입 이름으로 대상 구분 (팀 / 상대팀 / 선수)
+        rules = []
+        for rule in request.rules:
+            rule_type = catalog_cache.get_saving_rule_type(db, rule.SAVING_RULE_TYPE_ID)
+            if not rule_type:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"존재하지 않는 적금 규칙 타입입니다: {rule.SAVING_RULE_TYPE_ID}"
+                )
+            is_team_rule = rule_type.SAVING_RULE_TYPE_NAME in ["기본 규칙", "상대팀"]
+            player_id = None if is_team_rule else (rule.PLAYER_ID or request.FAVORITE_PLAYER_ID)
+            if not is_team_rule and player_id is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="선수 규칙에는 선수 ID가 필요합니다"
+                )
+            rules.append({
+                "subject": rule_subject(rule_type.SAVING_RULE_TYPE_NAME, player_id),
+                "record_type_id": rule.RECORD_TYPE_ID,
+                "amount": rule.USER_SAVING_RULED_AMOUNT,
+                "player_id": player_id,
+            })
+
+        history = season_history_cache.get(db, end_date.year)
+        result = run_backtest(
+            history, team_id, rules,
+            daily_limit=daily_limit,
+            month_limit=month_limit,
+            start_date=start_date,
+            end_date=end_date
+        )
+        logger.info(
+            f"적금 규칙 백테스트: 사용자 ID {current_user.USER_ID}, 규칙 {len(rules)}개, "
+            f"예상 적립액 {result['total_amount']}원 ({result['elapsed_ms']}ms)"
+        )
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"적금 규칙 백테스트 중 오류: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"적금 규칙 백테스트 중 오류 발생: {str(e)}"
+        )
@@ -289,4 +289,31 @@ class SavingRuleListDetailResponse(SavingRuleListResponse):
     
     class Config:
         orm_mode = True
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# 적금 규칙 백테스트 요청 모델 (후보 규칙 묶음을 시즌 기록에 적용)
+class SavingBacktestRequest(BaseModel):
+    rules: List[UserSavingRuleCreateSimplified]
+    TEAM_ID: Optional[int] = None  # 없으면 계정의 응원팀
+    FAVORITE_PLAYER_ID: Optional[int] = None  # 선수 ID가 없는 선수 규칙에 사용
+    DAILY_LIMIT: Optional[int] = None  # 없으면 계정의 일일 한도
+    MONTH_LIMIT: Optional[int] = None  # 없으면 계정의 월간 한도
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+# 백테스트 날짜별 결과 모델
+class SavingBacktestDay(BaseModel):
+    date: date
+    raw_amount: int  # 한도 적용 전
+    amount: int  # 한도 적용 후
+
+# 적금 규칙 백테스트 응답 모델
+class SavingBacktestResponse(BaseModel):
+    season: int
+    team_id: int
+    days: List[SavingBacktestDay] = []
+    rule_totals: List[int] = []  # 요청 규칙 순서대로 한도 적용 전 합계
+    raw_total_amount: int
+    total_amount: int
+    game_days: int
+    elapsed_ms: float
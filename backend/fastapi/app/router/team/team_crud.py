@@ -4,6 +4,7 @@ from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
 
 import models
+from utils.catalog_cache import catalog_cache
 from router.team.team_schema import TeamCreate, TeamUpdate, TeamRatingCreate, NewsCreate, DailyReportCreate
 
 def get_team_by_id(db: Session, team_id: int):
@@ -29,6 +30,7 @@ def create_team(db: Session, team: TeamCreate):
     )
     db.add(db_team)
     db.commit()
+    catalog_cache.invalidate("team")
     db.refresh(db_team)
     return db_team
 
@@ -44,6 +46,7 @@ def update_team(db: Session, team_id: int, team: TeamUpdate):
         setattr(db_team, key, value)
     
     db.commit()
+    catalog_cache.invalidate("team")
     db.refresh(db_team)
     return db_team
 
@@ -62,6 +65,7 @@ def delete_team(db: Session, team_id: int):
     
     db.delete(db_team)
     db.commit()
+    catalog_cache.invalidate("team")
     return True
 
 def get_team_rating_by_id(db: Session, team_rating_id: int):
@@ -417,9 +421,7 @@ def get_team_monthly_stats(db: Session, team_id: int, year: int, month: int):
     # 기록 유형별 집계
     record_stats = {}
     for record in player_records:
-        record_type = db.query(models.RecordType).filter(
-            models.RecordType.RECORD_TYPE_ID == record.RECORD_TYPE_ID
-        ).first()
+        record_type = catalog_cache.get_record_type(db, record.RECORD_TYPE_ID)
         
         if record_type:
             record_name = record_type.RECORD_NAME
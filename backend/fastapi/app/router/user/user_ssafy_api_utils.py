@@ -1,9 +1,11 @@
-import requests
+import httpx
 import json
 import os
 from fastapi import HTTPException, status
 import logging
 
+from utils.bank_http_client import bank_post
+
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,18 @@ MEMBER_SEARCH_ENDPOINT = f"{SSAFY_API_BASE_URL}/member/search"
 # API 키와 기관 코드 설정
 DEFAULT_API_KEY = os.getenv("SSAFY_API_KEY", "")
 
+# 기관거래고유번호 중복 응답 코드 (같은 번호의 요청이 이미 처리됨)
+DUPLICATE_TRANSACTION_CODE = "H1008"
+
+
+class BankAPIError(Exception):
+    """금융 API가 오류 응답 코드를 돌려준 경우"""
+
+    def __init__(self, code, message):
+        super().__init__(f"금융 API 오류: {code} - {message}")
+        self.code = code
+        self.message = message
+
 async def check_user_exists(email: str, api_key: str = DEFAULT_API_KEY):
     """
     사용자 이메일로 등록된 userKey가 있는지 확인
@@ -30,11 +44,7 @@ async def check_user_exists(email: str, api_key: str = DEFAULT_API_KEY):
         logger.info(f"사용자 조회 요청 URL: {MEMBER_SEARCH_ENDPOINT}")
         logger.info(f"사용자 조회 요청 데이터: {json.dumps(request_data)}")
         
-        response = requests.post(
-            MEMBER_SEARCH_ENDPOINT,
-            json=request_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = await bank_post(MEMBER_SEARCH_ENDPOINT, request_data)
         
         logger.info(f"API 응답 상태 코드: {response.status_code}")
         logger.info(f"API 응답 헤더: {dict(response.headers)}")
@@ -79,7 +89,7 @@ async def check_user_exists(email: str, api_key: str = DEFAULT_API_KEY):
             detail=f"금융 API 오류: {response.text}"
         )
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"API 연결 오류: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -100,11 +110,7 @@ async def register_user(email: str, username: str, api_key: str = DEFAULT_API_KE
         logger.info(f"사용자 등록 요청 URL: {MEMBER_ENDPOINT}")
         logger.info(f"사용자 등록 요청 데이터: {json.dumps(request_data)}")
         
-        response = requests.post(
-            MEMBER_ENDPOINT,
-            json=request_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = await bank_post(MEMBER_ENDPOINT, request_data)
         
         logger.info(f"API 응답 상태 코드: {response.status_code}")
         logger.info(f"API 응답 헤더: {dict(response.headers)}")
@@ -154,7 +160,7 @@ async def register_user(email: str, username: str, api_key: str = DEFAULT_API_KE
                 detail=f"API 응답 파싱 오류: 유효하지 않은 JSON 형식"
             )
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"API 연결 오류: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -237,11 +243,7 @@ async def create_demand_deposit_account(user_key, account_type_unique_no="999-1-
         logger.info(f"입출금 계좌 개설 요청 데이터: {json.dumps(request_data)}")
         
         # API 요청
-        response = requests.post(
-            api_url,
-            json=request_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = await bank_post(api_url, request_data, retry_unsent_only=True)
         
         logger.info(f"API 응답 상태 코드: {response.status_code}")
         logger.info(f"API 응답 본문: {response.text}")
@@ -283,7 +285,7 @@ async def create_demand_deposit_account(user_key, account_type_unique_no="999-1-
         )
     
 
-async def transfer_money(user_key, withdrawal_account, deposit_account, amount, llm_text, api_key=None):
+async def transfer_money(user_key, withdrawal_account, deposit_account, amount, llm_text, api_key=None, unique_no=None):
     """
     금융 API를 통해 계좌 간 송금 처리
     
@@ -293,6 +295,8 @@ async def transfer_money(user_key, withdrawal_account, deposit_account, amount,
         deposit_account (str): 입금 계좌번호
         amount (int): 송금 금액
         api_key (str, optional): API 키
+        unique_no (str, optional): 기관거래고유번호 (멱등 키). 지정하면 재시도에도 같은 번호를 보내므로
+            응답을 받지 못한 경우에도 안전하게 다시 시도합니다.
     
     Returns:
         dict: 송금 결과 정보
@@ -311,7 +315,8 @@ async def transfer_money(user_key, withdrawal_account, deposit_account, amount,
         header = generate_api_header(
             api_name=api_name,
             user_key=user_key,
-            api_key=api_key
+            api_key=api_key,
+            institution_transaction_unique_no=unique_no
         )
         
         # 전체 요청 데이터 구성
@@ -328,11 +333,8 @@ async def transfer_money(user_key, withdrawal_account, deposit_account, amount,
         logger.info(f"송금 요청 데이터: {json.dumps(request_data)}")
         
         # API 요청
-        response = requests.post(
-            api_url,
-            json=request_data,
-            headers={"Content-Type": "application/json"}
-        )
+        # 멱등 키가 없으면 중복 송금을 막기 위해 요청이 전달되지 않은 경우만 재시도
+        response = await bank_post(api_url, request_data, retry_unsent_only=unique_no is None)
         
         logger.info(f"API 응답 상태 코드: {response.status_code}")
         logger.info(f"API 응답 본문: {response.text}")
@@ -340,14 +342,14 @@ async def transfer_money(user_key, withdrawal_account, deposit_account, amount,
         # 응답 확인
         response_data = response.json()
         
-        # 응답 코드 확인
+        # 응답 코드 확인 (오류 응답은 Header 없이 최상위에 responseCode가 오기도 함)
         header = response_data.get("Header", {})
-        response_code = header.get("responseCode")
+        response_code = header.get("responseCode") or response_data.get("responseCode")
         
         if response_code != "H0000":
-            response_message = header.get("responseMessage", "알 수 없는 오류")
+            response_message = header.get("responseMessage") or response_data.get("responseMessage", "알 수 없는 오류")
             logger.error(f"API 오류 응답: {response_code} - {response_message}")
-            raise Exception(f"금융 API 오류: {response_code} - {response_message}")
+            raise BankAPIError(response_code, response_message)
         
         # 송금 결과 정보
         result = response_data.get("REC", {})
@@ -399,11 +401,7 @@ async def get_account_balance(user_key, account_num, api_key=None):
         logger.info(f"계좌 잔액 조회 요청 데이터: {json.dumps(request_data)}")
         
         # API 요청
-        response = requests.post(
-            api_url,
-            json=request_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = await bank_post(api_url, request_data)
         
         logger.info(f"API 응답 상태 코드: {response.status_code}")
         logger.info(f"API 응답 본문: {response.text}")
@@ -479,11 +477,7 @@ async def init_money(user_key, account_num,api_key=None):
         logger.info(f"계좌 입금 요청 데이터: {json.dumps(request_data)}")
         
         # API 요청
-        response = requests.post(
-            api_url,
-            json=request_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = await bank_post(api_url, request_data, retry_unsent_only=True)
         
         logger.info(f"API 응답 상태 코드: {response.status_code}")
         logger.info(f"API 응답 본문: {response.text}")
@@ -552,11 +546,7 @@ async def get_transaction_history(user_key, account_num, start_date, end_date, t
         logger.info(f"거래 내역 조회 요청: {account_num}, 기간 {start_date}~{end_date}")
         
         # API 요청
-        response = requests.post(
-            api_url,
-            json=request_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = await bank_post(api_url, request_data)
         
         logger.info(f"API 응답 상태 코드: {response.status_code}")
         
@@ -628,11 +618,7 @@ async def post_transfer_money(user_key, deposit_account_no, transaction_balance,
         logger.info(f"계좌 이체 요청: {withdrawal_account_no}에서 {deposit_account_no}로 {transaction_balance}원원")
         
         # API 요청
-        response = requests.post(
-            api_url,
-            json=request_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = await bank_post(api_url, request_data, retry_unsent_only=True)
         
         logger.info(f"API 응답 상태 코드: {response.status_code}")
         
@@ -697,11 +683,7 @@ async def check_account_num(user_key,account_no):
         logger.info(f"{account_no}의 예금주 확인")
         
         # API 요청
-        response = requests.post(
-            api_url,
-            json=request_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = await bank_post(api_url, request_data)
         
         logger.info(f"API 응답 상태 코드: {response.status_code}")
         
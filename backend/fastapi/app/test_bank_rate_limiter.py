@@ -0,0 +1,39 @@
+# test_bank_rate_limiter.py
+import asyncio
+
+from utils.bank_rate_limiter import TokenBucket, PRIORITY_BATCH, PRIORITY_INTERACTIVE
+
+
+def test_batch_acquire_with_burst_one():
+    """버킷 크기 1(BANK_RATE_TRANSFER="1")에서도 배치 호출이 토큰을 받아야 함"""
+    bucket = TokenBucket("transfer", 1.0, 1)
+    waited = asyncio.run(asyncio.wait_for(bucket.acquire(PRIORITY_BATCH), timeout=3))
+    assert waited < 3
+    assert bucket.reserve == 0.0
+
+
+def test_batch_acquire_with_large_reserve_ratio():
+    """예약 비율이 커도(0.9, 버킷 5) 배치 호출이 (1 + 예약분) <= 버킷 크기 안에서 토큰을 받아야 함"""
+    bucket = TokenBucket("transfer", 100.0, 5, reserve_ratio=0.9)
+    assert 1.0 + bucket.reserve <= bucket.burst
+    asyncio.run(asyncio.wait_for(bucket.acquire(PRIORITY_BATCH), timeout=3))
+
+
+def test_interactive_keeps_reserve():
+    """기본 예약 비율에서는 배치가 예약분을 남기고 사용자 요청은 예약분을 사용"""
+    bucket = TokenBucket("transfer", 0.001, 10, reserve_ratio=0.2)
+
+    async def drain():
+        for _ in range(8):
+            await bucket.acquire(PRIORITY_BATCH)
+        await bucket.acquire(PRIORITY_INTERACTIVE)
+
+    asyncio.run(asyncio.wait_for(drain(), timeout=3))
+    assert bucket.stats()["lanes"][PRIORITY_BATCH]["acquired"] == 8
+
+
+if __name__ == "__main__":
+    test_batch_acquire_with_burst_one()
+    test_batch_acquire_with_large_reserve_ratio()
+    test_interactive_keeps_reserve()
+    print("✅ bank_rate_limiter 테스트 통과")
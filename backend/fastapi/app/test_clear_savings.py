@@ -0,0 +1,84 @@
+# test_clear_savings.py
+import os
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# database.py / user_ssafy_api_utils.py는 import할 때 설정을 읽기만 하고 접속하지 않으므로,
+# 설정이 없으면 임의 값으로 채움 (테스트는 sqlite 사용)
+for key, value in {"DATABASE_TYPE": "mysql+pymysql", "DATABASE_USER": "test", "DATABASE_PASSWORD": "test",
+                   "DATABASE_IP": "localhost", "DATABASE_PORT": "0", "DATABASE_DB": "test",
+                   "SSAFY_API_BASE_URL": "http://localhost"}.items():
+    os.environ.setdefault(key, value)
+
+import models
+from utils.saving_backfill import clear_savings_for_dates
+from utils.transfer_journal import STATUS_COMPLETED, STATUS_FAILED, STATUS_PENDING
+
+GAME_DATE = date(2025, 4, 1)
+
+
+def make_session(journal_status=None):
+    """계정 1개, GAME_DATE의 적립 1건/이체 1건 (journal_status가 있으면 저널 항목도) 을 만든 sqlite 세션"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(models.Account(ACCOUNT_ID=1, USER_ID=1, TEAM_ID=1, ACCOUNT_NUM="1", SOURCE_ACCOUNT="2",
+                               TOTAL_AMOUNT=1000))
+    session.add(models.DailySaving(ACCOUNT_ID=1, DATE=GAME_DATE, SAVING_RULED_DETAIL_ID=1, SAVING_RULED_TYPE_ID=1,
+                                   COUNT=1, DAILY_SAVING_AMOUNT=300))
+    session.add(models.DailyTransfer(DAILY_TRANSFER_ID=10, ACCOUNT_ID=1, DATE=GAME_DATE, AMOUNT=300))
+    if journal_status is not None:
+        session.add(models.TransferJournal(DAILY_TRANSFER_ID=10, ACCOUNT_ID=1, DATE=GAME_DATE, AMOUNT=300,
+                                           IDEMPOTENCY_KEY="20250401000000000001", STATUS=journal_status))
+    session.commit()
+    # 테스트 데이터를 넣은 뒤 외래 키 검사를 켬 (MySQL과 같이 daily_transfer 삭제 시 저널 참조를 검사)
+    session.execute(text("PRAGMA foreign_keys=ON"))
+    return session
+
+
+def test_clear_date_with_failed_journal():
+    """은행이 거절한(FAILED) 저널 항목은 DailyTransfer와 함께 삭제되어야 함"""
+    session = make_session(STATUS_FAILED)
+    cleared = clear_savings_for_dates(session, [GAME_DATE])
+    session.commit()
+
+    assert cleared == {"deleted_count": 1, "total_amount": 300, "deleted_transfers": 1}
+    assert session.query(models.TransferJournal).count() == 0
+    assert session.query(models.DailyTransfer).count() == 0
+    assert session.get(models.Account, 1).TOTAL_AMOUNT == 700
+
+
+@pytest.mark.parametrize("status", [STATUS_COMPLETED, STATUS_PENDING])
+def test_clear_date_with_sent_journal_is_refused(status):
+    """이체가 끝났거나 결과를 알 수 없는 날짜는 아무것도 지우지 않고 ValueError"""
+    session = make_session(status)
+    with pytest.raises(ValueError, match=str(GAME_DATE)):
+        clear_savings_for_dates(session, [GAME_DATE])
+    session.rollback()
+
+    assert session.query(models.TransferJournal).count() == 1
+    assert session.query(models.DailyTransfer).count() == 1
+    assert session.query(models.DailySaving).count() == 1
+    assert session.get(models.Account, 1).TOTAL_AMOUNT == 1000
+
+
+def test_clear_date_without_journal():
+    """이체 전 날짜는 이전처럼 삭제"""
+    session = make_session()
+    cleared = clear_savings_for_dates(session, [GAME_DATE])
+    session.commit()
+
+    assert cleared["deleted_transfers"] == 1
+    assert session.get(models.Account, 1).TOTAL_AMOUNT == 700
+
+
+if __name__ == "__main__":
+    test_clear_date_with_failed_journal()
+    for status in (STATUS_COMPLETED, STATUS_PENDING):
+        test_clear_date_with_sent_journal_is_refused(status)
+    test_clear_date_without_journal()
+    print("모든 테스트 통과")
@@ -0,0 +1,23 @@
+# test_shared_modules.py
+import os
+import sys
+
+GCP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ai", "gcp")
+
+
+def test_gcp_copies_match_baseball_data():
+    """ai/gcp의 공용 모듈 복사본이 app/baseball_data 원본과 같아야 함 (ai 폴더가 없는 배포 환경에서는 건너뜀)"""
+    if not os.path.isdir(GCP_DIR):
+        return
+    sys.path.insert(0, GCP_DIR)
+    try:
+        from sync_shared_modules import find_drift
+    finally:
+        sys.path.remove(GCP_DIR)
+    drifted = find_drift()
+    assert not drifted, f"ai/gcp/sync_shared_modules.py로 복사본을 갱신하세요: {drifted}"
+
+
+if __name__ == "__main__":
+    test_gcp_copies_match_baseball_data()
+    print("✅ 공용 모듈 복사본 테스트 통과")
@@ -0,0 +1,184 @@
+# utils/account_rate.py
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+import models
+from utils.account_stream import DEFAULT_ACCOUNT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def compute_account_rates(db, account_ids):
+    """
+    계정들의 기본/미션 우대/총 이자율과 미션별 내역을 used_mission에서 계산합니다.
+    (계정 조회 한 번 + used_mission ⋈ mission 조회 한 번)
+    미션 이자율은 min(COUNT, MAX_COUNT) × mission.MISSION_RATE의 합입니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        account_ids (list): 계정 ID 목록
+
+    Returns:
+        dict: 계정 ID → {"base_interest_rate", "mission_interest_rate", "total_interest_rate", "mission_details"}
+              (존재하지 않는 계정은 포함하지 않음)
+    """
+    account_ids = list(account_ids)
+    if not account_ids:
+        return {}
+
+    base_rates = dict(db.query(models.Account.ACCOUNT_ID, models.Account.INTEREST_RATE).filter(
+        models.Account.ACCOUNT_ID.in_(account_ids)
+    ).all())
+
+    rows = db.query(
+        models.UsedMission.ACCOUNT_ID,
+        models.UsedMission.COUNT,
+        models.UsedMission.MAX_COUNT,
+        models.Mission.MISSION_ID,
+        models.Mission.MISSION_NAME,
+        models.Mission.MISSION_MAX_COUNT,
+        models.Mission.MISSION_RATE
+    ).join(
+        models.Mission, models.UsedMission.MISSION_ID == models.Mission.MISSION_ID
+    ).filter(
+        models.UsedMission.ACCOUNT_ID.in_(list(base_rates))
+    ).order_by(models.UsedMission.ACCOUNT_ID, models.UsedMission.USED_MISSION_ID).all()
+
+    rates = {
+        account_id: {
+            "base_interest_rate": base_rate,
+            "mission_interest_rate": 0,
+            "total_interest_rate": None,
+            "mission_details": []
+        }
+        for account_id, base_rate in base_rates.items()
+    }
+    for row in rows:
+        # 실제 추가될 이자율 계산 (count * mission_rate)
+        additional_rate = min(row.COUNT, row.MAX_COUNT) * row.MISSION_RATE
+        rate = rates[row.ACCOUNT_ID]
+        rate["mission_details"].append({
+            "MISSION_ID": row.MISSION_ID,
+            "MISSION_NAME": row.MISSION_NAME,
+            "MISSION_MAX_COUNT": row.MISSION_MAX_COUNT,
+            "MISSION_RATE": row.MISSION_RATE,
+            "CURRENT_COUNT": row.COUNT,
+            "MAX_COUNT": row.MAX_COUNT,
+            "ADDITIONAL_RATE": additional_rate
+        })
+        rate["mission_interest_rate"] += additional_rate
+
+    for rate in rates.values():
+        rate["total_interest_rate"] = (rate["base_interest_rate"] or 0) + rate["mission_interest_rate"]
+    return rates
+
+
+def _store_rates(db, rates):
+    """계산한 적용 이자율을 INSERT ... ON DUPLICATE KEY UPDATE 한 번으로 저장합니다."""
+    now = datetime.now()
+    stmt = mysql_insert(models.AccountInterestRate.__table__).values([
+        {
+            "ACCOUNT_ID": account_id,
+            "BASE_INTEREST_RATE": rate["base_interest_rate"],
+            "MISSION_INTEREST_RATE": rate["mission_interest_rate"],
+            "TOTAL_INTEREST_RATE": rate["total_interest_rate"],
+            "MISSION_DETAILS": json.dumps(rate["mission_details"], ensure_ascii=False),
+            "updated_at": now
+        }
+        for account_id, rate in rates.items()
+    ])
+    stmt = stmt.on_duplicate_key_update(
+        BASE_INTEREST_RATE=stmt.inserted.BASE_INTEREST_RATE,
+        MISSION_INTEREST_RATE=stmt.inserted.MISSION_INTEREST_RATE,
+        TOTAL_INTEREST_RATE=stmt.inserted.TOTAL_INTEREST_RATE,
+        MISSION_DETAILS=stmt.inserted.MISSION_DETAILS,
+        updated_at=stmt.inserted.updated_at
+    )
+    db.execute(stmt)
+
+
+def refresh_account_rates(db, account_ids):
+    """
+    계정들의 적용 이자율을 다시 계산해 account_interest_rate에 저장합니다.
+    used_mission/계정 이자율을 바꾼 뒤 커밋 전에 호출하면 같은 트랜잭션으로 반영됩니다. (커밋은 호출한 쪽에서)
+
+    Args:
+        db (Session): 데이터베이스 세션
+        account_ids (list): 계정 ID 목록
+
+    Returns:
+        dict: compute_account_rates()의 결과
+    """
+    # 세션의 미반영 변경(미션 카운트 등)을 먼저 DB에 보냄 (autoflush=False 세션)
+    db.flush()
+    account_ids = list(dict.fromkeys(account_ids))
+    rates = {}
+    for start in range(0, len(account_ids), DEFAULT_ACCOUNT_CHUNK_SIZE):
+        chunk_rates = compute_account_rates(db, account_ids[start:start + DEFAULT_ACCOUNT_CHUNK_SIZE])
+        if chunk_rates:
+            _store_rates(db, chunk_rates)
+            rates.update(chunk_rates)
+
+    # 같은 세션에 이미 불러온 행이 있으면 새 값으로 다시 읽도록 함
+    for stored in list(db.identity_map.values()):
+        if isinstance(stored, models.AccountInterestRate) and stored.ACCOUNT_ID in rates:
+            db.expire(stored)
+    return rates
+
+
+def refresh_mission_accounts(db, mission_id):
+    """미션의 이자율/최대 횟수가 바뀌었을 때 그 미션을 등록한 모든 계정의 적용 이자율을 갱신합니다."""
+    account_ids = [row.ACCOUNT_ID for row in db.query(models.UsedMission.ACCOUNT_ID).filter(
+        models.UsedMission.MISSION_ID == mission_id
+    ).distinct().all()]
+    return refresh_account_rates(db, account_ids)
+
+
+def _to_dict(stored):
+    return {
+        "base_interest_rate": stored.BASE_INTEREST_RATE,
+        "mission_interest_rate": stored.MISSION_INTEREST_RATE,
+        "total_interest_rate": stored.TOTAL_INTEREST_RATE,
+        "mission_details": json.loads(stored.MISSION_DETAILS or "[]")
+    }
+
+
+def get_account_rates(db, account_ids):
+    """
+    계정들의 적용 이자율을 account_interest_rate에서 한 번에 읽습니다.
+    아직 저장되지 않은 계정(테이블 추가 이전 계정 등)은 계산해서 저장한 뒤 커밋합니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        account_ids (list): 계정 ID 목록
+
+    Returns:
+        dict: 계정 ID → {"base_interest_rate", "mission_interest_rate", "total_interest_rate", "mission_details"}
+    """
+    account_ids = list(dict.fromkeys(account_ids))
+    if not account_ids:
+        return {}
+
+    rates = {
+        stored.ACCOUNT_ID: _to_dict(stored)
+        for stored in db.query(models.AccountInterestRate).filter(
+            models.AccountInterestRate.ACCOUNT_ID.in_(account_ids)
+        ).all()
+    }
+    missing = [account_id for account_id in account_ids if account_id not in rates]
+    if missing:
+        logger.info(f"적용 이자율이 저장되지 않은 계정 {len(missing)}개를 계산해 저장합니다.")
+        rates.update(refresh_account_rates(db, missing))
+        db.commit()
+    return rates
+
+
+def get_account_rate(db, account_id):
+    """계정 하나의 적용 이자율을 기본 키 조회로 읽습니다. 계정이 없으면 None"""
+    stored = db.get(models.AccountInterestRate, account_id)
+    if stored is not None:
+        return _to_dict(stored)
+    return get_account_rates(db, [account_id]).get(account_id)
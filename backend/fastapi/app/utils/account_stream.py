@@ -0,0 +1,115 @@
+# utils/account_stream.py
+import os
+import logging
+
+import models
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 불러오는 계정 수 (환경 변수로 조정 가능)
+DEFAULT_ACCOUNT_CHUNK_SIZE = int(os.getenv("ACCOUNT_CHUNK_SIZE", "500"))
+
+
+def iter_account_chunks(query, chunk_size=None, memory=None):
+    """
+    계정 조회 쿼리를 ACCOUNT_ID 기준 키셋 페이지네이션으로 나눠 청크 단위로 반환합니다.
+    전체 계정을 한 번에 메모리에 올리지 않으며, ORM 계정 객체는 다음 청크로 넘어갈 때
+    변경 내용을 flush한 뒤 세션에서 분리해 메모리에서 해제되도록 합니다.
+
+    Args:
+        query (Query): models.Account 또는 Account.ACCOUNT_ID 컬럼을 포함한 조회 쿼리 (정렬/limit 없이)
+        chunk_size (int, optional): 청크당 계정 수. 기본값은 ACCOUNT_CHUNK_SIZE (500)
+        memory (JobMemory, optional): 청크를 처리할 때마다 RSS를 기록할 작업 메모리 측정기
+
+    Yields:
+        list: 계정(또는 컬럼 튜플) 목록
+    """
+    if chunk_size is None:
+        chunk_size = DEFAULT_ACCOUNT_CHUNK_SIZE
+    chunk_size = max(1, int(chunk_size))
+    session = query.session
+
+    last_account_id = None
+    while True:
+        page = query
+        if last_account_id is not None:
+            page = page.filter(models.Account.ACCOUNT_ID > last_account_id)
+        chunk = page.order_by(models.Account.ACCOUNT_ID).limit(chunk_size).all()
+        if not chunk:
+            return
+
+        yield chunk
+        if memory is not None:
+            memory.sample()
+
+        last_account_id = chunk[-1].ACCOUNT_ID
+        orm_accounts = [row for row in chunk if isinstance(row, models.Account)]
+        if orm_accounts:
+            session.flush()
+            for account in orm_accounts:
+                session.expunge(account)
+        if len(chunk) < chunk_size:
+            return
+
+
+def iter_accounts(query, chunk_size=None, memory=None):
+    """iter_account_chunks()의 청크를 풀어 계정을 하나씩 반환합니다."""
+    for chunk in iter_account_chunks(query, chunk_size, memory):
+        yield from chunk
+
+
+def current_rss_mb():
+    """
+    현재 프로세스의 메모리 사용량(RSS, MB)을 /proc/self/statm에서 읽어 반환합니다.
+    /proc가 없는 환경(Windows, macOS)에서는 None을 반환합니다.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return round(resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class JobMemory:
+    """
+    작업 하나의 메모리 사용량을 작업 시작 시점의 RSS 기준 증가량으로 기록합니다.
+    ru_maxrss는 프로세스가 뜬 뒤의 최대값이라 오래 떠 있는 서버/스케줄러 프로세스에서는 작업별 값을 알 수 없으므로,
+    시작할 때와 sample()을 부를 때마다 현재 RSS를 읽어 가장 큰 값을 기억합니다.
+
+    memory = JobMemory()
+    for chunk in iter_account_chunks(query, memory=memory):  # 청크마다 sample()
+        ...
+    summary.update(memory.summary())
+    """
+
+    def __init__(self):
+        self.start_mb = current_rss_mb()
+        self.peak_mb = self.start_mb
+
+    def sample(self):
+        """현재 RSS를 읽어 최대값을 갱신하고 반환"""
+        rss = current_rss_mb()
+        if rss is not None and (self.peak_mb is None or rss > self.peak_mb):
+            self.peak_mb = rss
+        return rss
+
+    def delta_mb(self):
+        """작업 시작 시점 대비 RSS 최대 증가량 (MB, 측정할 수 없으면 None)"""
+        if self.start_mb is None or self.peak_mb is None:
+            return None
+        return round(max(0.0, self.peak_mb - self.start_mb), 1)
+
+    def summary(self):
+        """
+        결과 요약에 넣을 메모리 정보
+
+        Returns:
+            dict: rss_start_mb (시작 시점 RSS), rss_peak_mb (측정한 RSS 최대값), rss_delta_mb (시작 대비 최대 증가량)
+        """
+        self.sample()
+        return {
+            "rss_start_mb": self.start_mb,
+            "rss_peak_mb": self.peak_mb,
+            "rss_delta_mb": self.delta_mb()
+        }
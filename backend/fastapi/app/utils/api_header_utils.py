@@ -4,7 +4,24 @@ import hashlib
 import json
 
 
-def generate_api_header(api_name, user_key=None, api_key=None, institution_code="00100", fintech_app_no="001"):
+def generate_institution_transaction_unique_no(now=None):
+    """
+    기관거래고유번호(institutionTransactionUniqueNo)를 생성하는 함수 (YYYYMMDD + 임의의 12자리 숫자)
+    
+    Args:
+        now (datetime, optional): 기준 시각. 기본값은 현재 시각
+    
+    Returns:
+        str: 20자리 기관거래고유번호
+    """
+    if now is None:
+        now = datetime.datetime.now()
+    unique_no_suffix = ''.join([str(secrets.randbelow(10)) for _ in range(12)])
+    return f"{now.strftime('%Y%m%d')}{unique_no_suffix}"
+
+
+def generate_api_header(api_name, user_key=None, api_key=None, institution_code="00100", fintech_app_no="001",
+                        institution_transaction_unique_no=None):
     """
     API 요청에 필요한 공통 헤더를 자동으로 생성하는 함수
     
@@ -14,6 +31,8 @@ def generate_api_header(api_name, user_key=None, api_key=None, institution_code=
         api_key (str, optional): API KEY. 지정하지 않으면 무작위로 생성합니다.
         institution_code (str, optional): 기관코드. 기본값은 "00100"
         fintech_app_no (str, optional): 핀테크 앱 인증번호. 기본값은 "001"
+        institution_transaction_unique_no (str, optional): 기관거래고유번호. 이체 저널처럼 재시도 시 같은 번호를
+            보내야 할 때 지정합니다. 지정하지 않으면 새로 생성합니다.
     
     Returns:
         dict: API 요청에 필요한 헤더 정보
@@ -24,8 +43,8 @@ def generate_api_header(api_name, user_key=None, api_key=None, institution_code=
     transmission_time = now.strftime("%H%M%S")
     
     # Institution Transaction Unique No 생성 (YYYYMMDD + 임의의 12자리 숫자)
-    unique_no_suffix = ''.join([str(secrets.randbelow(10)) for _ in range(12)])
-    institution_transaction_unique_no = f"{transmission_date}{unique_no_suffix}"
+    if institution_transaction_unique_no is None:
+        institution_transaction_unique_no = generate_institution_transaction_unique_no(now)
     
     # API 서비스 코드 (API 이름과 동일하게 설정)
     api_service_code = api_name
@@ -0,0 +1,119 @@
+# utils/bank_http_client.py
+import os
+import random
+import asyncio
+import logging
+import threading
+
+import httpx
+
+from utils.bank_rate_limiter import bank_call_scheduler
+
+logger = logging.getLogger(__name__)
+
+# 금융 API 호출 설정 (환경 변수로 조정 가능)
+BANK_API_TIMEOUT = float(os.getenv("BANK_API_TIMEOUT", "10"))            # 호출당 전체 타임아웃(초)
+BANK_API_CONNECT_TIMEOUT = float(os.getenv("BANK_API_CONNECT_TIMEOUT", "5"))
+BANK_API_MAX_CONNECTIONS = int(os.getenv("BANK_API_MAX_CONNECTIONS", "20"))
+BANK_API_MAX_KEEPALIVE = int(os.getenv("BANK_API_MAX_KEEPALIVE", "10"))
+BANK_API_MAX_RETRIES = int(os.getenv("BANK_API_MAX_RETRIES", "3"))
+BANK_API_BACKOFF = float(os.getenv("BANK_API_BACKOFF", "0.5"))            # 첫 재시도 대기(초), 이후 2배씩
+
+# 일시적인 오류로 보고 재시도하는 응답 코드
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+_clients = {}  # 이벤트 루프 -> AsyncClient
+_clients_lock = threading.Lock()
+
+
+def _new_client():
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(BANK_API_TIMEOUT, connect=BANK_API_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=BANK_API_MAX_CONNECTIONS,
+            max_keepalive_connections=BANK_API_MAX_KEEPALIVE
+        ),
+        headers={"Content-Type": "application/json"}
+    )
+
+
+def get_bank_client():
+    """
+    현재 이벤트 루프에서 공유하는 keep-alive AsyncClient를 반환합니다.
+    AsyncClient의 연결은 만든 이벤트 루프에 묶이므로 루프마다 하나씩 만들어 둡니다.
+    (uvicorn 루프와 스케줄러 작업이 asyncio로 만든 루프가 따로 사용)
+    """
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        # 이미 닫힌 루프의 클라이언트는 정리
+        for closed_loop in [key for key in _clients if key.is_closed()]:
+            del _clients[closed_loop]
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = _new_client()
+            _clients[loop] = client
+        return client
+
+
+async def close_bank_client():
+    """현재 이벤트 루프의 공유 클라이언트를 닫습니다. (애플리케이션/작업 종료 시 호출)"""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+async def bank_post(url, json_data, timeout=None, retry_unsent_only=False, max_retries=None):
+    """
+    공유 클라이언트로 금융 API에 POST 요청을 보냅니다.
+    매 시도 전에 bank_call_scheduler에서 엔드포인트 분류별 토큰을 받으며(사용자 요청 우선, 배치는 batch_priority()),
+    연결 오류/타임아웃/일시적 오류 응답(429, 502, 503, 504)이면 지수 백오프로 다시 시도합니다.
+
+    Args:
+        url (str): 요청 URL
+        json_data (dict): 요청 본문
+        timeout (float, optional): 이 호출의 타임아웃(초). 기본값은 BANK_API_TIMEOUT
+        retry_unsent_only (bool): True면 요청이 서버에 전달되지 않은 연결 오류만 재시도
+                                  (이체처럼 중복 실행되면 안 되는 요청용)
+        max_retries (int, optional): 최대 재시도 횟수. 기본값은 BANK_API_MAX_RETRIES
+
+    Returns:
+        httpx.Response: 응답 (재시도 후에도 일시적 오류 응답이면 마지막 응답)
+
+    Raises:
+        httpx.HTTPError: 재시도 후에도 요청을 보내지 못한 경우
+    """
+    if max_retries is None:
+        max_retries = BANK_API_MAX_RETRIES
+    client = get_bank_client()
+    request_timeout = httpx.Timeout(timeout, connect=BANK_API_CONNECT_TIMEOUT) if timeout is not None else None
+
+    attempt = 0
+    while True:
+        await bank_call_scheduler.acquire(url)
+        try:
+            if request_timeout is not None:
+                response = await client.post(url, json=json_data, timeout=request_timeout)
+            else:
+                response = await client.post(url, json=json_data)
+            # 429(한도 초과)는 요청이 처리되지 않은 것이므로 이체 요청도 재시도
+            if (response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries
+                    or (retry_unsent_only and response.status_code != 429)):
+                return response
+            reason = f"응답 코드 {response.status_code}"
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+            # 요청이 서버에 전달되지 않은 오류
+            if attempt >= max_retries:
+                raise
+            reason = f"{type(e).__name__}: {str(e)}"
+        except (httpx.ReadTimeout, httpx.RemoteProtocolError) as e:
+            # 서버가 요청을 처리했을 수도 있는 오류
+            if retry_unsent_only or attempt >= max_retries:
+                raise
+            reason = f"{type(e).__name__}: {str(e)}"
+
+        delay = BANK_API_BACKOFF * (2 ** attempt) * (1 + random.random() * 0.2)
+        attempt += 1
+        logger.warning(f"금융 API 일시적 오류 ({reason}), {delay:.2f}초 후 재시도 ({attempt}/{max_retries}): {url}")
+        await asyncio.sleep(delay)
@@ -0,0 +1,185 @@
+# utils/bank_rate_limiter.py
+import os
+import time
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# 호출 우선순위 (사용자 요청이 배치 작업보다 먼저 토큰을 받음)
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH)
+
+# 현재 호출의 우선순위. 기본은 사용자 요청, 배치 작업은 batch_priority()로 감쌈
+# (asyncio.gather로 만든 태스크도 컨텍스트를 물려받음)
+_current_priority = ContextVar("bank_call_priority", default=PRIORITY_INTERACTIVE)
+
+# 엔드포인트 분류: API 경로에 포함된 이름 -> 분류
+ENDPOINT_CLASSES = {
+    "updateDemandDepositAccountTransfer": "transfer",
+    "updateDemandDepositAccountDeposit": "transfer",
+    "inquireDemandDepositAccountBalance": "inquiry",
+    "inquireTransactionHistoryList": "inquiry",
+    "inquireDemandDepositAccountHolderName": "inquiry",
+    "createDemandDepositAccount": "account",
+}
+DEFAULT_ENDPOINT_CLASS = "member"
+
+# 분류별 기본 한도: (초당 토큰, 버킷 크기). BANK_RATE_<분류>="초당,버킷" 환경 변수로 조정 가능
+DEFAULT_LIMITS = {
+    "transfer": (10.0, 10),
+    "inquiry": (20.0, 20),
+    "account": (5.0, 5),
+    "member": (5.0, 5),
+}
+# 사용자 요청 몫으로 남겨 두는 토큰 비율 (배치는 이만큼을 남기고만 가져감)
+INTERACTIVE_RESERVE_RATIO = float(os.getenv("BANK_RATE_INTERACTIVE_RESERVE", "0.2"))
+# 토큰을 기다릴 때 다시 확인하는 최대 간격(초)
+MAX_POLL_INTERVAL = 0.05
+
+
+def _limits_for(endpoint_class):
+    value = os.getenv(f"BANK_RATE_{endpoint_class.upper()}")
+    if not value:
+        return DEFAULT_LIMITS[endpoint_class]
+    rate, _, burst = value.partition(",")
+    return float(rate), int(burst or max(1, int(float(rate))))
+
+
+def endpoint_class_of(url):
+    """요청 URL의 엔드포인트 분류를 반환합니다."""
+    for api_name, endpoint_class in ENDPOINT_CLASSES.items():
+        if api_name in url:
+            return endpoint_class
+    return DEFAULT_ENDPOINT_CLASS
+
+
+def current_priority():
+    return _current_priority.get()
+
+
+@contextmanager
+def batch_priority():
+    """이 블록 안에서(하위 태스크 포함) 보내는 금융 API 호출을 배치 우선순위로 처리합니다."""
+    token = _current_priority.set(PRIORITY_BATCH)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class TokenBucket:
+    """
+    엔드포인트 분류 하나의 토큰 버킷.
+    프로세스 안의 모든 이벤트 루프(uvicorn, 스케줄러 작업)가 같은 버킷을 공유하므로 threading.Lock으로 보호합니다.
+
+    - 사용자 요청: 토큰이 1개 이상이면 바로 가져감
+    - 배치: 기다리는 사용자 요청이 없고, 예약분(버킷 크기 × INTERACTIVE_RESERVE_RATIO)을 넘는 토큰이 있을 때만 가져감
+      토큰은 계속 채워지므로 사용자 요청이 없으면 배치도 초당 한도만큼 처리됩니다.
+    """
+
+    def __init__(self, name, rate, burst, reserve_ratio=INTERACTIVE_RESERVE_RATIO):
+        self.name = name
+        self.rate = max(0.001, float(rate))
+        self.burst = max(1, int(burst))
+        # 배치는 (1 + 예약분)개가 있어야 가져가므로, 버킷 크기를 넘지 않게 예약분을 버킷 크기 - 1 이하로 제한
+        # (버킷 크기 1이면 예약분 0: 기다리는 사용자 요청이 없을 때만 배치가 가져감)
+        self.reserve = min(self.burst * max(0.0, min(reserve_ratio, 0.9)), max(0.0, self.burst - 1.0))
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._waiting = {priority: 0 for priority in PRIORITIES}
+        self._acquired = {priority: 0 for priority in PRIORITIES}
+        self._wait_total = {priority: 0.0 for priority in PRIORITIES}
+        self._wait_max = {priority: 0.0 for priority in PRIORITIES}
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self, priority):
+        """토큰을 가져오면 (True, 0), 아니면 (False, 다시 확인할 때까지 기다릴 시간)을 반환합니다."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if priority == PRIORITY_INTERACTIVE:
+                needed = 1.0
+            elif self._waiting[PRIORITY_INTERACTIVE]:
+                return False, MAX_POLL_INTERVAL
+            else:
+                needed = 1.0 + self.reserve
+            if self._tokens >= needed:
+                self._tokens -= 1.0
+                return True, 0.0
+            return False, (needed - self._tokens) / self.rate
+
+    async def acquire(self, priority=None):
+        """토큰을 하나 받을 때까지 기다립니다. 기다린 시간(초)을 반환합니다."""
+        if priority is None:
+            priority = current_priority()
+        started = time.monotonic()
+        with self._lock:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                taken, delay = self._try_take(priority)
+                if taken:
+                    break
+                await asyncio.sleep(min(max(delay, 0.001), MAX_POLL_INTERVAL))
+        finally:
+            with self._lock:
+                self._waiting[priority] -= 1
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self._acquired[priority] += 1
+            self._wait_total[priority] += waited
+            self._wait_max[priority] = max(self._wait_max[priority], waited)
+        return waited
+
+    def stats(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate_per_sec": self.rate,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "lanes": {
+                    priority: {
+                        "queue_depth": self._waiting[priority],
+                        "acquired": self._acquired[priority],
+                        "avg_wait_ms": round(self._wait_total[priority] / self._acquired[priority] * 1000, 1)
+                        if self._acquired[priority] else 0.0,
+                        "max_wait_ms": round(self._wait_max[priority] * 1000, 1),
+                    }
+                    for priority in PRIORITIES
+                },
+            }
+
+
+class BankCallScheduler:
+    """금융 API 호출 전에 엔드포인트 분류별 토큰 버킷에서 우선순위에 따라 토큰을 받게 하는 스케줄러"""
+
+    def __init__(self):
+        self.buckets = {
+            endpoint_class: TokenBucket(endpoint_class, *_limits_for(endpoint_class))
+            for endpoint_class in DEFAULT_LIMITS
+        }
+
+    async def acquire(self, url, priority=None):
+        """요청 URL의 분류에 맞는 토큰을 받을 때까지 기다립니다. 기다린 시간(초)을 반환합니다."""
+        bucket = self.buckets[endpoint_class_of(url)]
+        waited = await bucket.acquire(priority)
+        if waited > 1:
+            logger.info(f"금융 API 호출 대기 {waited:.2f}초 ({bucket.name}, {priority or current_priority()})")
+        return waited
+
+    def stats(self):
+        return {endpoint_class: bucket.stats() for endpoint_class, bucket in self.buckets.items()}
+
+
+# 프로세스 전역 스케줄러
+bank_call_scheduler = BankCallScheduler()
@@ -0,0 +1,38 @@
+# utils/bulk_insert.py
+import os
+import logging
+from sqlalchemy import insert
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 executemany로 보내는 행 수 (환경 변수로 조정 가능)
+DEFAULT_CHUNK_SIZE = int(os.getenv("BULK_INSERT_CHUNK_SIZE", "1000"))
+
+
+def insert_in_chunks(session, model, rows, chunk_size=None):
+    """
+    ORM 객체를 만들지 않고 Core INSERT를 청크 단위 executemany로 실행합니다.
+    (PyMySQL은 INSERT ... VALUES executemany를 여러 행을 담은 INSERT 문 하나로 묶어 보냄)
+    커밋은 호출한 쪽에서 합니다.
+
+    Args:
+        session (Session): SQLAlchemy 세션
+        model: 삽입할 ORM 모델 클래스
+        rows (list): 컬럼명 → 값 dict 목록
+        chunk_size (int, optional): 청크당 행 수. 기본값은 BULK_INSERT_CHUNK_SIZE (1000)
+
+    Returns:
+        int: 삽입한 행 수
+    """
+    if not rows:
+        return 0
+    if chunk_size is None:
+        chunk_size = DEFAULT_CHUNK_SIZE
+    chunk_size = max(1, int(chunk_size))
+
+    statement = insert(model.__table__)
+    for start in range(0, len(rows), chunk_size):
+        session.execute(statement, rows[start:start + chunk_size])
+
+    logger.debug(f"{model.__tablename__}: {len(rows)}행 삽입 (청크 {chunk_size})")
+    return len(rows)
@@ -0,0 +1,155 @@
+# utils/catalog_cache.py
+import logging
+import threading
+from types import SimpleNamespace
+
+import models
+
+logger = logging.getLogger(__name__)
+
+# 캐시 대상 테이블: 이름 -> (모델, 기본키 컬럼, 이름 컬럼, 무효화 그룹)
+CATALOG_TABLES = {
+    "saving_rule_type": (models.SavingRuleType, "SAVING_RULE_TYPE_ID", "SAVING_RULE_TYPE_NAME", "saving_rule"),
+    "saving_rule_detail": (models.SavingRuleDetail, "SAVING_RULE_DETAIL_ID", None, "saving_rule"),
+    "saving_rule_list": (models.SavingRuleList, "SAVING_RULE_ID", None, "saving_rule"),
+    "record_type": (models.RecordType, "RECORD_TYPE_ID", "RECORD_NAME", "saving_rule"),
+    "team": (models.Team, "TEAM_ID", "TEAM_NAME", "team"),
+    "player_type": (models.PlayerType, "PLAYER_TYPE_ID", "PLAYER_TYPE_NAME", "player"),
+    "player": (models.Player, "PLAYER_ID", None, "player"),
+}
+
+# 자주 바뀌어 캐시에 넣지 않는 컬럼 (선수 좋아요 수는 좋아요마다 바뀌므로 필요하면 DB에서 직접 조회)
+SNAPSHOT_EXCLUDED_COLUMNS = {
+    "player": {"LIKE_COUNT"},
+}
+
+
+def _snapshot(obj, excluded=()):
+    """ORM 객체의 컬럼 값만 복사한 읽기용 객체를 만듭니다. (세션과 분리되어 지연 로딩이 없음)"""
+    return SimpleNamespace(**{
+        column.key: getattr(obj, column.key)
+        for column in obj.__mapper__.column_attrs
+        if column.key not in excluded
+    })
+
+
+class CatalogCache:
+    """
+    거의 바뀌지 않는 참조 테이블(적금 규칙 카탈로그, 팀, 선수, 기록 유형)의 프로세스 단위 캐시.
+    테이블별로 처음 조회할 때 한 번 적재하고, 이후에는 ID/이름으로 O(1) 조회합니다.
+    saving_rule / team / player CRUD의 쓰기 함수에서 invalidate()로 해당 그룹을 비웁니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_id = {}
+        self._by_name = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _ensure_loaded(self, db, table):
+        """
+        테이블을 (필요하면 적재해) 조회용 딕셔너리를 반환합니다.
+        잠금을 잡은 채 딕셔너리를 꺼내 돌려주므로, 직후에 다른 스레드가 invalidate()해도 호출한 쪽은 꺼낸 딕셔너리를 그대로 읽습니다.
+
+        Returns:
+            tuple: (ID → 행, 이름 → 행) 딕셔너리 (이름 컬럼이 없는 테이블은 빈 딕셔너리)
+        """
+        with self._lock:
+            if table in self._by_id:
+                self.hits += 1
+                return self._by_id[table], self._by_name.get(table, {})
+            self.misses += 1
+
+            model, id_column, name_column, _ = CATALOG_TABLES[table]
+            excluded = SNAPSHOT_EXCLUDED_COLUMNS.get(table, ())
+            rows = [_snapshot(obj, excluded) for obj in db.query(model).all()]
+
+            self._by_id[table] = {getattr(row, id_column): row for row in rows}
+            if name_column:
+                by_name = {}
+                for row in rows:
+                    # 이름이 중복되면 기존 .first() 조회처럼 먼저 나온 행을 사용
+                    by_name.setdefault(getattr(row, name_column), row)
+                self._by_name[table] = by_name
+
+            logger.debug(f"카탈로그 캐시 적재: {table} {len(rows)}건")
+            return self._by_id[table], self._by_name.get(table, {})
+
+    def get(self, db, table, key):
+        """ID로 조회합니다. 없으면 None"""
+        if key is None:
+            return None
+        by_id, _ = self._ensure_loaded(db, table)
+        return by_id.get(key)
+
+    def get_by_name(self, db, table, name):
+        """이름으로 조회합니다. 없으면 None"""
+        _, by_name = self._ensure_loaded(db, table)
+        return by_name.get(name)
+
+    def all(self, db, table):
+        """테이블 전체를 기본키 순서로 반환합니다."""
+        by_id, _ = self._ensure_loaded(db, table)
+        return [by_id[key] for key in sorted(by_id)]
+
+    # 자주 쓰는 조회 단축 함수
+    def get_saving_rule_type(self, db, saving_rule_type_id):
+        return self.get(db, "saving_rule_type", saving_rule_type_id)
+
+    def get_saving_rule_detail(self, db, saving_rule_detail_id):
+        return self.get(db, "saving_rule_detail", saving_rule_detail_id)
+
+    def get_saving_rule(self, db, saving_rule_id):
+        return self.get(db, "saving_rule_list", saving_rule_id)
+
+    def get_record_type(self, db, record_type_id):
+        return self.get(db, "record_type", record_type_id)
+
+    def get_team(self, db, team_id):
+        return self.get(db, "team", team_id)
+
+    def get_player_type(self, db, player_type_id):
+        return self.get(db, "player_type", player_type_id)
+
+    def get_player(self, db, player_id):
+        return self.get(db, "player", player_id)
+
+    def get_record_type_of_detail(self, db, saving_rule_detail_id):
+        """규칙 상세 ID → 규칙 목록 → 기록 유형을 따라가 기록 유형을 반환합니다."""
+        rule_detail = self.get_saving_rule_detail(db, saving_rule_detail_id)
+        if not rule_detail:
+            return None
+        saving_rule = self.get_saving_rule(db, rule_detail.SAVING_RULE_ID)
+        if not saving_rule:
+            return None
+        return self.get_record_type(db, saving_rule.RECORD_TYPE_ID)
+
+    def invalidate(self, group=None):
+        """
+        캐시를 비웁니다.
+
+        Args:
+            group (str, optional): "saving_rule", "team", "player" 중 하나. None이면 전체.
+        """
+        with self._lock:
+            for table, (_, _, _, table_group) in CATALOG_TABLES.items():
+                if group is None or table_group == group:
+                    self._by_id.pop(table, None)
+                    self._by_name.pop(table, None)
+        logger.debug(f"카탈로그 캐시 무효화: {group or '전체'}")
+
+    def stats(self):
+        """캐시 적중/미적중 횟수와 적재된 테이블 정보를 반환합니다."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total > 0 else 0,
+                "loaded_tables": {table: len(rows) for table, rows in self._by_id.items()},
+            }
+
+
+# 프로세스 전역 인스턴스
+catalog_cache = CatalogCache()
@@ -0,0 +1,98 @@
+# utils/interest_engine.py
+import logging
+
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.orm import aliased
+
+import models
+from utils.account_rate import get_account_rates
+
+logger = logging.getLogger(__name__)
+
+
+def compute_daily_interest(previous_balances, total_rates):
+    """
+    일일 이자를 배열 연산으로 계산합니다. round(전날 잔액 × 연이율 / 100 / 365)와 같은 결과입니다.
+    (np.rint도 파이썬 round처럼 .5는 짝수 쪽으로 반올림)
+
+    Args:
+        previous_balances (array-like): 전날 잔액 (기록이 없으면 0)
+        total_rates (array-like): 연이율(%) (기본 + 미션)
+
+    Returns:
+        np.ndarray: 일일 이자 (int64)
+    """
+    previous_balances = np.asarray(previous_balances, dtype=np.float64)
+    daily_rates = np.asarray(total_rates, dtype=np.float64) / 100 / 365
+    return np.rint(previous_balances * daily_rates).astype(np.int64)
+
+
+def calculate_interest_for_date(db, date_param, previous_date):
+    """
+    date_param의 모든 daily_balances 행의 일일 이자를 계산해 한 번에 기록합니다. 커밋은 호출한 쪽에서 합니다.
+
+    - 오늘/전날 잔액: daily_balances ⋈ account ⟕ 전날 daily_balances 조회 한 번
+    - 적용 이자율(기본 + 미션): account_interest_rate 조회 한 번 (utils.account_rate)
+    - 기록: 기본 키 기준 bulk UPDATE
+
+    Args:
+        db (Session): 데이터베이스 세션
+        date_param (date): 이자 계산 날짜
+        previous_date (date): 잔액 기준 날짜 (전날)
+
+    Returns:
+        dict: {"processed_accounts", "total_interest", "missing_previous"}
+    """
+    previous = aliased(models.DailyBalances)
+    rows = db.query(
+        models.DailyBalances.DAILY_BALANCES_ID,
+        models.DailyBalances.ACCOUNT_ID,
+        previous.DAILY_BALANCES_ID.label("PREVIOUS_ID"),
+        previous.CLOSING_BALANCE.label("PREVIOUS_BALANCE")
+    ).join(
+        models.Account, models.DailyBalances.ACCOUNT_ID == models.Account.ACCOUNT_ID
+    ).outerjoin(
+        previous, (previous.ACCOUNT_ID == models.DailyBalances.ACCOUNT_ID) & (previous.DATE == previous_date)
+    ).filter(
+        models.DailyBalances.DATE == date_param
+    ).order_by(
+        models.DailyBalances.DAILY_BALANCES_ID, previous.DAILY_BALANCES_ID
+    ).all()
+
+    # 전날 기록이 중복된 경우 첫 행만 사용 (기존 .first()와 같음)
+    seen = set()
+    unique_rows = []
+    for row in rows:
+        if row.DAILY_BALANCES_ID not in seen:
+            seen.add(row.DAILY_BALANCES_ID)
+            unique_rows.append(row)
+
+    if not unique_rows:
+        return {"processed_accounts": 0, "total_interest": 0, "missing_previous": 0}
+
+    rates = get_account_rates(db, [row.ACCOUNT_ID for row in unique_rows])
+
+    has_previous = np.array([row.PREVIOUS_ID is not None for row in unique_rows], dtype=bool)
+    previous_balances = np.array([row.PREVIOUS_BALANCE or 0 for row in unique_rows], dtype=np.float64)
+    total_rates = np.array(
+        [rates[row.ACCOUNT_ID]["total_interest_rate"] for row in unique_rows],
+        dtype=np.float64
+    )
+
+    # 전날 기록이 없으면 이자는 0
+    interests = np.where(has_previous, compute_daily_interest(previous_balances, total_rates), 0)
+
+    db.execute(
+        update(models.DailyBalances),
+        [
+            {"DAILY_BALANCES_ID": row.DAILY_BALANCES_ID, "DAILY_INTEREST": int(interest)}
+            for row, interest in zip(unique_rows, interests)
+        ]
+    )
+
+    return {
+        "processed_accounts": len(unique_rows),
+        "total_interest": int(interests.sum()),
+        "missing_previous": int((~has_previous).sum())
+    }
@@ -1,91 +1,184 @@
 # utils/interest_utils.py
 import logging
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 from datetime import date
 
+import numpy as np
+
 import models
+from utils.account_stream import DEFAULT_ACCOUNT_CHUNK_SIZE
+from utils.account_rate import get_account_rates
+from utils.interest_engine import compute_daily_interest
 
 logger = logging.getLogger(__name__)
 
-async def recalculate_interest_history(db: Session, account_id: int):
+
+def _load_history_rows(db, account_ids, from_date):
+    """
+    계정들의 일일 잔액 기록을 (계정, 날짜) 순으로 불러옵니다.
+    from_date가 있으면 그 이후 기록과, 첫 기록의 전날 잔액으로 쓸 직전 기록 하나만 불러옵니다.
+    """
+    balances = models.DailyBalances
+    query = db.query(
+        balances.DAILY_BALANCES_ID,
+        balances.ACCOUNT_ID,
+        balances.DATE,
+        balances.CLOSING_BALANCE,
+        balances.DAILY_INTEREST
+    ).filter(balances.ACCOUNT_ID.in_(account_ids))
+
+    if from_date is not None:
+        previous_dates = db.query(
+            balances.ACCOUNT_ID.label("ACCOUNT_ID"),
+            func.max(balances.DATE).label("PREVIOUS_DATE")
+        ).filter(
+            balances.ACCOUNT_ID.in_(account_ids),
+            balances.DATE < from_date
+        ).group_by(balances.ACCOUNT_ID).subquery()
+
+        query = query.outerjoin(
+            previous_dates, previous_dates.c.ACCOUNT_ID == balances.ACCOUNT_ID
+        ).filter(
+            balances.DATE >= func.coalesce(previous_dates.c.PREVIOUS_DATE, from_date)
+        )
+
+    return query.order_by(balances.ACCOUNT_ID, balances.DATE).all()
+
+
+def _recalculate_batch(db, account_ids, from_date):
+    """
+    계정 묶음 하나의 이자를 다시 계산해 bulk UPDATE로 기록합니다. 커밋은 호출한 쪽에서 합니다.
+
+    Returns:
+        dict: 계정 ID → 재계산 결과 (계정을 찾을 수 없으면 오류 결과)
+    """
+    total_rates = {
+        account_id: rate["total_interest_rate"]
+        for account_id, rate in get_account_rates(db, account_ids).items()
+    }
+
+    results = {}
+    for account_id in account_ids:
+        if account_id not in total_rates:
+            logger.warning(f"계정 ID {account_id}를 찾을 수 없습니다.")
+            results[account_id] = {"status": "error", "message": "계정을 찾을 수 없습니다."}
+        else:
+            results[account_id] = {
+                "status": "success",
+                "account_id": account_id,
+                "total_recalculated": 0,
+                "adjusted_days": 0,
+                "current_interest_rate": total_rates[account_id]
+            }
+
+    rows = _load_history_rows(db, list(total_rates), from_date)
+    if len(rows) < 2:
+        return results
+
+    accounts = np.array([row.ACCOUNT_ID for row in rows], dtype=np.int64)
+    closing_balances = np.array([row.CLOSING_BALANCE or 0 for row in rows], dtype=np.float64)
+    has_old_interest = np.array([row.DAILY_INTEREST is not None for row in rows], dtype=bool)
+    old_interests = np.array([row.DAILY_INTEREST or 0 for row in rows], dtype=np.int64)
+    rates = np.array([total_rates[row.ACCOUNT_ID] for row in rows], dtype=np.float64)
+
+    # 같은 계정의 직전 기록이 있는 행만 재계산 (계정의 첫 기록은 그대로)
+    targets = np.zeros(len(rows), dtype=bool)
+    targets[1:] = accounts[1:] == accounts[:-1]
+    if from_date is not None:
+        # 직전 기록은 전날 잔액으로만 사용하고 기준일 이후 행만 갱신
+        targets &= np.array([row.DATE >= from_date for row in rows], dtype=bool)
+
+    previous_balances = np.zeros(len(rows), dtype=np.float64)
+    previous_balances[1:] = closing_balances[:-1]
+    new_interests = compute_daily_interest(previous_balances, rates)
+
+    changed = targets & (~has_old_interest | (old_interests != new_interests))
+    changed_index = np.flatnonzero(changed)
+    if len(changed_index) == 0:
+        return results
+
+    db.execute(
+        update(models.DailyBalances),
+        [
+            {"DAILY_BALANCES_ID": rows[i].DAILY_BALANCES_ID, "DAILY_INTEREST": int(new_interests[i])}
+            for i in changed_index
+        ]
+    )
+
+    # 계정별 조정 일수/금액 집계
+    unique_accounts, account_index = np.unique(accounts[changed_index], return_inverse=True)
+    adjustments = (new_interests - old_interests)[changed_index]
+    adjusted_days = np.bincount(account_index, minlength=len(unique_accounts))
+    adjusted_amounts = np.bincount(account_index, weights=adjustments, minlength=len(unique_accounts))
+    for account_id, days, amount in zip(unique_accounts, adjusted_days, adjusted_amounts):
+        result = results[int(account_id)]
+        result["adjusted_days"] = int(days)
+        result["total_recalculated"] = int(round(amount))
+    return results
+
+
+async def recalculate_interest_history_batch(db: Session, account_ids, from_date: date = None, batch_size: int = None):
+    """
+    여러 계정의 이자를 현재 금리(기본 금리 + 우대 금리)로 다시 계산합니다.
+    전날의 잔액을 기준으로 계산하며, 계정 묶음마다 조회/계산/bulk UPDATE/커밋을 한 번씩 합니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        account_ids (list): 계정 ID 목록
+        from_date (date, optional): 새 금리를 적용하기 시작하는 날짜 (미션 카운트가 바뀐 날).
+            None이면 전체 기록에 소급 적용합니다.
+        batch_size (int, optional): 한 번에 처리하는 계정 수. 기본값은 ACCOUNT_CHUNK_SIZE (500)
+
+    Returns:
+        dict: 재계산 결과 요약 정보 ("results"에 계정별 결과)
+    """
+    if batch_size is None:
+        batch_size = DEFAULT_ACCOUNT_CHUNK_SIZE
+    batch_size = max(1, int(batch_size))
+    account_ids = list(dict.fromkeys(account_ids))
+
+    scope = f"{from_date}부터" if from_date else "전체 기간"
+    logger.info(f"{len(account_ids)}개 계정의 이자 재계산 시작 ({scope}, 전날 잔액 기준)")
+
+    results = {}
+    try:
+        for start in range(0, len(account_ids), batch_size):
+            results.update(_recalculate_batch(db, account_ids[start:start + batch_size], from_date))
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"이자 재계산 중 오류 발생: {str(e)}")
+        return {"status": "error", "message": f"이자 재계산 중 오류 발생: {str(e)}", "results": results}
+
+    succeeded = [result for result in results.values() if result["status"] == "success"]
+    summary = {
+        "status": "success",
+        "recalculated_accounts": len(succeeded),
+        "adjusted_days": sum(result["adjusted_days"] for result in succeeded),
+        "total_recalculated": sum(result["total_recalculated"] for result in succeeded),
+        "results": results
+    }
+    logger.info(f"{len(succeeded)}개 계정의 이자 재계산 완료: {summary['adjusted_days']}일, "
+                f"총 {summary['total_recalculated']}원 조정 ({scope})")
+    return summary
+
+
+async def recalculate_interest_history(db: Session, account_id: int, from_date: date = None):
     """
     계정의 이자를 현재 금리(기본 금리 + 우대 금리)로 소급 적용합니다.
     전날의 잔액을 기준으로 이자를 계산합니다.
-    
+
     Args:
         db (Session): 데이터베이스 세션
         account_id (int): 계정 ID
-    
+        from_date (date, optional): 새 금리를 적용하기 시작하는 날짜. None이면 전체 기록에 소급 적용
+
     Returns:
         dict: 재계산 결과 요약 정보
     """
-    try:
-        logger.info(f"계정 ID {account_id}의 이자 소급 적용 시작 (전날 잔액 기준)")
-        
-        # 계정 정보 조회
-        account = db.query(models.Account).filter(models.Account.ACCOUNT_ID == account_id).first()
-        if not account:
-            logger.warning(f"계정 ID {account_id}를 찾을 수 없습니다.")
-            return {"status": "error", "message": "계정을 찾을 수 없습니다."}
-        
-        # 현재 총 이자율 계산 (기본 금리 + 우대 금리)
-        from router.mission import mission_crud
-        interest_details = mission_crud.calculate_account_interest_details(db, account_id)
-        current_total_rate = interest_details['total_interest_rate']
-        
-        # 계정의 모든 일일 잔액 기록 조회 (날짜순)
-        daily_balances = db.query(models.DailyBalances).filter(
-            models.DailyBalances.ACCOUNT_ID == account_id
-        ).order_by(models.DailyBalances.DATE).all()
-        
-        # 재계산 결과 통계
-        total_recalculated = 0
-        adjusted_days = 0
-        
-        # 각 일자별 이자 재계산
-        for i in range(1, len(daily_balances)):
-            current_balance = daily_balances[i]
-            previous_balance = daily_balances[i-1]
-            
-            # 현재 날짜와 전날 날짜가 연속되는지 확인
-            if (current_balance.DATE - previous_balance.DATE).days != 1:
-                logger.warning(f"계정 ID {account_id}: {previous_balance.DATE}와 {current_balance.DATE} 사이에 날짜가 누락되었습니다.")
-                # 이자 계산은 계속 진행
-            
-            # 전날 잔액을 기준으로 현재 금리로 일일 이자 계산
-            daily_interest_rate = current_total_rate / 100 / 365
-            new_daily_interest = round(previous_balance.CLOSING_BALANCE * daily_interest_rate)
-            
-            # 기존 이자와 비교하여 다른 경우에만 업데이트
-            if current_balance.DAILY_INTEREST != new_daily_interest:
-                # 조정금액 계산
-                adjustment = new_daily_interest - current_balance.DAILY_INTEREST
-                total_recalculated += adjustment
-                adjusted_days += 1
-                
-                # 이자 업데이트
-                current_balance.DAILY_INTEREST = new_daily_interest
-                
-                logger.info(f"계정 ID {account_id}, 날짜 {current_balance.DATE}: "
-                          f"이자를 {current_balance.DAILY_INTEREST}원에서 {new_daily_interest}원으로 조정 "
-                          f"(전날({previous_balance.DATE}) 잔액 {previous_balance.CLOSING_BALANCE}원 기준)")
-        
-        # 변경사항 커밋
-        db.commit()
-        
-        # 결과 요약
-        result = {
-            "status": "success",
-            "account_id": account_id,
-            "total_recalculated": total_recalculated,
-            "adjusted_days": adjusted_days,
-            "current_interest_rate": current_total_rate
-        }
-        
-        logger.info(f"계정 ID {account_id}의 이자 소급 적용 완료: {adjusted_days}일, 총 {total_recalculated}원 조정 (전날 잔액 기준)")
-        return result
-        
-    except Exception as e:
-        db.rollback()
-        logger.error(f"이자 소급 적용 중 오류 발생: {str(e)}")
-        return {"status": "error", "message": f"이자 소급 적용 중 오류 발생: {str(e)}"}
\ No newline at end of file
+    summary = await recalculate_interest_history_batch(db, [account_id], from_date)
+    result = summary["results"].get(account_id)
+    if result is None:
+        return {"status": "error", "message": summary.get("message", "이자 재계산 결과가 없습니다.")}
+    return result
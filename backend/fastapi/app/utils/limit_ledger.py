@@ -0,0 +1,99 @@
+# utils/limit_ledger.py
+import logging
+from datetime import datetime
+from sqlalchemy import func
+
+import models
+
+logger = logging.getLogger(__name__)
+
+# 누적액을 집계할 원천 테이블: 이름 -> (모델, 금액 컬럼명)
+LEDGER_SOURCES = {
+    "transfer": (models.DailyTransfer, "AMOUNT"),
+    "saving": (models.DailySaving, "DAILY_SAVING_AMOUNT"),
+}
+
+
+class LimitLedger:
+    """
+    계정별 일간/월간 누적 금액 장부.
+    날짜 구간마다 GROUP BY 한 번으로 모든 계정의 누적액을 불러온 뒤,
+    규칙을 적용하는 동안에는 메모리에서 누적액을 갱신하며 한도를 확인합니다.
+    """
+
+    def __init__(self, target_date, daily_totals=None, monthly_totals=None):
+        self.target_date = target_date
+        self.daily_totals = dict(daily_totals or {})
+        self.monthly_totals = dict(monthly_totals or {})
+
+    @classmethod
+    def load(cls, session, target_date=None, source="transfer", account_ids=None, account_filter=None):
+        """
+        해당 날짜 기준 일간(당일)/월간(월초~당일) 누적액을 불러옵니다.
+
+        Args:
+            session (Session): SQLAlchemy 세션
+            target_date (date, optional): 기준 날짜. 기본값은 오늘.
+            source (str): "transfer"는 DailyTransfer.AMOUNT, "saving"은 DailySaving.DAILY_SAVING_AMOUNT
+            account_ids (iterable, optional): 지정하면 해당 계정만 집계
+            account_filter (callable, optional): 계정 ID 컬럼을 받아 조건식을 반환하는 함수 (샤드 처리용)
+
+        Returns:
+            LimitLedger: 불러온 누적액을 담은 장부
+        """
+        if target_date is None:
+            target_date = datetime.now().date()
+        model, amount_column = LEDGER_SOURCES[source]
+        account_column = model.ACCOUNT_ID
+        amount = getattr(model, amount_column)
+        month_start = target_date.replace(day=1)
+
+        def grouped_sum(*conditions):
+            query = session.query(account_column, func.sum(amount)).filter(*conditions)
+            if account_ids is not None:
+                query = query.filter(account_column.in_(list(account_ids)))
+            if account_filter is not None:
+                query = query.filter(account_filter(account_column))
+            return {account_id: int(total or 0) for account_id, total in query.group_by(account_column).all()}
+
+        daily_totals = grouped_sum(model.DATE == target_date)
+        monthly_totals = grouped_sum(model.DATE >= month_start, model.DATE <= target_date)
+
+        logger.debug(f"[{target_date}] 한도 장부 적재 ({source}): 일간 {len(daily_totals)}개, 월간 {len(monthly_totals)}개 계정")
+        return cls(target_date, daily_totals, monthly_totals)
+
+    def copy(self):
+        """메모리 누적액을 복사한 새 장부를 반환합니다. (원본 입력을 유지해야 할 때 사용)"""
+        return LimitLedger(self.target_date, self.daily_totals, self.monthly_totals)
+
+    def daily_total(self, account_id):
+        return self.daily_totals.get(account_id, 0)
+
+    def monthly_total(self, account_id):
+        return self.monthly_totals.get(account_id, 0)
+
+    def cap(self, account_id, amount, daily_limit=None, month_limit=None):
+        """
+        현재 누적액 기준으로 일일/월간 한도에 맞게 금액을 조정합니다. (장부는 변경하지 않음)
+        한도가 None이면 제한 없음으로 처리합니다.
+        """
+        daily_accumulated = self.daily_total(account_id)
+        monthly_accumulated = self.monthly_total(account_id)
+        if daily_limit is not None and daily_accumulated + amount > daily_limit:
+            amount = max(0, daily_limit - daily_accumulated)
+        if month_limit is not None and monthly_accumulated + amount > month_limit:
+            amount = max(0, month_limit - monthly_accumulated)
+        return amount
+
+    def fits_daily(self, account_id, amount, daily_limit):
+        """금액을 더해도 일일 한도 이내인지 확인합니다."""
+        return daily_limit is None or self.daily_total(account_id) + amount <= daily_limit
+
+    def fits_monthly(self, account_id, amount, month_limit):
+        """금액을 더해도 월간 한도 이내인지 확인합니다."""
+        return month_limit is None or self.monthly_total(account_id) + amount <= month_limit
+
+    def record(self, account_id, amount):
+        """적립 금액을 일간/월간 누적액에 반영합니다."""
+        self.daily_totals[account_id] = self.daily_total(account_id) + amount
+        self.monthly_totals[account_id] = self.monthly_total(account_id) + amount
@@ -17,6 +17,9 @@ import sys
 sys.path.append(project_root)
 import models
 from database import engine
+from utils.account_stream import iter_accounts, JobMemory
+from utils.limit_ledger import LimitLedger
+from utils.series_analysis import analyze_series
 import logging
 
 logging.basicConfig(
@@ -29,7 +32,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def process_savings_for_date(game_date=None, session=None):
+def process_savings_for_date(game_date=None, session=None, mode="row", num_shards=None):
     """
     특정 날짜의 게임 기록을 기반으로 사용자 적금 규칙에 따라 적립금을 처리합니다.
     하루에 계정별로 한 번만 DailyTransfer에 총합을 저장합니다.
@@ -38,11 +41,23 @@ def process_savings_for_date(game_date=None, session=None):
     Args:
         game_date (date, optional): 처리할 게임 날짜. 기본값은 오늘.
         session (Session, optional): SQLAlchemy 세션. None이면 새 세션을 생성합니다.
+        mode (str, optional): "row"는 계정별 조회 방식, "bulk"는 집합 쿼리 기반 엔진(utils.saving_engine),
+            "sharded"는 계정을 나눠 여러 프로세스에서 bulk 엔진을 실행(utils.saving_shards).
+        num_shards (int, optional): sharded 모드의 샤드 수. 기본값은 CPU 수.
     
     Returns:
         dict: 처리 결과 요약 정보
     """
     
+    if mode == "bulk":
+        from utils.saving_engine import process_savings_for_date_bulk
+        return process_savings_for_date_bulk(game_date, session)
+    
+    if mode == "sharded":
+        # 샤드마다 자체 세션을 사용하므로 전달된 session은 사용하지 않음
+        from utils.saving_shards import process_savings_sharded
+        return process_savings_sharded(game_date, num_shards)
+    
     # 날짜 설정 (기본값: 어제)
     if game_date is None:
         game_date = datetime.now().date() - timedelta(days=1)
@@ -64,6 +79,7 @@ def process_savings_for_date(game_date=None, session=None):
     
     try:
         logger.info(f"[{game_date}] 적금 규칙에 따른 적립금 처리 시작...")
+        memory = JobMemory()
         
         # 처리 결과 요약용 변수
         total_saved = 0
@@ -98,8 +114,8 @@ def process_savings_for_date(game_date=None, session=None):
             
             player_stats[record.PLAYER_ID]['records'][record.RECORD_TYPE_ID] = record.COUNT
         
-        # 3. 모든 계정 조회
-        accounts = session.query(models.Account).all()
+        # 3. 모든 계정 조회 (ACCOUNT_ID 순으로 청크 단위 스트리밍 - 전체를 한 번에 올리지 않음)
+        accounts = iter_accounts(session.query(models.Account), memory=memory)
         
         # 계정별 일일 총액을 저장할 딕셔너리
         account_daily_totals = {}
@@ -119,23 +135,20 @@ def process_savings_for_date(game_date=None, session=None):
             processed_rules.add((saving.ACCOUNT_ID, saving.SAVING_RULED_DETAIL_ID, saving.SAVING_RULED_TYPE_ID))
         
         logger.info(f"[{game_date}] 이미 처리된 규칙 수: {len(processed_rules)}")
+        
+        # 계정별 이미 이체된 금액 (일간/월간) - 날짜 구간별 GROUP BY 한 번씩
+        ledger = LimitLedger.load(session, game_date, source="transfer")
+        
+        # 팀별 시리즈 분석 (스윕 판정) - 계정마다가 아니라 날짜당 한 번
+        series = analyze_series(session, game_date)
 
         for account in accounts:
             account_total_saved = 0  # 이 계정에 적립된 총액
             account_savings_count = 0  # 이 계정의 적립 건수
             
-            # 일일 한도 확인 (이미 이체된 금액)
-            already_transferred_today = session.query(func.sum(models.DailyTransfer.AMOUNT)).filter(
-                models.DailyTransfer.ACCOUNT_ID == account.ACCOUNT_ID,
-                models.DailyTransfer.DATE == game_date
-            ).scalar() or 0
-            
-            # 월간 한도 확인 (이미 이체된 금액)
-            already_transferred_this_month = session.query(func.sum(models.DailyTransfer.AMOUNT)).filter(
-                models.DailyTransfer.ACCOUNT_ID == account.ACCOUNT_ID,
-                models.DailyTransfer.DATE >= month_start,
-                models.DailyTransfer.DATE <= game_date
-            ).scalar() or 0
+            # 일일/월간 한도 확인 (이미 이체된 금액)
+            already_transferred_today = ledger.daily_total(account.ACCOUNT_ID)
+            already_transferred_this_month = ledger.monthly_total(account.ACCOUNT_ID)
             
             # 현재 처리 과정에서 누적되는 금액 (여러 규칙 처리 시 합산)
             daily_accumulated = already_transferred_today
@@ -188,46 +201,8 @@ def process_savings_for_date(game_date=None, session=None):
                     
                     # 스윕 규칙 처리 (기록 유형 ID가 7인 경우, 스윕)
                     if record_type_id == 7:  # 스윕 기록 처리
-                        # 최근 3일간의 날짜 계산
-                        three_days_ago = game_date - timedelta(days=2)  # 오늘 포함 3일
-                        
-                        # 최근 3일간의 게임 일정 조회
-                        recent_games = session.query(models.GameSchedule).filter(
-                            models.GameSchedule.DATE >= three_days_ago,
-                            models.GameSchedule.DATE <= game_date,
-                            ((models.GameSchedule.HOME_TEAM_ID == team_id) | 
-                             (models.GameSchedule.AWAY_TEAM_ID == team_id))
-                        ).order_by(models.GameSchedule.DATE).all()
-                        
-                        # 최근 3일간의 승리 기록 조회 (기록 유형 ID가 1인 경우, 승리)
-                        recent_wins = session.query(models.GameLog).filter(
-                            models.GameLog.DATE >= three_days_ago,
-                            models.GameLog.DATE <= game_date,
-                            models.GameLog.TEAM_ID == team_id,
-                            models.GameLog.RECORD_TYPE_ID == 1  # 승리 기록 유형
-                        ).order_by(models.GameLog.DATE).all()
-                        
-                        # 스윕 확인
-                        sweep_count = 0
-                        
-                        # 최근 3경기가 있는지 확인
-                        if len(recent_games) >= 3:
-                            # 경기 상대팀 확인
-                            opponents = []
-                            for game in recent_games:
-                                if game.HOME_TEAM_ID == team_id:
-                                    opponents.append(game.AWAY_TEAM_ID)
-                                else:
-                                    opponents.append(game.HOME_TEAM_ID)
-                            
-                            # 최근 3경기의 상대팀이 모두 같은지 확인
-                            if len(set(opponents[:3])) == 1:  # 첫 3개의 상대팀이 동일한지 확인
-                                # 최근 3일간 이 팀의 승리 횟수 확인
-                                if len(recent_wins) >= 3:
-                                    # 동일한 상대에 대한 3연승 확인
-                                    # 여기서는 단순화를 위해 3일 연속 승리가 있으면 스윕으로 간주
-                                    sweep_count = 1
-                                    print(f"스윕 감지: 팀 {team_id}가 최근 3일간 동일한 상대팀 {opponents[0]}에 대해 연승")
+                        # 날짜별 시리즈 분석 결과에서 스윕 여부 확인
+                        sweep_count = 1 if team_id in series["sweeps"] else 0
                         
                         # 스윕이 확인되면 적립금 처리
                         if sweep_count > 0:
@@ -558,7 +533,8 @@ def process_savings_for_date(game_date=None, session=None):
             "savings_count": savings_count,
             "teams_count": len(team_stats),
             "players_count": len(player_stats),
-            "daily_transfers": len(account_daily_totals)  # 일일 이체 건수는 계정 수와 동일
+            "daily_transfers": len(account_daily_totals),  # 일일 이체 건수는 계정 수와 동일
+            **memory.summary()
         }
         
         print(f"[{game_date}] 적립 처리 완료: {processed_accounts}개 계정, 총 {total_saved}원 적립 ({savings_count}건), 이체 {len(account_daily_totals)}건")
@@ -572,9 +548,10 @@ def process_savings_for_date(game_date=None, session=None):
         if close_session:
             session.close()
             
-def process_recent_days(days=7):
+def process_recent_days(days=7, mode="row", num_shards=None):
    """
    최근 n일간의 적금 적립을 처리합니다.
+   기간 전체를 다시 계산해야 하면 utils/saving_backfill.py (달별 병렬, 이어서 실행 가능)를 사용하세요.
    """
    today = date.today()
    
@@ -587,7 +564,7 @@ def process_recent_days(days=7):
        for i in range(days):
            process_date = today - timedelta(days=i)
            print(f"\n처리 날짜: {process_date}")
-           result = process_savings_for_date(process_date, session)
+           result = process_savings_for_date(process_date, session, mode=mode, num_shards=num_shards)
            results.append(result)
    finally:
        session.close()
@@ -615,36 +592,11 @@ def clear_existing_savings(game_date=None, session=None):
    try:
        print(f"[{game_date}] 기존 적금 적립 내역 삭제 시작...")
        
-       # 해당 날짜의 모든 적립 내역 조회
-       savings = session.query(models.DailySaving).filter(
-           models.DailySaving.DATE == game_date
-       ).all()
-       
-       deleted_count = 0
-       total_amount = 0
-       
-       # 각 적립 내역에 대해 계정 잔액 롤백 및 삭제
-       for saving in savings:
-           # 계정 잔액 업데이트 (차감)
-           account = session.query(models.Account).filter(
-               models.Account.ACCOUNT_ID == saving.ACCOUNT_ID
-           ).first()
-           
-           if account:
-               account.TOTAL_AMOUNT -= saving.DAILY_SAVING_AMOUNT
-               total_amount += saving.DAILY_SAVING_AMOUNT
-           
-           # 적립 내역 삭제
-           session.delete(saving)
-           deleted_count += 1
-       
-       # DailyTransfer 테이블의 해당 날짜 레코드도 삭제
-       daily_transfers = session.query(models.DailyTransfer).filter(
-           models.DailyTransfer.DATE == game_date
-       ).all()
-       
-       for transfer in daily_transfers:
-           session.delete(transfer)
+       # 적립 내역/출금 예정 삭제와 계정 잔액 롤백을 집합 기반 문장으로 처리
+       from utils.saving_backfill import clear_savings_for_dates
+       cleared = clear_savings_for_dates(session, [game_date])
+       deleted_count = cleared["deleted_count"]
+       total_amount = cleared["total_amount"]
        
        # 변경 사항 커밋
        session.commit()
@@ -667,6 +619,8 @@ if __name__ == "__main__":
    parser.add_argument('--date', type=str, help='처리할 날짜 (YYYY-MM-DD 형식, 기본값: 오늘)')
    parser.add_argument('--days', type=int, default=1, help='처리할 최근 일수 (기본값: 1)')
    parser.add_argument('--clear', action='store_true', help='기존 적립 내역 삭제 후 재처리')
+   parser.add_argument('--mode', choices=['row', 'bulk', 'sharded'], default='row', help='처리 방식 (row: 계정별 처리, bulk: 집합 기반 처리, sharded: 샤드 병렬 처리)')
+   parser.add_argument('--shards', type=int, help='sharded 모드의 샤드(프로세스) 수 (기본값: CPU 수)')
    
    args = parser.parse_args()
    
@@ -678,7 +632,7 @@ if __name__ == "__main__":
            if args.clear:
                clear_existing_savings(process_date)
            
-           process_savings_for_date(process_date)
+           process_savings_for_date(process_date, mode=args.mode, num_shards=args.shards)
        except ValueError:
            print("날짜 형식이 잘못되었습니다. YYYY-MM-DD 형식으로 입력하세요.")
    else:
@@ -691,4 +645,4 @@ if __name__ == "__main__":
                clear_existing_savings(process_date)
        
        # 최근 n일 처리
-       process_recent_days(args.days)
\ No newline at end of file
+       process_recent_days(args.days, mode=args.mode, num_shards=args.shards)
\ No newline at end of file
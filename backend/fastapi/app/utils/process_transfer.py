@@ -4,7 +4,7 @@ import asyncio
 import logging
 import argparse
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine, func
+from sqlalchemy import create_engine, func, update
 from datetime import date, datetime, timedelta
 
 # 현재 스크립트 위치 기준으로 절대 경로 구성
@@ -23,6 +23,11 @@ from database import engine
 
 # update_daily_balances 모듈에서 필요한 함수 import
 from utils.update_daily_balances import update_daily_balances, calculate_daily_interest
+from utils.transfer_executor import run_transfers
+from utils.bank_http_client import close_bank_client
+from utils.bank_rate_limiter import batch_priority
+from utils.transfer_journal import open_journal_entries, record_outcome, STATUS_COMPLETED
+from utils.transfer_plan import load_transfer_plan, DEFAULT_TRANSFER_TEXT
 
 # 로깅 설정
 logging.basicConfig(
@@ -35,14 +40,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-async def process_actual_transfers(db, date_param=None):
+async def process_actual_transfers(db, date_param=None, concurrency=None):
     """
     특정 날짜(기본값: 어제)의 DailyTransfer 내역을 기준으로 실제 이체를 처리합니다.
     이체 처리 후 바로 daily_balances 테이블 업데이트와 이자 계산도 수행합니다.
     
+    DailyTransfer 행별 진행 상태는 TransferJournal에 멱등 키와 함께 기록되므로, 중간에 중단된 뒤 다시 실행하면
+    완료된 이체는 건너뛰고 끝나지 않은 이체만 같은 멱등 키로 재시도합니다.
+    
     Args:
         db (Session): 데이터베이스 세션
         date_param (date, optional): 처리할 날짜. 기본값은 어제.
+        concurrency (int, optional): 동시에 실행할 이체 수. 기본값은 TRANSFER_CONCURRENCY (8)
     
     Returns:
         dict: 처리 결과 요약 정보
@@ -58,85 +67,78 @@ async def process_actual_transfers(db, date_param=None):
     processed_accounts = 0
     skipped_accounts = 0
     failed_accounts = 0
+    failed_account_ids = []
+    already_transferred = 0
     
     try:
-        # 해당 날짜의 DailyTransfer 내역 조회
-        daily_transfers = db.query(models.DailyTransfer).filter(
-            models.DailyTransfer.DATE == date_param
-        ).all()
+        # 1. 이체 계획 (DailyTransfer + 계정 + 사용자 + 거래 메시지를 조인 쿼리 한 번으로)
+        from router.user.user_ssafy_api_utils import transfer_money
         
-        logger.info(f"총 {len(daily_transfers)}개 계정의 이체 내역이 있습니다.")
+        plan = load_transfer_plan(db, date_param)
+        skipped_accounts += len(plan["skipped"])
+        logger.info(f"총 {len(plan['items']) + len(plan['skipped'])}개 계정의 이체 내역이 있습니다. "
+                    f"이체 예정 총액: {plan['total_amount']}원")
         
-        # 각 계정별로 이체 처리
-        for daily_transfer in daily_transfers:
-            try:
-                # 계정 정보 조회
-                account = db.query(models.Account).filter(
-                    models.Account.ACCOUNT_ID == daily_transfer.ACCOUNT_ID
-                ).first()
-                
-                if not account:
-                    logger.warning(f"계정 ID {daily_transfer.ACCOUNT_ID}를 찾을 수 없습니다. 이체를 건너뜁니다.")
-                    skipped_accounts += 1
-                    continue
-                
-                # 사용자 정보 조회
-                user = db.query(models.User).filter(
-                    models.User.USER_ID == account.USER_ID
-                ).first()
-                
-                if not user:
-                    logger.warning(f"계정 ID {daily_transfer.ACCOUNT_ID}의 사용자 정보를 찾을 수 없습니다. 이체를 건너뜁니다.")
-                    skipped_accounts += 1
-                    continue
-                
-                # 트랜잭션 메시지 조회
-                transaction_message = db.query(models.TransactionMessage).filter(
-                    models.TransactionMessage.ACCOUNT_ID == account.ACCOUNT_ID,
-                    models.TransactionMessage.TRANSACTION_DATE == date_param
-                ).first()
-                
-                # 메시지가 없으면 기본 메시지 사용
-                llm_text = "야금야금 출금"
-                if transaction_message and transaction_message.MESSAGE:
-                    llm_text = transaction_message.MESSAGE
-                
-                # 이체 처리
-                try:
-                    # 금융 API를 통한 이체 처리
-                    from router.user.user_ssafy_api_utils import transfer_money
-                    
-                    saving_amount = daily_transfer.AMOUNT
-                    
-                    logger.info(f"계정 ID {account.ACCOUNT_ID}: {saving_amount}원 이체 시작 (출금계좌: {account.SOURCE_ACCOUNT}, 입금계좌: {account.ACCOUNT_NUM})")
-                    
-                    transfer_result = await transfer_money(
-                        user_key=user.USER_KEY,
-                        withdrawal_account=account.SOURCE_ACCOUNT,  # 출금 계좌 (입출금 계좌)
-                        deposit_account=account.ACCOUNT_NUM,        # 입금 계좌 (적금 계좌)
-                        amount=saving_amount,
-                        llm_text="야금야금 출금"  # 트랜잭션 메시지
-                    )
-                    
-                    # 이체 성공 시 계정 잔액 업데이트
-                    account.TOTAL_AMOUNT += saving_amount
-                    
-                    daily_transfer.TEXT = llm_text
+        # 2. 이체 저널 준비 (멱등 키 발급/재사용, 보내기 전에 커밋)
+        journal = open_journal_entries(
+            db, date_param, [(item.daily_transfer_id, item.account_id, item.amount) for item in plan["items"]]
+        )
+        
+        send_jobs = []
+        for item in plan["items"]:
+            entry = journal[item.daily_transfer_id]
+            if entry.STATUS == STATUS_COMPLETED:
+                # 이전 실행에서 이미 이체 완료 - 다시 보내지 않음
+                already_transferred += 1
+                continue
+            send_jobs.append({
+                "account_id": item.account_id,
+                "kwargs": {
+                    "user_key": item.user_key,
+                    "withdrawal_account": item.withdrawal_account,
+                    "deposit_account": item.deposit_account,
+                    "amount": item.amount,
+                    "llm_text": DEFAULT_TRANSFER_TEXT,  # 트랜잭션 메시지
+                    "unique_no": entry.IDEMPOTENCY_KEY
+                },
+                "context": (item, entry)
+            })
+        
+        if already_transferred:
+            logger.info(f"[{date_param}] 저널 기준 이미 이체된 {already_transferred}개 계정은 건너뜁니다.")
+        
+        def apply_outcome(job, outcome):
+            nonlocal total_transferred, processed_accounts, failed_accounts
+            item, entry = job["context"]
+            
+            if record_outcome(db, entry, outcome):
+                # 이체 성공 시 계정 잔액/거래 메시지 업데이트 (ORM 객체를 불러오지 않고 UPDATE)
+                db.execute(
+                    update(models.Account)
+                    .where(models.Account.ACCOUNT_ID == item.account_id)
+                    .values(TOTAL_AMOUNT=func.coalesce(models.Account.TOTAL_AMOUNT, 0) + item.amount)
+                )
+                db.execute(
+                    update(models.DailyTransfer)
+                    .where(models.DailyTransfer.DAILY_TRANSFER_ID == item.daily_transfer_id)
+                    .values(TEXT=item.llm_text)
+                )
 
-                    total_transferred += saving_amount
-                    processed_accounts += 1
-                    
-                    logger.info(f"계정 ID {account.ACCOUNT_ID}: {saving_amount}원 이체 성공")
-                    
-                except Exception as e:
-                    logger.error(f"계정 ID {account.ACCOUNT_ID} 이체 처리 중 오류: {str(e)}")
-                    failed_accounts += 1
-                    continue
-                    
-            except Exception as e:
-                logger.error(f"계정 ID {daily_transfer.ACCOUNT_ID} 처리 중 오류: {str(e)}")
+                total_transferred += item.amount
+                processed_accounts += 1
+                
+                logger.info(f"계정 ID {item.account_id}: {item.amount}원 이체 성공")
+            else:
                 failed_accounts += 1
-                continue
+                failed_account_ids.append(item.account_id)
+            
+            # 저널 상태와 계정 잔액을 같은 트랜잭션으로 커밋 (중단되어도 이체 단위로 이어서 처리)
+            db.commit()
+        
+        # 3. 금융 API 이체를 제한된 동시성으로 실행 (끝나는 대로 저널/잔액 반영)
+        # 배치 우선순위: 사용자 요청의 금융 API 호출이 먼저 토큰을 받음
+        with batch_priority():
+            await run_transfers(send_jobs, transfer_money, concurrency, on_result=apply_outcome)
         
         # 변경사항 커밋
         db.commit()
@@ -146,7 +148,10 @@ async def process_actual_transfers(db, date_param=None):
             "total_transferred": total_transferred,
             "processed_accounts": processed_accounts,
             "skipped_accounts": skipped_accounts,
-            "failed_accounts": failed_accounts
+            "failed_accounts": failed_accounts,
+            "failed_account_ids": failed_account_ids,
+            "already_transferred": already_transferred,
+            "planned_amount": plan["total_amount"]
         }
         
         logger.info(f"[{date_param}] 이체 처리 완료: {processed_accounts}개 계정 성공, {skipped_accounts}개 건너뜀, {failed_accounts}개 실패, 총 {total_transferred}원 이체")
@@ -175,7 +180,7 @@ async def process_actual_transfers(db, date_param=None):
         logger.error(f"이체 처리 중 오류 발생: {str(e)}")
         raise
 
-async def process_transfers_for_range(start_date=None, end_date=None, db_session=None):
+async def process_transfers_for_range(start_date=None, end_date=None, db_session=None, concurrency=None):
     """
     지정된 날짜 범위의 daily_saving 내역에 대해 이체, 잔액 업데이트, 이자 계산을 처리합니다.
     
@@ -183,6 +188,7 @@ async def process_transfers_for_range(start_date=None, end_date=None, db_session
         start_date (date, optional): 시작 날짜. 기본값은 어제.
         end_date (date, optional): 종료 날짜. 기본값은 어제.
         db_session (Session, optional): 데이터베이스 세션. None이면 새 세션 생성.
+        concurrency (int, optional): 동시에 실행할 이체 수
     
     Returns:
         list: 각 날짜별 처리 결과 요약 정보
@@ -205,7 +211,7 @@ async def process_transfers_for_range(start_date=None, end_date=None, db_session
         current_date = start_date
         while current_date <= end_date:
             logger.info(f"날짜 {current_date} 처리 시작")
-            result = await process_actual_transfers(db_session, current_date)
+            result = await process_actual_transfers(db_session, current_date, concurrency)
             results.append(result)
             current_date += timedelta(days=1)
             
@@ -219,6 +225,7 @@ async def main():
     parser.add_argument('--date', type=str, help='처리할 날짜 (YYYY-MM-DD 형식, 기본값: 어제)')
     parser.add_argument('--start-date', type=str, help='처리 시작 날짜 (YYYY-MM-DD 형식)')
     parser.add_argument('--end-date', type=str, help='처리 종료 날짜 (YYYY-MM-DD 형식)')
+    parser.add_argument('--concurrency', type=int, help='동시에 실행할 이체 수 (기본값: TRANSFER_CONCURRENCY 또는 8)')
     
     args = parser.parse_args()
     
@@ -231,7 +238,7 @@ async def main():
             # 특정 날짜 처리
             try:
                 process_date = datetime.strptime(args.date, '%Y-%m-%d').date()
-                await process_actual_transfers(db, process_date)
+                await process_actual_transfers(db, process_date, args.concurrency)
             except ValueError:
                 logger.error("날짜 형식이 잘못되었습니다. YYYY-MM-DD 형식으로 입력하세요.")
         elif args.start_date and args.end_date:
@@ -239,15 +246,16 @@ async def main():
             try:
                 start_date = datetime.strptime(args.start_date, '%Y-%m-%d').date()
                 end_date = datetime.strptime(args.end_date, '%Y-%m-%d').date()
-                await process_transfers_for_range(start_date, end_date, db)
+                await process_transfers_for_range(start_date, end_date, db, args.concurrency)
             except ValueError:
                 logger.error("날짜 형식이 잘못되었습니다. YYYY-MM-DD 형식으로 입력하세요.")
         else:
             # 기본값: 어제 날짜 처리
             yesterday = datetime.now().date() - timedelta(days=1)
-            await process_actual_transfers(db, yesterday)
+            await process_actual_transfers(db, yesterday, args.concurrency)
     finally:
         db.close()
+        await close_bank_client()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,176 @@
+# utils/rule_index.py
+import logging
+import threading
+from collections import defaultdict, namedtuple
+
+import models
+
+logger = logging.getLogger(__name__)
+
+# 규칙 타입 이름 (DB/init_setting 기준)
+BASIC_RULE_TYPE_NAME = "기본 규칙"
+OPPONENT_RULE_TYPE_NAME = "상대팀"
+
+# 색인 키의 대상 구분
+SUBJECT_TEAM = "team"          # (team, 응원팀 ID, 기록 유형) - 기본 규칙
+SUBJECT_OPPONENT = "opponent"  # (opponent, 응원팀 ID, 기록 유형) - 응원팀 상대팀의 기록
+SUBJECT_PLAYER = "player"      # (player, 선수 ID, 기록 유형) - 선수 규칙
+
+# 색인에 들어가는 사용자 규칙 한 건
+RuleEntry = namedtuple("RuleEntry", [
+    "account_id", "user_rule_id", "amount", "rule_detail_id", "rule_type_id", "player_id"
+])
+
+
+def _query_rule_rows(session, *conditions):
+    """사용자 규칙 + 규칙 상세 + 규칙 목록 + 계정 + 규칙 타입을 한 번에 조회합니다."""
+    return session.query(
+        models.UserSavingRule.USER_SAVING_RULED_ID,
+        models.UserSavingRule.ACCOUNT_ID,
+        models.UserSavingRule.SAVING_RULE_DETAIL_ID,
+        models.UserSavingRule.SAVING_RULE_TYPE_ID,
+        models.UserSavingRule.USER_SAVING_RULED_AMOUNT,
+        models.UserSavingRule.PLAYER_ID,
+        models.SavingRuleList.RECORD_TYPE_ID,
+        models.SavingRuleType.SAVING_RULE_TYPE_NAME,
+        models.Account.TEAM_ID
+    ).join(
+        models.SavingRuleDetail,
+        models.UserSavingRule.SAVING_RULE_DETAIL_ID == models.SavingRuleDetail.SAVING_RULE_DETAIL_ID
+    ).join(
+        models.SavingRuleList,
+        models.SavingRuleDetail.SAVING_RULE_ID == models.SavingRuleList.SAVING_RULE_ID
+    ).join(
+        models.Account,
+        models.UserSavingRule.ACCOUNT_ID == models.Account.ACCOUNT_ID
+    ).outerjoin(
+        models.SavingRuleType,
+        models.UserSavingRule.SAVING_RULE_TYPE_ID == models.SavingRuleType.SAVING_RULE_TYPE_ID
+    ).filter(*conditions).order_by(
+        models.UserSavingRule.USER_SAVING_RULED_ID
+    ).all()
+
+
+def rule_index_key(row):
+    """
+    규칙 행이 반응할 이벤트 키를 반환합니다. 어떤 이벤트에도 반응하지 않는 규칙이면 None.
+    (선수 ID가 있으면 선수 규칙, 없으면 규칙 타입에 따라 기본 규칙/상대팀 규칙)
+    """
+    if row.PLAYER_ID is not None:
+        return (SUBJECT_PLAYER, row.PLAYER_ID, row.RECORD_TYPE_ID)
+    if row.SAVING_RULE_TYPE_NAME == BASIC_RULE_TYPE_NAME:
+        return (SUBJECT_TEAM, row.TEAM_ID, row.RECORD_TYPE_ID)
+    if row.SAVING_RULE_TYPE_NAME == OPPONENT_RULE_TYPE_NAME:
+        return (SUBJECT_OPPONENT, row.TEAM_ID, row.RECORD_TYPE_ID)
+    return None
+
+
+class RuleIndex:
+    """
+    사용자 적금 규칙의 역색인.
+    (대상 구분, 팀/선수 ID, 기록 유형 ID) → 해당 이벤트에 반응하는 규칙 목록으로 묶어 두어,
+    하루치 GameLog/PlayerRecord 이벤트에서 영향을 받는 계정만 찾아갈 수 있게 합니다.
+    일일 적립 작업은 compile()로 작업마다 새로 만들어 사용합니다.
+    프로세스 전역 색인(rule_index)은 saving_rule_crud의 사용자 규칙 쓰기 함수에서 upsert()/remove()로 증분 갱신하고,
+    계정이나 규칙 카탈로그가 바뀌면 invalidate() 후 다음 조회 때 다시 만듭니다.
+    이 프로세스 밖에서 바뀐 규칙(SQL 스크립트, 다른 워커)은 반영되지 않으므로 API 서버의 대화형 조회에만 사용합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_key = defaultdict(dict)  # key -> {user_rule_id: RuleEntry}
+        self._key_of = {}                 # user_rule_id -> key
+        self.built = False
+
+    @classmethod
+    def compile(cls, session, account_filter=None):
+        """
+        DB에서 사용자 규칙을 읽어 새 색인을 만듭니다.
+
+        Args:
+            session (Session): SQLAlchemy 세션
+            account_filter (callable, optional): 계정 ID 컬럼을 받아 조건식을 반환하는 함수 (샤드 처리용)
+
+        Returns:
+            RuleIndex: 만들어진 색인
+        """
+        index = cls()
+        index._load(session, account_filter)
+        return index
+
+    def _load(self, session, account_filter=None):
+        conditions = []
+        if account_filter is not None:
+            conditions.append(account_filter(models.UserSavingRule.ACCOUNT_ID))
+        rows = _query_rule_rows(session, *conditions)
+
+        with self._lock:
+            self._by_key = defaultdict(dict)
+            self._key_of = {}
+            for row in rows:
+                self._add(row)
+            self.built = True
+        logger.info(f"적금 규칙 색인 생성: 규칙 {len(self._key_of)}개, 키 {len(self._by_key)}개")
+
+    def _add(self, row):
+        key = rule_index_key(row)
+        if key is None:
+            return
+        self._by_key[key][row.USER_SAVING_RULED_ID] = RuleEntry(
+            account_id=row.ACCOUNT_ID,
+            user_rule_id=row.USER_SAVING_RULED_ID,
+            amount=row.USER_SAVING_RULED_AMOUNT,
+            rule_detail_id=row.SAVING_RULE_DETAIL_ID,
+            rule_type_id=row.SAVING_RULE_TYPE_ID,
+            player_id=row.PLAYER_ID
+        )
+        self._key_of[row.USER_SAVING_RULED_ID] = key
+
+    def ensure_built(self, session):
+        """색인이 없으면 DB에서 만들고, 자기 자신을 반환합니다."""
+        with self._lock:
+            if not self.built:
+                self._load(session)
+        return self
+
+    def upsert(self, session, user_rule_id):
+        """사용자 규칙 한 건을 DB에서 다시 읽어 색인에 반영합니다. (생성/수정 후 호출)"""
+        with self._lock:
+            if not self.built:
+                return  # 아직 만들어지지 않았으면 다음 조회 때 전체를 읽음
+            self.remove(user_rule_id)
+            for row in _query_rule_rows(session, models.UserSavingRule.USER_SAVING_RULED_ID == user_rule_id):
+                self._add(row)
+
+    def remove(self, user_rule_id):
+        """사용자 규칙 한 건을 색인에서 제거합니다. (삭제 후 호출)"""
+        with self._lock:
+            key = self._key_of.pop(user_rule_id, None)
+            if key is None:
+                return
+            entries = self._by_key.get(key)
+            if entries is not None:
+                entries.pop(user_rule_id, None)
+                if not entries:
+                    del self._by_key[key]
+
+    def invalidate(self):
+        """색인을 비웁니다. 다음 ensure_built() 때 다시 만듭니다."""
+        with self._lock:
+            self._by_key = defaultdict(dict)
+            self._key_of = {}
+            self.built = False
+
+    def subscribers(self, subject, subject_id, record_type_id):
+        """해당 이벤트에 반응하는 규칙 목록을 반환합니다."""
+        with self._lock:
+            entries = self._by_key.get((subject, subject_id, record_type_id))
+            return list(entries.values()) if entries else []
+
+    def stats(self):
+        with self._lock:
+            return {"built": self.built, "rules": len(self._key_of), "keys": len(self._by_key)}
+
+
+# 프로세스 전역 색인 (API 서버의 대화형 조회용, 일일 적립 작업은 RuleIndex.compile() 사용)
+rule_index = RuleIndex()
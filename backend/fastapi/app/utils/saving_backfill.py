@@ -0,0 +1,367 @@
+# utils/saving_backfill.py
+import os
+import sys
+import json
+import time
+import queue
+import logging
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, update, delete, func
+
+# 현재 스크립트 위치 기준으로 절대 경로 구성
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+import models
+from database import engine, SessionLocal
+from utils.saving_engine import process_savings_for_date_bulk
+from utils.transfer_journal import STATUS_COMPLETED, STATUS_PENDING
+
+logger = logging.getLogger(__name__)
+
+
+def clear_savings_for_dates(session, dates):
+    """
+    여러 날짜의 DailySaving / DailyTransfer를 집합 기반 문장으로 삭제합니다.
+    clear_existing_savings()와 마찬가지로 삭제되는 적립액만큼 계정 TOTAL_AMOUNT를 되돌리며,
+    계정별 합계를 한 번에 계산해 UPDATE 한 번으로 반영합니다. 커밋은 호출한 쪽에서 합니다.
+
+    실제 이체가 끝났거나(COMPLETED) 결과를 알 수 없는(PENDING) 이체 저널 항목이 있는 날짜는 삭제하지 않습니다.
+    저널과 멱등 키를 지운 뒤 다시 적립/이체하면 같은 금액이 한 번 더 이체될 수 있기 때문입니다.
+    은행이 거절한(FAILED) 저널 항목은 해당 DailyTransfer와 함께 삭제합니다.
+
+    Args:
+        session (Session): SQLAlchemy 세션
+        dates (list): 삭제할 날짜 목록
+
+    Returns:
+        dict: {"deleted_count": 삭제한 적립 내역 수, "total_amount": 되돌린 총액, "deleted_transfers": 삭제한 출금 예정 수}
+
+    Raises:
+        ValueError: 이체가 끝났거나 진행 중인 저널 항목이 있는 날짜가 포함된 경우
+    """
+    dates = sorted(set(dates))
+    if not dates:
+        return {"deleted_count": 0, "total_amount": 0, "deleted_transfers": 0}
+
+    transfer_ids = select(models.DailyTransfer.DAILY_TRANSFER_ID).where(models.DailyTransfer.DATE.in_(dates))
+    journaled = session.query(
+        models.TransferJournal.DATE,
+        func.count(models.TransferJournal.TRANSFER_JOURNAL_ID)
+    ).filter(
+        models.TransferJournal.DAILY_TRANSFER_ID.in_(transfer_ids),
+        models.TransferJournal.STATUS.in_([STATUS_COMPLETED, STATUS_PENDING])
+    ).group_by(models.TransferJournal.DATE).order_by(models.TransferJournal.DATE).all()
+    if journaled:
+        blocked = ", ".join(f"{journal_date} ({count}건)" for journal_date, count in journaled)
+        raise ValueError(f"이미 이체했거나 이체 결과를 알 수 없는 날짜는 적립 내역을 삭제할 수 없습니다: {blocked}. "
+                         f"PENDING 항목은 이체 작업을 다시 실행해 결과를 확정하세요.")
+
+    deleted_count, total_amount = session.query(
+        func.count(models.DailySaving.DAILY_SAVING_ID),
+        func.coalesce(func.sum(models.DailySaving.DAILY_SAVING_AMOUNT), 0)
+    ).filter(models.DailySaving.DATE.in_(dates)).one()
+
+    # 계정별 적립 합계만큼 잔액 롤백 (계정마다 조회하지 않고 UPDATE ... JOIN 한 번)
+    saved = select(
+        models.DailySaving.ACCOUNT_ID,
+        func.sum(models.DailySaving.DAILY_SAVING_AMOUNT).label("amount")
+    ).where(
+        models.DailySaving.DATE.in_(dates)
+    ).group_by(models.DailySaving.ACCOUNT_ID).subquery()
+    session.execute(
+        update(models.Account)
+        .where(models.Account.ACCOUNT_ID == saved.c.ACCOUNT_ID)
+        .values(TOTAL_AMOUNT=models.Account.TOTAL_AMOUNT - saved.c.amount)
+        .execution_options(synchronize_session=False)
+    )
+
+    session.execute(
+        delete(models.DailySaving)
+        .where(models.DailySaving.DATE.in_(dates))
+        .execution_options(synchronize_session=False)
+    )
+    # 은행이 거절한(FAILED) 저널 항목은 DailyTransfer와 함께 삭제 (daily_transfer 외래 키)
+    session.execute(
+        delete(models.TransferJournal)
+        .where(models.TransferJournal.DAILY_TRANSFER_ID.in_(transfer_ids))
+        .execution_options(synchronize_session=False)
+    )
+    deleted_transfers = session.execute(
+        delete(models.DailyTransfer)
+        .where(models.DailyTransfer.DATE.in_(dates))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    return {
+        "deleted_count": int(deleted_count or 0),
+        "total_amount": int(total_amount or 0),
+        "deleted_transfers": int(deleted_transfers or 0),
+    }
+
+
+def group_dates_by_month(start_date, end_date):
+    """
+    기간의 날짜를 월별로 묶습니다.
+    월간 한도 누적액이 같은 달의 앞선 날짜 결과에 의존하므로 같은 달은 순서대로,
+    서로 다른 달은 독립적으로 처리할 수 있습니다.
+
+    Returns:
+        dict: (연, 월) → 날짜 목록 (오름차순)
+    """
+    months = defaultdict(list)
+    current = start_date
+    while current <= end_date:
+        months[(current.year, current.month)].append(current)
+        current += timedelta(days=1)
+    return dict(months)
+
+
+def _init_worker():
+    """워커 프로세스 시작 시 부모에게서 물려받은 연결 풀을 버리고 새 연결을 사용하도록 합니다."""
+    engine.dispose(close=False)
+
+
+def run_backfill_month(dates, progress, chunk_size=None):
+    """
+    한 달 안의 날짜들을 오름차순으로 이어서 다시 계산합니다. (날짜마다 커밋)
+    날짜 하나가 끝날 때마다 progress 큐에 결과를 넣습니다.
+
+    Args:
+        dates (list): 같은 달의 날짜 목록 (오름차순)
+        progress (Queue): 진행 상황을 받을 큐
+        chunk_size (int, optional): INSERT 청크당 행 수
+
+    Returns:
+        list: 날짜별 처리 결과 요약
+    """
+    session = SessionLocal()
+    results = []
+    try:
+        for game_date in dates:
+            result = process_savings_for_date_bulk(game_date, session, chunk_size=chunk_size)
+            results.append(result)
+            progress.put({
+                "date": game_date.isoformat(),
+                "total_saved": result["total_saved"],
+                "savings_count": result["savings_count"],
+            })
+        return results
+    finally:
+        session.close()
+
+
+class BackfillCheckpoint:
+    """
+    완료한 날짜를 JSON 파일에 기록해 중단된 백필을 이어서 실행할 수 있게 합니다.
+    모든 날짜를 끝낸 백필은 체크포인트를 삭제하므로, 같은 기간을 나중에 다시 실행하면 처음부터 다시 계산합니다.
+    """
+
+    def __init__(self, path, start_date, end_date):
+        self.path = path
+        self.start_date = start_date
+        self.end_date = end_date
+        self.completed = set()
+
+    @classmethod
+    def load(cls, path, start_date, end_date):
+        checkpoint = cls(path, start_date, end_date)
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("start_date") != start_date.isoformat() or data.get("end_date") != end_date.isoformat():
+                logger.warning(f"체크포인트 기간이 달라 무시합니다: {path}")
+            elif len(data.get("completed", [])) >= (end_date - start_date).days + 1:
+                # 삭제되지 못한 끝난 백필의 체크포인트 - 새로 실행하는 백필로 보고 처음부터 처리
+                logger.warning(f"모든 날짜를 끝낸 체크포인트라 무시합니다: {path}")
+            else:
+                checkpoint.completed = set(data.get("completed", []))
+        return checkpoint
+
+    def is_done(self, game_date):
+        return game_date.isoformat() in self.completed
+
+    def mark_done(self, date_str):
+        self.completed.add(date_str)
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        data = {
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat(),
+            "completed": sorted(self.completed),
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        # 쓰는 도중 중단되어도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+    def remove(self):
+        """백필이 끝나면 체크포인트 파일 삭제"""
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def backfill_savings(start_date, end_date, workers=None, checkpoint_path=None, resume=True, chunk_size=None):
+    """
+    기간의 적금 적립 내역을 지우고 다시 계산합니다.
+
+    1. 체크포인트에서 이미 끝난 날짜를 제외합니다. (resume=False면 처음부터)
+    2. 남은 날짜의 DailySaving / DailyTransfer를 집합 기반 문장으로 한 번에 삭제합니다.
+    3. 달마다 워커 프로세스 하나를 배정해 병렬로, 같은 달 안에서는 날짜 순서대로 bulk 모드로 다시 계산합니다.
+    4. 날짜가 끝날 때마다 진행 상황을 출력하고 체크포인트에 기록합니다.
+
+    실패한 달이 있거나 중간에 끊긴 백필은 같은 기간으로 다시 실행하면 남은 날짜만 이어서 처리합니다.
+    (삭제와 재계산 모두 날짜 단위로 멱등이므로 중간에 끊긴 날짜도 그대로 다시 처리하면 됩니다.)
+    모든 날짜를 끝내면 체크포인트를 삭제하므로, 같은 기간을 나중에 다시 실행하면 전체를 다시 계산합니다.
+
+    Args:
+        start_date (date): 시작일
+        end_date (date): 종료일
+        workers (int, optional): 워커 프로세스 수. 기본값은 min(달 수, CPU 수)
+        checkpoint_path (str, optional): 체크포인트 파일 경로. 기본값은 saving_backfill_<시작일>_<종료일>.json
+        resume (bool): 체크포인트의 완료 날짜를 건너뛸지 여부
+        chunk_size (int, optional): INSERT 청크당 행 수
+
+    Returns:
+        dict: 처리 결과 요약
+    """
+    if start_date > end_date:
+        raise ValueError("시작일이 종료일보다 늦습니다")
+    if checkpoint_path is None:
+        checkpoint_path = f"saving_backfill_{start_date.isoformat()}_{end_date.isoformat()}.json"
+
+    checkpoint = BackfillCheckpoint.load(checkpoint_path, start_date, end_date) if resume \
+        else BackfillCheckpoint(checkpoint_path, start_date, end_date)
+
+    months = {}
+    for month, dates in group_dates_by_month(start_date, end_date).items():
+        pending_dates = [d for d in dates if not checkpoint.is_done(d)]
+        if pending_dates:
+            months[month] = pending_dates
+    total_dates = (end_date - start_date).days + 1
+    pending_count = sum(len(dates) for dates in months.values())
+    done_count = total_dates - pending_count
+
+    print(f"[백필] {start_date} ~ {end_date}: 전체 {total_dates}일, 남은 날짜 {pending_count}일 ({len(months)}개월)")
+    if not months:
+        return {"start_date": start_date, "end_date": end_date, "processed_dates": 0,
+                "total_saved": 0, "failed_months": [], "checkpoint": checkpoint_path}
+
+    # 1. 남은 날짜의 기존 내역 일괄 삭제
+    session = SessionLocal()
+    try:
+        cleared = clear_savings_for_dates(session, [d for dates in months.values() for d in dates])
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+    print(f"[백필] 기존 내역 삭제: 적립 {cleared['deleted_count']}건 ({cleared['total_amount']}원), "
+          f"출금 예정 {cleared['deleted_transfers']}건")
+    checkpoint.save()
+
+    # 2. 달별 병렬 재계산
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(int(workers), len(months)))
+    started = time.monotonic()
+    total_saved = 0
+    processed = 0
+    failed_months = []
+
+    def report(item):
+        nonlocal total_saved, processed
+        processed += 1
+        total_saved += item["total_saved"]
+        checkpoint.mark_done(item["date"])
+        finished = done_count + processed
+        print(f"[백필] {item['date']} 완료 ({finished}/{total_dates}, {finished / total_dates * 100:.1f}%) "
+              f"적립 {item['total_saved']}원 {item['savings_count']}건, 경과 {time.monotonic() - started:.1f}초")
+
+    if workers == 1:
+        progress = queue.Queue()
+        for month, dates in sorted(months.items()):
+            try:
+                run_backfill_month(dates, progress, chunk_size)
+            except Exception as e:
+                logger.error(f"[백필] {month[0]}-{month[1]:02d} 처리 실패: {str(e)}")
+                failed_months.append(f"{month[0]}-{month[1]:02d}")
+            while not progress.empty():
+                report(progress.get())
+    else:
+        # 스케줄러 스레드에서 fork하지 않도록 spawn 방식 사용
+        context = multiprocessing.get_context("spawn")
+        with context.Manager() as manager:
+            progress = manager.Queue()
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as executor:
+                futures = {
+                    executor.submit(run_backfill_month, dates, progress, chunk_size): month
+                    for month, dates in sorted(months.items())
+                }
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+                    while not progress.empty():
+                        report(progress.get())
+                    for future in done:
+                        month = futures[future]
+                        try:
+                            future.result()
+                        except Exception as e:
+                            logger.error(f"[백필] {month[0]}-{month[1]:02d} 처리 실패: {str(e)}")
+                            failed_months.append(f"{month[0]}-{month[1]:02d}")
+                while not progress.empty():
+                    report(progress.get())
+
+    result = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "processed_dates": processed,
+        "total_saved": total_saved,
+        "failed_months": sorted(failed_months),
+        "checkpoint": checkpoint_path,
+        "elapsed_seconds": round(time.monotonic() - started, 1),
+    }
+    print(f"[백필] 완료: {processed}일 재계산, 총 {total_saved}원, 실패한 달 {result['failed_months']}, "
+          f"{result['elapsed_seconds']}초")
+    if failed_months:
+        print(f"[백필] 같은 명령을 다시 실행하면 남은 날짜부터 이어서 처리합니다 (체크포인트: {checkpoint_path})")
+    else:
+        # 모든 날짜 완료 - 이후 같은 기간을 다시 실행하면 처음부터 계산하도록 체크포인트 삭제
+        checkpoint.remove()
+        result["checkpoint"] = None
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='기간별 적금 적립 내역 재계산 (백필)')
+    parser.add_argument('--start', type=str, required=True, help='시작일 (YYYY-MM-DD)')
+    parser.add_argument('--end', type=str, help='종료일 (YYYY-MM-DD, 기본값: 어제)')
+    parser.add_argument('--workers', type=int, help='워커 프로세스 수 (기본값: min(달 수, CPU 수))')
+    parser.add_argument('--checkpoint', type=str, help='체크포인트 파일 경로')
+    parser.add_argument('--restart', action='store_true', help='체크포인트를 무시하고 처음부터 다시 처리')
+    parser.add_argument('--chunk-size', type=int, help='INSERT 청크당 행 수')
+
+    args = parser.parse_args()
+
+    try:
+        start = date.fromisoformat(args.start)
+        end = date.fromisoformat(args.end) if args.end else date.today() - timedelta(days=1)
+    except ValueError:
+        print("날짜 형식이 잘못되었습니다. YYYY-MM-DD 형식으로 입력하세요.")
+        sys.exit(1)
+
+    backfill_savings(start, end, workers=args.workers, checkpoint_path=args.checkpoint,
+                     resume=not args.restart, chunk_size=args.chunk_size)
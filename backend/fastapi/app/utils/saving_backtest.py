@@ -0,0 +1,302 @@
+# utils/saving_backtest.py
+import os
+import time
+import logging
+import threading
+from collections import defaultdict
+from datetime import date
+
+import numpy as np
+from sqlalchemy import func
+
+import models
+from utils.rule_index import (
+    BASIC_RULE_TYPE_NAME, OPPONENT_RULE_TYPE_NAME,
+    SUBJECT_TEAM, SUBJECT_OPPONENT, SUBJECT_PLAYER
+)
+from utils.series_analysis import WIN_RECORD_TYPE_ID, find_series
+
+logger = logging.getLogger(__name__)
+
+SWEEP_RECORD_TYPE_ID = 7
+
+# 시즌 기록 캐시 유지 시간(초). 경기 로그/선수 기록 저장 작업 후에는 바로 비움
+BACKTEST_CACHE_TTL = int(os.getenv("BACKTEST_CACHE_TTL", "600"))
+
+
+def rule_subject(rule_type_name, player_id=None):
+    """
+    규칙이 반응하는 대상 구분을 반환합니다. (rule_index.rule_index_key()와 같은 기준)
+    선수 ID가 있으면 선수 규칙, 없으면 규칙 타입에 따라 기본 규칙/상대팀 규칙, 그 외는 None.
+    """
+    if player_id is not None:
+        return SUBJECT_PLAYER
+    if rule_type_name == BASIC_RULE_TYPE_NAME:
+        return SUBJECT_TEAM
+    if rule_type_name == OPPONENT_RULE_TYPE_NAME:
+        return SUBJECT_OPPONENT
+    return None
+
+
+class SeasonHistory:
+    """
+    한 시즌의 GameLog / PlayerRecord / GameSchedule을 날짜 × 기록 유형 배열로 펼쳐 둔 것.
+
+    - team_counts[팀 ID, 날짜, 기록 유형]: 팀 기록 COUNT 합 (마지막 팀 인덱스는 빈 행)
+    - opponents[팀 ID, 날짜, k]: 그날 k번째 상대팀 ID (경기가 없으면 빈 행 인덱스)
+    - sweeps[팀 ID, 날짜]: 그날 시리즈 분석 기준 스윕 여부
+    - player_counts[선수 인덱스, 날짜, 기록 유형]: 선수 기록 COUNT 합
+    """
+
+    def __init__(self, season, dates, team_counts, opponents, sweeps, player_index, player_counts):
+        self.season = season
+        self.dates = dates
+        self.date_values = np.array(dates, dtype="datetime64[D]")
+        self.months = np.array([d.month for d in dates], dtype=np.int64)
+        self.team_counts = team_counts
+        self.opponents = opponents
+        self.sweeps = sweeps
+        self.player_index = player_index
+        self.player_counts = player_counts
+        self.empty_team = team_counts.shape[0] - 1
+
+    @classmethod
+    def load(cls, session, season):
+        """
+        시즌 기록을 테이블마다 한 번씩 조회해 배열로 만듭니다.
+
+        Args:
+            session (Session): SQLAlchemy 세션
+            season (int): 시즌 연도
+
+        Returns:
+            SeasonHistory: 시즌 기록 배열
+        """
+        season_start = date(season, 1, 1)
+        season_end = date(season, 12, 31)
+
+        schedule = session.query(
+            models.GameSchedule.DATE, models.GameSchedule.HOME_TEAM_ID, models.GameSchedule.AWAY_TEAM_ID
+        ).filter(
+            models.GameSchedule.DATE >= season_start,
+            models.GameSchedule.DATE <= season_end
+        ).order_by(models.GameSchedule.DATE, models.GameSchedule.GAME_SCHEDULE_KEY).all()
+
+        team_rows = session.query(
+            models.GameLog.DATE, models.GameLog.TEAM_ID, models.GameLog.RECORD_TYPE_ID, func.sum(models.GameLog.COUNT)
+        ).filter(
+            models.GameLog.DATE >= season_start,
+            models.GameLog.DATE <= season_end
+        ).group_by(models.GameLog.DATE, models.GameLog.TEAM_ID, models.GameLog.RECORD_TYPE_ID).all()
+
+        player_rows = session.query(
+            models.PlayerRecord.DATE, models.PlayerRecord.PLAYER_ID, models.PlayerRecord.RECORD_TYPE_ID,
+            func.sum(models.PlayerRecord.COUNT)
+        ).filter(
+            models.PlayerRecord.DATE >= season_start,
+            models.PlayerRecord.DATE <= season_end
+        ).group_by(models.PlayerRecord.DATE, models.PlayerRecord.PLAYER_ID, models.PlayerRecord.RECORD_TYPE_ID).all()
+
+        # 축 만들기: 날짜 / 팀 / 기록 유형 / 선수
+        dates = sorted(
+            {row[0] for row in schedule} | {row[0] for row in team_rows} | {row[0] for row in player_rows}
+        )
+        date_pos = {d: i for i, d in enumerate(dates)}
+        team_ids = (
+            {row[1] for row in schedule} | {row[2] for row in schedule} | {row[1] for row in team_rows}
+        )
+        num_teams = max(team_ids, default=0) + 2  # 마지막 인덱스는 빈 행
+        num_record_types = max(
+            [SWEEP_RECORD_TYPE_ID] + [row[2] for row in team_rows] + [row[2] for row in player_rows]
+        ) + 1
+        player_ids = sorted({row[1] for row in player_rows})
+        player_index = {player_id: i for i, player_id in enumerate(player_ids)}
+
+        # 팀 기록
+        team_counts = np.zeros((num_teams, len(dates), num_record_types), dtype=np.int64)
+        if team_rows:
+            np.add.at(team_counts, (
+                np.array([row[1] for row in team_rows]),
+                np.array([date_pos[row[0]] for row in team_rows]),
+                np.array([row[2] for row in team_rows])
+            ), np.array([int(row[3] or 0) for row in team_rows]))
+
+        # 선수 기록
+        player_counts = np.zeros((len(player_ids), len(dates), num_record_types), dtype=np.int64)
+        if player_rows:
+            np.add.at(player_counts, (
+                np.array([player_index[row[1]] for row in player_rows]),
+                np.array([date_pos[row[0]] for row in player_rows]),
+                np.array([row[2] for row in player_rows])
+            ), np.array([int(row[3] or 0) for row in player_rows]))
+
+        # 날짜별 상대팀 (중복 제거, 일정 순서 유지)
+        team_games = defaultdict(list)
+        opponents_by_day = defaultdict(list)
+        for game_day, home_team_id, away_team_id in schedule:
+            team_games[home_team_id].append((game_day, away_team_id))
+            team_games[away_team_id].append((game_day, home_team_id))
+            for team_id, opponent_id in ((home_team_id, away_team_id), (away_team_id, home_team_id)):
+                if opponent_id not in opponents_by_day[(team_id, game_day)]:
+                    opponents_by_day[(team_id, game_day)].append(opponent_id)
+
+        max_opponents = max((len(v) for v in opponents_by_day.values()), default=1)
+        opponents = np.full((num_teams, len(dates), max_opponents), num_teams - 1, dtype=np.int64)
+        for (team_id, game_day), opponent_ids in opponents_by_day.items():
+            opponents[team_id, date_pos[game_day], :len(opponent_ids)] = opponent_ids
+
+        # 스윕: 일정이 있는 날짜마다 시리즈 분석 (분석은 적재할 때 한 번만)
+        wins_by_team_date = {
+            (row[1], row[0]): int(row[3] or 0) for row in team_rows if row[2] == WIN_RECORD_TYPE_ID
+        }
+        sweeps = np.zeros((num_teams, len(dates)), dtype=bool)
+        for game_day in sorted({row[0] for row in schedule}):
+            _, day_sweeps, _ = find_series(team_games, wins_by_team_date, game_day)
+            for team_id in day_sweeps:
+                sweeps[team_id, date_pos[game_day]] = True
+
+        logger.info(
+            f"{season} 시즌 기록 적재: 날짜 {len(dates)}일, 팀 {len(team_ids)}개, "
+            f"선수 {len(player_ids)}명, 기록 유형 {num_record_types}개"
+        )
+        return cls(season, dates, team_counts, opponents, sweeps, player_index, player_counts)
+
+    def played(self, team_id):
+        """팀이 경기한 날짜 여부 배열"""
+        if not 0 <= team_id < self.empty_team:
+            return np.zeros(len(self.dates), dtype=bool)
+        return (self.opponents[team_id] != self.empty_team).any(axis=1)
+
+    def counts(self, subject, subject_id, team_id, record_type_id):
+        """규칙 대상의 날짜별 기록 횟수 배열을 반환합니다."""
+        num_dates = len(self.dates)
+        if not 0 <= record_type_id < self.team_counts.shape[2]:
+            return np.zeros(num_dates, dtype=np.int64)
+
+        if subject == SUBJECT_PLAYER:
+            position = self.player_index.get(subject_id)
+            if position is None:
+                return np.zeros(num_dates, dtype=np.int64)
+            return self.player_counts[position, :, record_type_id]
+
+        if not 0 <= team_id < self.empty_team:
+            return np.zeros(num_dates, dtype=np.int64)
+        if subject == SUBJECT_TEAM:
+            # 스윕은 경기 기록이 아니라 시리즈 분석 결과로 판정 (saving_engine과 동일)
+            if record_type_id == SWEEP_RECORD_TYPE_ID:
+                return self.sweeps[team_id].astype(np.int64)
+            return self.team_counts[team_id, :, record_type_id]
+        if subject == SUBJECT_OPPONENT:
+            day_index = np.arange(num_dates)[:, None]
+            return self.team_counts[self.opponents[team_id], day_index, record_type_id].sum(axis=1)
+        return np.zeros(num_dates, dtype=np.int64)
+
+
+class SeasonHistoryCache:
+    """시즌별 SeasonHistory를 TTL 동안 보관하는 프로세스 단위 캐시"""
+
+    def __init__(self, ttl=BACKTEST_CACHE_TTL):
+        self._lock = threading.RLock()
+        self._entries = {}  # season -> (loaded_at, SeasonHistory)
+        self.ttl = ttl
+
+    def get(self, session, season):
+        with self._lock:
+            entry = self._entries.get(season)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                return entry[1]
+            history = SeasonHistory.load(session, season)
+            self._entries[season] = (time.monotonic(), history)
+            return history
+
+    def invalidate(self):
+        """캐시를 비웁니다. (경기 로그/선수 기록이 새로 저장된 뒤 호출)"""
+        with self._lock:
+            self._entries = {}
+
+
+season_history_cache = SeasonHistoryCache()
+
+
+def _cap_by_limits(raw, months, daily_limit=None, month_limit=None):
+    """
+    날짜별 적립 예정액에 일일/월간 한도를 적용합니다.
+    규칙마다 남은 한도만큼 잘라 적립하는 기존 방식과 합계가 같도록,
+    하루 총액을 일일 한도로 자른 뒤 월 누적액이 월간 한도를 넘는 부분만 잘라냅니다.
+    """
+    capped = raw if daily_limit is None else np.minimum(raw, max(0, daily_limit))
+    if month_limit is None or len(capped) == 0:
+        return capped
+
+    cumulative = np.cumsum(capped)
+    # 월이 바뀌는 지점마다 누적액을 다시 0부터 계산
+    month_starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    offsets = np.repeat(
+        np.r_[0, cumulative[month_starts[1:] - 1]],
+        np.diff(np.r_[month_starts, len(capped)])
+    )
+    month_cumulative = np.minimum(cumulative - offsets, max(0, month_limit))
+    previous = np.r_[0, month_cumulative[:-1]]
+    previous[month_starts] = 0
+    return month_cumulative - previous
+
+
+def run_backtest(history, team_id, rules, daily_limit=None, month_limit=None,
+                 favorite_player_id=None, start_date=None, end_date=None):
+    """
+    후보 규칙 묶음을 시즌 기록에 적용해 날짜별/전체 예상 적립액을 계산합니다.
+
+    Args:
+        history (SeasonHistory): 시즌 기록 배열
+        team_id (int): 응원팀 ID
+        rules (list): dict 목록 {"subject", "record_type_id", "amount", "player_id"}
+        daily_limit (int, optional): 일일 한도. None이면 제한 없음
+        month_limit (int, optional): 월간 한도. None이면 제한 없음
+        favorite_player_id (int, optional): 선수 ID가 없는 선수 규칙에 사용할 선수
+        start_date (date, optional): 시작일. 기본값은 시즌 첫 날
+        end_date (date, optional): 종료일. 기본값은 시즌 마지막 날
+
+    Returns:
+        dict: 날짜별 적립액, 규칙별 적립 예정액, 합계
+    """
+    started = time.perf_counter()
+    num_dates = len(history.dates)
+
+    raw = np.zeros(num_dates, dtype=np.int64)
+    rule_totals = []
+    in_range = np.ones(num_dates, dtype=bool)
+    if start_date is not None:
+        in_range &= history.date_values >= np.datetime64(start_date)
+    if end_date is not None:
+        in_range &= history.date_values <= np.datetime64(end_date)
+
+    for rule in rules:
+        subject_id = rule.get("player_id") or favorite_player_id
+        subject = rule["subject"]
+        if subject == SUBJECT_PLAYER and subject_id is None:
+            rule_totals.append(0)
+            continue
+        counts = history.counts(subject, subject_id, team_id, rule["record_type_id"])
+        amounts = np.where(in_range, np.maximum(counts, 0) * int(rule["amount"]), 0)
+        raw += amounts
+        rule_totals.append(int(amounts.sum()))
+
+    capped = _cap_by_limits(raw, history.months, daily_limit, month_limit)
+
+    # 응원팀 경기일 또는 적립이 발생한 날짜만 반환
+    shown = in_range & (history.played(team_id) | (raw > 0))
+    days = [
+        {"date": history.dates[i], "raw_amount": int(raw[i]), "amount": int(capped[i])}
+        for i in np.flatnonzero(shown)
+    ]
+
+    return {
+        "season": history.season,
+        "team_id": team_id,
+        "days": days,
+        "rule_totals": rule_totals,
+        "raw_total_amount": int(raw.sum()),
+        "total_amount": int(capped.sum()),
+        "game_days": int((in_range & history.played(team_id)).sum()),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,313 @@
+# utils/saving_engine.py
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy.orm import sessionmaker
+
+import models
+from database import engine
+from utils.account_stream import JobMemory
+from utils.bulk_insert import insert_in_chunks
+from utils.limit_ledger import LimitLedger
+from utils.series_analysis import analyze_series
+from utils.rule_index import RuleIndex, SUBJECT_TEAM, SUBJECT_OPPONENT, SUBJECT_PLAYER
+
+logger = logging.getLogger(__name__)
+
+# 기록 유형 ID (DB/init_setting 기준)
+SWEEP_RECORD_TYPE_ID = 7
+
+# DailyTransfer 기본 문구
+DAILY_TRANSFER_TEXT = "출금예정!!"
+
+
+def _filter_accounts(query, column, account_filter):
+    """account_filter가 있으면 계정 ID 컬럼에 대한 조건을 추가합니다."""
+    if account_filter is None:
+        return query
+    return query.filter(account_filter(column))
+
+
+def load_saving_inputs(session, game_date, account_filter=None):
+    """
+    적립금 계산에 필요한 하루치 입력 데이터를 몇 개의 집합 쿼리로 한 번에 불러옵니다.
+
+    Args:
+        session (Session): SQLAlchemy 세션
+        game_date (date): 처리할 게임 날짜
+        account_filter (callable, optional): 계정 ID 컬럼을 받아 조건식을 반환하는 함수.
+            지정하면 해당 계정들만 불러옵니다. (샤드 처리용)
+
+    Returns:
+        dict: 팀/선수 기록, 시리즈 분석, 계정, 사용자 규칙, 이체 누적액 등
+    """
+    # 1. 팀별 기록 통계
+    team_stats = {}
+    for team_id, record_type_id, count in session.query(
+        models.GameLog.TEAM_ID, models.GameLog.RECORD_TYPE_ID, models.GameLog.COUNT
+    ).filter(
+        models.GameLog.DATE == game_date
+    ).order_by(models.GameLog.GAME_LOG_ID).all():
+        team_stats.setdefault(team_id, {})[record_type_id] = count
+
+    # 2. 선수별 기록 통계
+    player_stats = {}
+    for player_id, team_id, record_type_id, count in session.query(
+        models.PlayerRecord.PLAYER_ID, models.PlayerRecord.TEAM_ID,
+        models.PlayerRecord.RECORD_TYPE_ID, models.PlayerRecord.COUNT
+    ).filter(
+        models.PlayerRecord.DATE == game_date
+    ).order_by(models.PlayerRecord.PLAYER_RECORD_ID).all():
+        if player_id not in player_stats:
+            player_stats[player_id] = {'team_id': team_id, 'records': {}}
+        player_stats[player_id]['records'][record_type_id] = count
+
+    # 3. 팀별 시리즈 분석 (스윕 여부, 오늘 상대팀) - 날짜당 한 번
+    series = analyze_series(session, game_date)
+
+    # 4. 모든 계정의 한도 (필요한 컬럼만)
+    accounts = {
+        account.ACCOUNT_ID: account
+        for account in _filter_accounts(session.query(
+            models.Account.ACCOUNT_ID, models.Account.TEAM_ID,
+            models.Account.DAILY_LIMIT, models.Account.MONTH_LIMIT
+        ), models.Account.ACCOUNT_ID, account_filter).all()
+    }
+
+    # 5. 사용자 규칙 역색인 - 작업마다 DB에서 새로 만듦 (쿼리 한 번, 샤드는 자기 계정만)
+    # 프로세스 전역 색인(rule_index.rule_index)은 이 프로세스의 CRUD로만 갱신되므로,
+    # SQL 스크립트/다른 프로세스에서 바뀐 규칙을 놓치지 않도록 일일 작업에서는 사용하지 않음
+    index = RuleIndex.compile(session, account_filter)
+
+    # 6. 해당 날짜에 이미 처리된 규칙 (중복 방지용)
+    processed_rules = set(_filter_accounts(session.query(
+        models.DailySaving.ACCOUNT_ID,
+        models.DailySaving.SAVING_RULED_DETAIL_ID,
+        models.DailySaving.SAVING_RULED_TYPE_ID
+    ).filter(
+        models.DailySaving.DATE == game_date
+    ), models.DailySaving.ACCOUNT_ID, account_filter).all())
+
+    # 7. 계정별 이미 이체된 금액 (일간/월간) - 한도 장부 (날짜 구간별 GROUP BY 한 번씩)
+    ledger = LimitLedger.load(session, game_date, source="transfer", account_filter=account_filter)
+
+    return {
+        "team_stats": team_stats,
+        "player_stats": player_stats,
+        "series": series,
+        "accounts": accounts,
+        "rule_index": index,
+        "processed_rules": {tuple(key) for key in processed_rules},
+        "ledger": ledger,
+    }
+
+
+def _collect_rule_hits(inputs):
+    """
+    하루치 이벤트(팀 기록, 스윕, 상대팀 기록, 선수 기록)에서 규칙 색인을 따라가
+    영향을 받는 계정의 (정렬 키, 규칙, 횟수) 목록을 모읍니다.
+    """
+    team_stats = inputs["team_stats"]
+    player_stats = inputs["player_stats"]
+    opponents_today = inputs["series"]["opponents_today"]
+    sweeps = inputs["series"]["sweeps"]
+    index = inputs["rule_index"]
+
+    hits_by_account = defaultdict(list)
+
+    def fan_out(subject, subject_id, record_type_id, count, order=0):
+        for entry in index.subscribers(subject, subject_id, record_type_id):
+            # 기존 처리 순서: 팀 규칙 → 선수 규칙, 같은 구분에서는 규칙 ID 순, 상대팀은 경기 일정 순
+            sort_key = (entry.player_id is not None, entry.user_rule_id, order)
+            hits_by_account[entry.account_id].append((sort_key, entry, count))
+
+    # 기본 규칙 - 응원팀 기록 (스윕은 경기 기록이 아니라 시리즈 분석 결과로 판정)
+    for team_id, records in team_stats.items():
+        for record_type_id, count in records.items():
+            if record_type_id != SWEEP_RECORD_TYPE_ID and count > 0:
+                fan_out(SUBJECT_TEAM, team_id, record_type_id, count)
+    for team_id in sweeps:
+        fan_out(SUBJECT_TEAM, team_id, SWEEP_RECORD_TYPE_ID, 1)
+
+    # 상대팀 규칙 - 응원팀의 오늘 상대팀 기록
+    for team_id, opponents in opponents_today.items():
+        for order, opposing_team_id in enumerate(opponents):
+            for record_type_id, count in team_stats.get(opposing_team_id, {}).items():
+                if count > 0:
+                    fan_out(SUBJECT_OPPONENT, team_id, record_type_id, count, order)
+
+    # 선수 규칙
+    for player_id, stats in player_stats.items():
+        for record_type_id, count in stats['records'].items():
+            if count > 0:
+                fan_out(SUBJECT_PLAYER, player_id, record_type_id, count)
+
+    return hits_by_account
+
+
+def compute_daily_savings(game_date, inputs):
+    """
+    불러온 입력 데이터만으로 DailySaving 행과 DailyTransfer 총액을 계산합니다.
+    그날 발생한 이벤트에서 규칙 색인을 따라가 영향을 받는 계정만 평가하며,
+    규칙 적용 순서(팀 규칙 → 선수 규칙)와 한도 조정 방식은 기존 처리와 동일합니다.
+
+    Args:
+        game_date (date): 처리할 게임 날짜
+        inputs (dict): load_saving_inputs()의 결과
+
+    Returns:
+        dict: DailySaving 행 목록, 계정별 일일 총액, 집계 정보
+    """
+    processed_rules = set(inputs["processed_rules"])
+    # 입력을 재사용할 수 있도록 장부는 복사해서 누적
+    ledger = inputs["ledger"].copy()
+    accounts = inputs["accounts"]
+
+    saving_rows = []
+    account_daily_totals = {}
+    total_saved = 0
+    processed_accounts = 0
+    savings_count = 0
+    skipped_count = 0
+    now = datetime.now()
+
+    hits_by_account = _collect_rule_hits(inputs)
+
+    for account_id in sorted(hits_by_account):
+        account = accounts.get(account_id)
+        if account is None:
+            continue
+
+        account_total_saved = 0
+        account_savings_count = 0
+        checked_rules = set()
+        skipped_rules = set()
+
+        for _, entry, count in sorted(hits_by_account[account_id], key=lambda hit: hit[0]):
+            rule_key = (account_id, entry.rule_detail_id, entry.rule_type_id)
+
+            # 규칙마다 첫 적립 전에 한 번만 중복 여부 확인 (상대팀 규칙은 여러 건이 나올 수 있음)
+            if entry.user_rule_id not in checked_rules:
+                checked_rules.add(entry.user_rule_id)
+                if rule_key in processed_rules:
+                    skipped_rules.add(entry.user_rule_id)
+                    skipped_count += 1
+            if entry.user_rule_id in skipped_rules:
+                continue
+
+            saving_amount = ledger.cap(
+                account_id, entry.amount * count,
+                account.DAILY_LIMIT, account.MONTH_LIMIT
+            )
+            if saving_amount <= 0:
+                logger.debug(f"계정 ID {account_id}: 한도 초과로 규칙 {entry.rule_detail_id} 적립을 건너뜁니다.")
+                continue
+
+            ledger.record(account_id, saving_amount)
+
+            saving_rows.append({
+                "ACCOUNT_ID": account_id,
+                "DATE": game_date,
+                "SAVING_RULED_DETAIL_ID": entry.rule_detail_id,
+                "SAVING_RULED_TYPE_ID": entry.rule_type_id,
+                "COUNT": count,
+                "DAILY_SAVING_AMOUNT": saving_amount,
+                "created_at": now
+            })
+            processed_rules.add(rule_key)
+
+            account_total_saved += saving_amount
+            account_savings_count += 1
+            account_daily_totals[account_id] = account_daily_totals.get(account_id, 0) + saving_amount
+
+        if account_total_saved > 0:
+            total_saved += account_total_saved
+            processed_accounts += 1
+            savings_count += account_savings_count
+
+    return {
+        "saving_rows": saving_rows,
+        "account_daily_totals": account_daily_totals,
+        "total_saved": total_saved,
+        "processed_accounts": processed_accounts,
+        "savings_count": savings_count,
+        "skipped_count": skipped_count,
+    }
+
+
+def process_savings_for_date_bulk(game_date=None, session=None, account_filter=None, chunk_size=None):
+    """
+    process_savings_for_date의 집합 기반(bulk) 모드입니다.
+    하루치 입력을 몇 개의 조인/집계 쿼리로 불러와 메모리에서 모든 계정의 적립금을 계산한 뒤
+    DailySaving / DailyTransfer를 일괄 저장합니다.
+
+    Args:
+        game_date (date, optional): 처리할 게임 날짜. 기본값은 어제.
+        session (Session, optional): SQLAlchemy 세션. None이면 새 세션을 생성합니다.
+        account_filter (callable, optional): 처리할 계정 범위 조건 (load_saving_inputs 참고)
+        chunk_size (int, optional): INSERT 청크당 행 수. 기본값은 BULK_INSERT_CHUNK_SIZE (1000)
+
+    Returns:
+        dict: 처리 결과 요약 정보 (process_savings_for_date와 동일한 형식)
+    """
+    if game_date is None:
+        game_date = datetime.now().date() - timedelta(days=1)
+
+    close_session = False
+    if session is None:
+        Session = sessionmaker(bind=engine)
+        session = Session()
+        close_session = True
+
+    try:
+        logger.info(f"[{game_date}] 적금 규칙에 따른 적립금 처리 시작 (bulk 모드)...")
+        memory = JobMemory()
+
+        inputs = load_saving_inputs(session, game_date, account_filter)
+        memory.sample()
+        logger.info(f"[{game_date}] 이미 처리된 규칙 수: {len(inputs['processed_rules'])}")
+
+        computed = compute_daily_savings(game_date, inputs)
+        account_daily_totals = computed["account_daily_totals"]
+        memory.sample()
+
+        now = datetime.now()
+        transfer_rows = [
+            {
+                "ACCOUNT_ID": account_id,
+                "DATE": game_date,
+                "AMOUNT": total_amount,
+                "created_at": now,
+                "TEXT": DAILY_TRANSFER_TEXT
+            }
+            for account_id, total_amount in account_daily_totals.items()
+        ]
+
+        # ORM 객체 없이 청크 단위 다중 행 INSERT
+        insert_in_chunks(session, models.DailySaving, computed["saving_rows"], chunk_size)
+        insert_in_chunks(session, models.DailyTransfer, transfer_rows, chunk_size)
+        session.commit()
+
+        result = {
+            "game_date": game_date,
+            "total_saved": computed["total_saved"],
+            "processed_accounts": computed["processed_accounts"],
+            "savings_count": computed["savings_count"],
+            "teams_count": len(inputs["team_stats"]),
+            "players_count": len(inputs["player_stats"]),
+            "daily_transfers": len(account_daily_totals),
+            **memory.summary()
+        }
+
+        logger.info(f"[{game_date}] 적립 처리 완료 (bulk 모드): {result['processed_accounts']}개 계정, "
+                    f"총 {result['total_saved']}원 적립 ({result['savings_count']}건), "
+                    f"이체 {result['daily_transfers']}건, 중복 건너뜀 {computed['skipped_count']}건")
+        return result
+
+    except Exception as e:
+        session.rollback()
+        logger.error(f"오류 발생: {str(e)}", exc_info=True)
+        raise
+    finally:
+        if close_session:
+            session.close()
@@ -0,0 +1,189 @@
+# utils/saving_shards.py
+import os
+import sys
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import func
+
+# 현재 스크립트 위치 기준으로 절대 경로 구성
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+import models
+from database import engine, SessionLocal
+from utils.saving_engine import process_savings_for_date_bulk
+
+logger = logging.getLogger(__name__)
+
+SHARD_STRATEGIES = ("hash", "range")
+
+# 샤드 결과 병합 시 더하는 항목 / 샤드와 무관하게 날짜 단위로 같은 항목
+SUMMED_KEYS = ("total_saved", "processed_accounts", "savings_count", "daily_transfers")
+SHARED_KEYS = ("teams_count", "players_count")
+
+
+def plan_shards(num_shards, strategy="hash", session=None):
+    """
+    계정을 나눌 샤드 목록을 만듭니다.
+
+    Args:
+        num_shards (int): 샤드 수
+        strategy (str): "hash"는 ACCOUNT_ID % N, "range"는 ACCOUNT_ID 구간 분할
+        session (Session, optional): range 전략에서 ACCOUNT_ID 범위 조회에 사용할 세션
+
+    Returns:
+        list: 샤드 정보 dict 목록 (프로세스 간 전달 가능한 값만 포함)
+    """
+    if strategy not in SHARD_STRATEGIES:
+        raise ValueError(f"지원하지 않는 샤드 전략입니다: {strategy}")
+    num_shards = max(1, int(num_shards))
+
+    if strategy == "hash":
+        return [
+            {"shard_index": index, "strategy": "hash", "num_shards": num_shards}
+            for index in range(num_shards)
+        ]
+
+    close_session = False
+    if session is None:
+        session = SessionLocal()
+        close_session = True
+    try:
+        min_id, max_id = session.query(
+            func.min(models.Account.ACCOUNT_ID), func.max(models.Account.ACCOUNT_ID)
+        ).one()
+    finally:
+        if close_session:
+            session.close()
+
+    if min_id is None:
+        return []
+
+    # 구간 크기 (올림) - 마지막 샤드가 max_id까지 포함하도록
+    span = (max_id - min_id + num_shards) // num_shards
+    shards = []
+    for index in range(num_shards):
+        start_id = min_id + index * span
+        if start_id > max_id:
+            break
+        end_id = min(max_id, start_id + span - 1)
+        shards.append({"shard_index": index, "strategy": "range", "start_id": start_id, "end_id": end_id})
+    return shards
+
+
+def shard_condition(shard):
+    """샤드 정보로 계정 ID 컬럼 조건을 만드는 함수를 반환합니다. (saving_engine의 account_filter 형식)"""
+    if shard["strategy"] == "hash":
+        return lambda column: column % shard["num_shards"] == shard["shard_index"]
+    return lambda column: column.between(shard["start_id"], shard["end_id"])
+
+
+def _init_worker():
+    """워커 프로세스 시작 시 부모에게서 물려받은 연결 풀을 버리고 새 연결을 사용하도록 합니다."""
+    engine.dispose(close=False)
+
+
+def run_saving_shard(game_date, shard, chunk_size=None):
+    """
+    샤드 하나를 처리합니다. 샤드마다 별도의 세션과 트랜잭션을 사용하므로
+    실패한 샤드는 다른 샤드에 영향 없이 그대로 다시 실행할 수 있습니다.
+
+    Args:
+        game_date (date): 처리할 게임 날짜
+        shard (dict): plan_shards()가 만든 샤드 정보
+        chunk_size (int, optional): INSERT 청크당 행 수
+
+    Returns:
+        dict: 샤드 처리 결과 요약 (shard_index 포함)
+    """
+    session = SessionLocal()
+    try:
+        result = process_savings_for_date_bulk(
+            game_date, session, account_filter=shard_condition(shard), chunk_size=chunk_size
+        )
+        result["shard_index"] = shard["shard_index"]
+        return result
+    finally:
+        session.close()
+
+
+def merge_shard_results(game_date, shard_results):
+    """샤드별 요약을 하나의 process_savings_for_date 형식 요약으로 합칩니다."""
+    merged = {"game_date": game_date}
+    for key in SUMMED_KEYS:
+        merged[key] = sum(result.get(key, 0) for result in shard_results)
+    for key in SHARED_KEYS:
+        merged[key] = max((result.get(key, 0) for result in shard_results), default=0)
+    return merged
+
+
+def process_savings_sharded(game_date=None, num_shards=None, strategy="hash", max_retries=1, shard_indexes=None,
+                            chunk_size=None):
+    """
+    계정을 ACCOUNT_ID 해시/범위로 나눠 여러 프로세스에서 적립금을 병렬 처리합니다.
+    각 샤드는 자신의 트랜잭션을 커밋하며, 실패한 샤드만 골라 다시 실행합니다.
+
+    Args:
+        game_date (date, optional): 처리할 게임 날짜. 기본값은 어제.
+        num_shards (int, optional): 샤드(워커 프로세스) 수. 기본값은 CPU 수.
+        strategy (str): "hash" 또는 "range"
+        max_retries (int): 실패한 샤드별 재시도 횟수
+        shard_indexes (list, optional): 지정하면 해당 번호의 샤드만 실행 (실패 샤드 수동 재실행용)
+        chunk_size (int, optional): 샤드별 INSERT 청크당 행 수
+
+    Returns:
+        dict: 병합된 처리 결과 요약. shards(성공한 샤드 번호), failed_shards(끝내 실패한 샤드 번호) 포함
+    """
+    if game_date is None:
+        game_date = datetime.now().date() - timedelta(days=1)
+    if num_shards is None:
+        num_shards = os.cpu_count() or 1
+
+    shards = plan_shards(num_shards, strategy)
+    if shard_indexes is not None:
+        selected = set(shard_indexes)
+        shards = [shard for shard in shards if shard["shard_index"] in selected]
+
+    logger.info(f"[{game_date}] 샤드 병렬 적립 처리 시작: {len(shards)}개 샤드 ({strategy})")
+
+    shard_results = []
+    pending = shards
+    attempt = 0
+    # 스케줄러 스레드에서 fork하지 않도록 spawn 방식 사용
+    context = multiprocessing.get_context("spawn")
+
+    while pending and attempt <= max_retries:
+        if attempt > 0:
+            logger.warning(f"[{game_date}] 실패한 샤드 재시도 ({attempt}/{max_retries}): "
+                           f"{[shard['shard_index'] for shard in pending]}")
+
+        # 회차마다 새 프로세스 풀 사용 (워커가 비정상 종료되면 BrokenProcessPool로 기존 풀에는 더 제출할 수 없음)
+        failed = []
+        with ProcessPoolExecutor(max_workers=max(1, len(pending)), mp_context=context,
+                                 initializer=_init_worker) as executor:
+            futures = {executor.submit(run_saving_shard, game_date, shard, chunk_size): shard for shard in pending}
+            for future, shard in futures.items():
+                try:
+                    shard_results.append(future.result())
+                except Exception as e:
+                    logger.error(f"[{game_date}] 샤드 {shard['shard_index']} 처리 실패: {str(e)}")
+                    failed.append(shard)
+
+        pending = failed
+        attempt += 1
+
+    result = merge_shard_results(game_date, shard_results)
+    result["shards"] = sorted(shard_result["shard_index"] for shard_result in shard_results)
+    result["failed_shards"] = [shard["shard_index"] for shard in pending]
+    # 샤드별 작업 메모리 증가량(워커 프로세스 RSS 기준) 중 가장 큰 값
+    result["rss_delta_mb"] = max(
+        (shard_result.get("rss_delta_mb") or 0 for shard_result in shard_results), default=None
+    )
+
+    logger.info(f"[{game_date}] 샤드 병렬 적립 처리 완료: {result['processed_accounts']}개 계정, "
+                f"총 {result['total_saved']}원 적립 ({result['savings_count']}건), "
+                f"실패 샤드 {result['failed_shards']}")
+    return result
@@ -0,0 +1,146 @@
+# utils/series_analysis.py
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from sqlalchemy import func
+
+import models
+
+logger = logging.getLogger(__name__)
+
+WIN_RECORD_TYPE_ID = 1
+
+# 시리즈를 거슬러 올라가 찾는 기간 (이동일/우천 취소로 하루 이틀 비는 경우 포함)
+SERIES_LOOKBACK_DAYS = 7
+# 시리즈가 기준일 이후에도 이어지는지 확인하는 기간
+SERIES_LOOKAHEAD_DAYS = 3
+# 스윕으로 인정하는 최소 경기 수 (기존 판정 기준: 동일 상대 3연승)
+SWEEP_MIN_GAMES = 3
+
+
+def analyze_series(session, game_date):
+    """
+    기준일에 경기한 모든 팀의 현재 시리즈(같은 상대와 연속으로 치른 경기 묶음)를 분석합니다.
+    일정과 승리 기록을 한 번씩만 조회하므로 비용은 계정 수가 아니라 팀 수에 비례합니다.
+
+    - 이동일 등으로 경기 사이에 빈 날짜가 있어도 상대가 같으면 같은 시리즈로 봅니다.
+    - 더블헤더는 같은 날짜의 경기 수만큼 시리즈 경기 수에 포함하고, 승리도 그날 COUNT 합으로 셉니다.
+    - 기준일 이후 일정에 같은 상대와의 경기가 남아 있으면 시리즈가 끝나지 않은 것으로 보고 스윕으로 인정하지 않습니다.
+
+    Args:
+        session (Session): SQLAlchemy 세션
+        game_date (date): 기준 날짜
+
+    Returns:
+        dict: {
+            "date": 기준 날짜,
+            "series": {팀 ID: 시리즈 정보 dict},
+            "sweeps": {스윕한 팀 ID: 상대팀 ID},
+            "opponents_today": {팀 ID: [기준일 상대팀 ID, ...]}
+        }
+    """
+    window_start = game_date - timedelta(days=SERIES_LOOKBACK_DAYS)
+    window_end = game_date + timedelta(days=SERIES_LOOKAHEAD_DAYS)
+
+    # 1. 구간 내 경기 일정 (날짜, 경기 키 순)
+    schedule = session.query(
+        models.GameSchedule.DATE, models.GameSchedule.HOME_TEAM_ID, models.GameSchedule.AWAY_TEAM_ID
+    ).filter(
+        models.GameSchedule.DATE >= window_start,
+        models.GameSchedule.DATE <= window_end
+    ).order_by(models.GameSchedule.DATE, models.GameSchedule.GAME_SCHEDULE_KEY).all()
+
+    # 팀별 (날짜, 상대팀) 목록
+    team_games = defaultdict(list)
+    for game_day, home_team_id, away_team_id in schedule:
+        team_games[home_team_id].append((game_day, away_team_id))
+        team_games[away_team_id].append((game_day, home_team_id))
+
+    # 2. 구간 내 팀별/날짜별 승리 수 (더블헤더는 COUNT 합)
+    wins_by_team_date = {}
+    for team_id, game_day, win_count in session.query(
+        models.GameLog.TEAM_ID, models.GameLog.DATE, func.sum(models.GameLog.COUNT)
+    ).filter(
+        models.GameLog.DATE >= window_start,
+        models.GameLog.DATE <= game_date,
+        models.GameLog.RECORD_TYPE_ID == WIN_RECORD_TYPE_ID
+    ).group_by(models.GameLog.TEAM_ID, models.GameLog.DATE).all():
+        wins_by_team_date[(team_id, game_day)] = int(win_count or 0)
+
+    series, sweeps, opponents_today = find_series(team_games, wins_by_team_date, game_date)
+    for team_id, opponent_id in sweeps.items():
+        logger.info(f"[{game_date}] 스윕 감지: 팀 {team_id}가 상대팀 {opponent_id}에 {series[team_id]['games']}연승")
+
+    return {
+        "date": game_date,
+        "series": series,
+        "sweeps": sweeps,
+        "opponents_today": opponents_today,
+    }
+
+
+def find_series(team_games, wins_by_team_date, game_date):
+    """
+    이미 불러온 일정/승리 기록으로 기준일의 팀별 시리즈를 계산합니다. (DB 조회 없음)
+
+    Args:
+        team_games (dict): 팀 ID → [(날짜, 상대팀 ID), ...] (날짜, 경기 키 순)
+        wins_by_team_date (dict): (팀 ID, 날짜) → 그날 승리 수
+        game_date (date): 기준 날짜
+
+    Returns:
+        tuple: (팀별 시리즈 정보, 스윕한 팀 → 상대팀, 팀별 기준일 상대팀 목록)
+    """
+    series = {}
+    sweeps = {}
+    opponents_today = {}
+
+    for team_id, games in team_games.items():
+        today_games = [opponent_id for game_day, opponent_id in games if game_day == game_date]
+        if not today_games:
+            continue
+
+        # 기준일 상대팀 (중복 제거, 일정 순서 유지)
+        opponents = []
+        for opponent_id in today_games:
+            if opponent_id not in opponents:
+                opponents.append(opponent_id)
+        opponents_today[team_id] = opponents
+
+        # 기준일 마지막 경기의 상대와의 시리즈를 거슬러 올라가며 찾음
+        opponent_id = today_games[-1]
+        past_games = [game for game in games if game[0] <= game_date]
+        series_dates = []
+        for game_day, game_opponent_id in reversed(past_games):
+            if game_opponent_id != opponent_id:
+                break
+            series_dates.append(game_day)
+
+        # 기준일 이후 첫 경기가 같은 상대면 시리즈 진행 중
+        future_games = [game for game in games if game[0] > game_date]
+        completed = not future_games or future_games[0][1] != opponent_id
+
+        games_per_date = defaultdict(int)
+        for game_day in series_dates:
+            games_per_date[game_day] += 1
+        wins = sum(
+            min(wins_by_team_date.get((team_id, game_day), 0), game_count)
+            for game_day, game_count in games_per_date.items()
+        )
+        games_played = len(series_dates)
+        is_sweep = completed and games_played >= SWEEP_MIN_GAMES and wins == games_played
+
+        series[team_id] = {
+            "team_id": team_id,
+            "opponent_id": opponent_id,
+            "start_date": min(series_dates),
+            "end_date": max(series_dates),
+            "games": games_played,
+            "wins": wins,
+            "completed": completed,
+            "is_sweep": is_sweep,
+        }
+        if is_sweep:
+            sweeps[team_id] = opponent_id
+
+    return series, sweeps, opponents_today
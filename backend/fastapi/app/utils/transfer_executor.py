@@ -0,0 +1,61 @@
+# utils/transfer_executor.py
+import os
+import time
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 동시에 진행하는 은행 이체 요청 수 (환경 변수로 조정 가능)
+DEFAULT_TRANSFER_CONCURRENCY = int(os.getenv("TRANSFER_CONCURRENCY", "8"))
+
+
+async def run_transfers(jobs, transfer_fn, concurrency=None, on_result=None):
+    """
+    이체 작업들을 최대 concurrency개까지 동시에 실행합니다.
+    transfer_fn은 공유 AsyncClient로 호출하는 코루틴이므로 이벤트 루프 하나에서 세마포어로 동시 실행 수만 제한합니다.
+    한 작업의 실패는 다른 작업에 영향을 주지 않습니다.
+
+    Args:
+        jobs (list): dict 목록 {"account_id": 계정 ID, "kwargs": transfer_fn에 넘길 인자}
+        transfer_fn (callable): 이체 코루틴 함수 (예: user_ssafy_api_utils.transfer_money)
+        concurrency (int, optional): 최대 동시 이체 수. 기본값은 TRANSFER_CONCURRENCY (8)
+        on_result (callable, optional): 이체 하나가 끝날 때마다 (job, 결과)로 호출 (저널 기록 등)
+
+    Returns:
+        list: jobs와 같은 순서의 결과 dict 목록
+              {"account_id", "success", "result", "error", "error_code", "elapsed_ms"}
+    """
+    if not jobs:
+        return []
+    if concurrency is None:
+        concurrency = DEFAULT_TRANSFER_CONCURRENCY
+    concurrency = max(1, min(int(concurrency), len(jobs)))
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(job):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await transfer_fn(**job["kwargs"])
+                outcome = {"account_id": job["account_id"], "success": True, "result": result, "error": None,
+                           "error_code": None}
+            except Exception as e:
+                logger.error(f"계정 ID {job['account_id']} 이체 처리 중 오류: {str(e)}")
+                # 은행 응답 코드 (BankAPIError.code). 연결 오류 등 응답을 받지 못했으면 None
+                outcome = {"account_id": job["account_id"], "success": False, "result": None, "error": str(e),
+                           "error_code": getattr(e, "code", None)}
+            outcome["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        if on_result is not None:
+            on_result(job, outcome)
+        return outcome
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(run_one(job) for job in jobs))
+
+    elapsed = time.perf_counter() - started
+    succeeded = sum(1 for outcome in outcomes if outcome["success"])
+    logger.info(f"이체 {len(jobs)}건 실행 완료 (동시 {concurrency}개): 성공 {succeeded}건, "
+                f"실패 {len(jobs) - succeeded}건, {elapsed:.2f}초")
+    return outcomes
@@ -0,0 +1,102 @@
+# utils/transfer_journal.py
+import logging
+from datetime import datetime
+
+import models
+from utils.api_header_utils import generate_institution_transaction_unique_no
+from router.user.user_ssafy_api_utils import DUPLICATE_TRANSACTION_CODE
+
+logger = logging.getLogger(__name__)
+
+# 이체 저널 상태
+STATUS_PENDING = "PENDING"      # 멱등 키를 발급했고 아직 성공을 확인하지 못함 (다음 실행 때 같은 키로 재시도)
+STATUS_COMPLETED = "COMPLETED"  # 이체 완료 (다시 보내지 않음)
+STATUS_FAILED = "FAILED"        # 은행이 거절함 (돈이 움직이지 않았으므로 다음 실행 때 새 키로 재시도)
+
+
+def open_journal_entries(db, date_param, transfers):
+    """
+    이체를 보내기 전에 DailyTransfer 행별 저널 항목을 준비하고 커밋합니다. (write-ahead)
+    같은 계정/날짜에 DailyTransfer가 여러 개 있어도 행마다 항목과 멱등 키가 따로 있습니다.
+
+    - 항목이 없으면 새 멱등 키로 PENDING 항목을 만듭니다.
+    - PENDING 항목은 이전 실행에서 보냈는지 알 수 없으므로 같은 키를 그대로 사용합니다.
+      (은행이 같은 기관거래고유번호를 중복으로 거절하면 이미 처리된 것으로 봅니다)
+    - FAILED 항목은 새 키를 발급해 PENDING으로 되돌립니다.
+    - COMPLETED 항목은 그대로 두고, 호출한 쪽에서 건너뜁니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        date_param (date): 이체 날짜
+        transfers (list): (DailyTransfer ID, 계정 ID, 금액) 목록
+
+    Returns:
+        dict: DailyTransfer ID → TransferJournal
+    """
+    daily_transfer_ids = [daily_transfer_id for daily_transfer_id, _, _ in transfers]
+    existing = {}
+    if daily_transfer_ids:
+        existing = {
+            entry.DAILY_TRANSFER_ID: entry
+            for entry in db.query(models.TransferJournal).filter(
+                models.TransferJournal.DAILY_TRANSFER_ID.in_(daily_transfer_ids)
+            ).all()
+        }
+
+    entries = {}
+    resumed = 0
+    for daily_transfer_id, account_id, amount in transfers:
+        entry = existing.get(daily_transfer_id)
+        if entry is None:
+            entry = models.TransferJournal(
+                DAILY_TRANSFER_ID=daily_transfer_id,
+                ACCOUNT_ID=account_id,
+                DATE=date_param,
+                AMOUNT=amount,
+                IDEMPOTENCY_KEY=generate_institution_transaction_unique_no(),
+                STATUS=STATUS_PENDING,
+                ATTEMPTS=0
+            )
+            db.add(entry)
+        elif entry.STATUS == STATUS_FAILED:
+            entry.IDEMPOTENCY_KEY = generate_institution_transaction_unique_no()
+            entry.STATUS = STATUS_PENDING
+            entry.AMOUNT = amount
+        elif entry.STATUS == STATUS_PENDING:
+            resumed += 1
+        entries[daily_transfer_id] = entry
+
+    db.commit()
+    if resumed:
+        logger.info(f"[{date_param}] 이전 실행에서 끝나지 않은 이체 {resumed}건을 같은 멱등 키로 재시도합니다.")
+    return entries
+
+
+def record_outcome(db, entry, outcome):
+    """
+    이체 결과를 저널 항목에 반영합니다. 커밋은 호출한 쪽에서 계정 잔액 갱신과 함께 합니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        entry (TransferJournal): 저널 항목
+        outcome (dict): run_transfers() 결과 항목
+
+    Returns:
+        bool: 이체가 완료되었으면 True
+    """
+    entry.ATTEMPTS = (entry.ATTEMPTS or 0) + 1
+    entry.updated_at = datetime.now()
+
+    if outcome["success"] or outcome.get("error_code") == DUPLICATE_TRANSACTION_CODE:
+        if not outcome["success"]:
+            logger.info(f"계정 ID {entry.ACCOUNT_ID} (DailyTransfer {entry.DAILY_TRANSFER_ID}): 멱등 키 {entry.IDEMPOTENCY_KEY}는 이미 처리된 이체입니다.")
+        entry.STATUS = STATUS_COMPLETED
+        entry.ERROR_MESSAGE = None
+        return True
+
+    entry.ERROR_MESSAGE = (outcome.get("error") or "")[:255]
+    if outcome.get("error_code"):
+        # 은행이 응답 코드로 거절한 경우 - 이체되지 않았음이 확실함
+        entry.STATUS = STATUS_FAILED
+    # 응답 코드가 없으면(연결 끊김, 타임아웃 등) 처리 여부를 알 수 없으므로 PENDING 유지
+    return False
@@ -0,0 +1,90 @@
+# utils/transfer_plan.py
+import logging
+from collections import namedtuple
+from sqlalchemy import and_
+
+import models
+
+logger = logging.getLogger(__name__)
+
+# 메시지가 없을 때 사용하는 기본 거래 메시지
+DEFAULT_TRANSFER_TEXT = "야금야금 출금"
+
+# 이체 한 건을 실행하는 데 필요한 값 (ORM 객체 없이 값만 보관)
+TransferPlanItem = namedtuple("TransferPlanItem", [
+    "daily_transfer_id", "account_id", "amount", "user_key", "withdrawal_account", "deposit_account", "llm_text"
+])
+
+
+def load_transfer_plan(db, date_param):
+    """
+    날짜의 DailyTransfer와 계정/사용자/거래 메시지를 조인 쿼리 한 번으로 불러와 이체 계획을 만듭니다.
+    계정이나 사용자를 찾을 수 없는 이체는 기존처럼 건너뜁니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        date_param (date): 이체 날짜
+
+    Returns:
+        dict: {
+            "items": [TransferPlanItem, ...] (DAILY_TRANSFER_ID 순),
+            "skipped": [(DailyTransfer 계정 ID, 사유), ...],
+            "total_amount": 계획된 이체 총액
+        }
+    """
+    rows = db.query(
+        models.DailyTransfer.DAILY_TRANSFER_ID,
+        models.DailyTransfer.ACCOUNT_ID,
+        models.DailyTransfer.AMOUNT,
+        models.Account.ACCOUNT_ID.label("FOUND_ACCOUNT_ID"),
+        models.Account.SOURCE_ACCOUNT,
+        models.Account.ACCOUNT_NUM,
+        models.User.USER_ID,
+        models.User.USER_KEY,
+        models.TransactionMessage.MESSAGE
+    ).outerjoin(
+        models.Account, models.DailyTransfer.ACCOUNT_ID == models.Account.ACCOUNT_ID
+    ).outerjoin(
+        models.User, models.Account.USER_ID == models.User.USER_ID
+    ).outerjoin(
+        models.TransactionMessage, and_(
+            models.TransactionMessage.ACCOUNT_ID == models.DailyTransfer.ACCOUNT_ID,
+            models.TransactionMessage.TRANSACTION_DATE == date_param
+        )
+    ).filter(
+        models.DailyTransfer.DATE == date_param
+    ).order_by(
+        models.DailyTransfer.DAILY_TRANSFER_ID, models.TransactionMessage.TRANSACTION_ID
+    ).all()
+
+    items = []
+    skipped = []
+    seen = set()
+    for row in rows:
+        # 같은 날짜에 메시지가 여러 개면 첫 번째 메시지만 사용
+        if row.DAILY_TRANSFER_ID in seen:
+            continue
+        seen.add(row.DAILY_TRANSFER_ID)
+
+        if row.FOUND_ACCOUNT_ID is None:
+            logger.warning(f"계정 ID {row.ACCOUNT_ID}를 찾을 수 없습니다. 이체를 건너뜁니다.")
+            skipped.append((row.ACCOUNT_ID, "account_not_found"))
+            continue
+        if row.USER_ID is None:
+            logger.warning(f"계정 ID {row.ACCOUNT_ID}의 사용자 정보를 찾을 수 없습니다. 이체를 건너뜁니다.")
+            skipped.append((row.ACCOUNT_ID, "user_not_found"))
+            continue
+
+        items.append(TransferPlanItem(
+            daily_transfer_id=row.DAILY_TRANSFER_ID,
+            account_id=row.ACCOUNT_ID,
+            amount=row.AMOUNT,
+            user_key=row.USER_KEY,
+            withdrawal_account=row.SOURCE_ACCOUNT,  # 출금 계좌 (입출금 계좌)
+            deposit_account=row.ACCOUNT_NUM,        # 입금 계좌 (적금 계좌)
+            llm_text=row.MESSAGE or DEFAULT_TRANSFER_TEXT
+        ))
+
+    total_amount = sum(item.amount or 0 for item in items)
+    logger.info(f"[{date_param}] 이체 계획: {len(items)}건, 총 {total_amount}원 (건너뜀 {len(skipped)}건)")
+    return {"items": items, "skipped": skipped, "total_amount": total_amount}
@@ -1,7 +1,8 @@
 # update_daily_balances.py
 import os
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine, func
+from sqlalchemy import create_engine, func, and_, select, literal, Date, Integer
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from datetime import date, datetime, timedelta
 import asyncio
 import logging
@@ -20,6 +21,8 @@ import sys
 sys.path.append(project_root)
 import models
 from database import engine
+from utils.account_stream import JobMemory
+from utils.interest_engine import calculate_interest_for_date
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -35,6 +38,8 @@ async def update_daily_balances(db, date_param=None):
     """
     모든 계정의 일일 잔액을 daily_balances 테이블에 기록합니다.
     해당 날짜의 기록이 이미 있으면 업데이트하고, 없으면 새로 생성합니다.
+    INSERT ... SELECT FROM account ... ON DUPLICATE KEY UPDATE 한 번으로 처리하므로
+    계정 수와 관계없이 쿼리 수가 일정합니다. (daily_balances (ACCOUNT_ID, DATE) 유니크 키 필요)
     
     Args:
         db (Session): 데이터베이스 세션
@@ -48,43 +53,35 @@ async def update_daily_balances(db, date_param=None):
         date_param = datetime.now().date()
     
     logger.info(f"[{date_param}] 일일 잔액 기록 시작...")
-    
-    processed_accounts = 0
-    new_records = 0
-    updated_records = 0
+    memory = JobMemory()
     
     try:
-        # 모든 계정 조회
-        accounts = db.query(models.Account).all()
-        
-        for account in accounts:
-            # 해당 날짜의 기존 기록 조회
-            daily_balance = db.query(models.DailyBalances).filter(
-                models.DailyBalances.ACCOUNT_ID == account.ACCOUNT_ID,
+        # 요약용 건수: 전체 계정 수와 그중 해당 날짜 기록이 이미 있는 계정 수
+        processed_accounts, updated_records = db.query(
+            func.count(models.Account.ACCOUNT_ID),
+            func.count(models.DailyBalances.DAILY_BALANCES_ID)
+        ).outerjoin(
+            models.DailyBalances, and_(
+                models.DailyBalances.ACCOUNT_ID == models.Account.ACCOUNT_ID,
                 models.DailyBalances.DATE == date_param
-            ).first()
-            
-            # 기본 이자 금액은 0으로 설정 (이자 계산은 별도 함수에서 처리)
-            daily_interest = 0
-            
-            if daily_balance:
-                # 기존 기록이 있으면 업데이트
-                daily_balance.CLOSING_BALANCE = account.TOTAL_AMOUNT
-                updated_records += 1
-                logger.debug(f"계정 ID {account.ACCOUNT_ID}: 잔액 기록 업데이트 ({daily_balance.CLOSING_BALANCE}원)")
-            else:
-                # 기존 기록이 없으면 새로 생성
-                daily_balance = models.DailyBalances(
-                    ACCOUNT_ID=account.ACCOUNT_ID,
-                    DATE=date_param,
-                    CLOSING_BALANCE=account.TOTAL_AMOUNT,
-                    DAILY_INTEREST=daily_interest
-                )
-                db.add(daily_balance)
-                new_records += 1
-                logger.debug(f"계정 ID {account.ACCOUNT_ID}: 새 잔액 기록 생성 ({account.TOTAL_AMOUNT}원)")
-            
-            processed_accounts += 1
+            )
+        ).one()
+        new_records = processed_accounts - updated_records
+        
+        # 기본 이자 금액은 0으로 설정 (이자 계산은 별도 함수에서 처리)
+        # 기존 기록은 잔액만 갱신하고 이자는 그대로 둠
+        daily_balances_table = models.DailyBalances.__table__
+        stmt = mysql_insert(daily_balances_table).from_select(
+            ["ACCOUNT_ID", "DATE", "CLOSING_BALANCE", "DAILY_INTEREST"],
+            select(
+                models.Account.ACCOUNT_ID,
+                literal(date_param, Date),
+                models.Account.TOTAL_AMOUNT,
+                literal(0, Integer)
+            )
+        )
+        stmt = stmt.on_duplicate_key_update(CLOSING_BALANCE=stmt.inserted.CLOSING_BALANCE)
+        db.execute(stmt)
         
         # 변경사항 커밋
         db.commit()
@@ -93,10 +90,11 @@ async def update_daily_balances(db, date_param=None):
             "date": date_param,
             "processed_accounts": processed_accounts,
             "new_records": new_records,
-            "updated_records": updated_records
+            "updated_records": updated_records,
+            **memory.summary()
         }
         
-        logger.info(f"[{date_param}] 일일 잔액 기록 완료: {processed_accounts}개 계정 처리 ({new_records}개 신규, {updated_records}개 업데이트)")
+        logger.info(f"[{date_param}] 일일 잔액 기록 완료: {processed_accounts}개 계정 처리 ({new_records}개 신규, {updated_records}개 업데이트), 메모리 증가 {summary['rss_delta_mb']}MB")
         return summary
         
     except Exception as e:
@@ -108,6 +106,7 @@ async def calculate_daily_interest(db, date_param=None):
     """
     모든 계정의 일일 이자를 계산하고 daily_balances 테이블에 기록합니다.
     전날의 잔액을 기준으로 이자를 계산합니다.
+    잔액과 미션 이자율을 집계 쿼리로 한 번에 불러와 배열 연산으로 계산하고 한 번에 기록합니다. (interest_engine)
     
     Args:
         db (Session): 데이터베이스 세션
@@ -125,55 +124,13 @@ async def calculate_daily_interest(db, date_param=None):
     
     logger.info(f"[{date_param}] 일일 이자 계산 시작... (전날({previous_date}) 잔액 기준)")
     
-    processed_accounts = 0
-    total_interest = 0
-    
     try:
-        # 해당 날짜에 잔액 기록이 있는 모든 계정 조회
-        daily_balances = db.query(models.DailyBalances).filter(
-            models.DailyBalances.DATE == date_param
-        ).all()
-        
-        for daily_balance in daily_balances:
-            # 계정 정보 조회
-            account = db.query(models.Account).filter(
-                models.Account.ACCOUNT_ID == daily_balance.ACCOUNT_ID
-            ).first()
-            
-            if not account:
-                logger.warning(f"계정 ID {daily_balance.ACCOUNT_ID}를 찾을 수 없습니다.")
-                continue
-            
-            # 전날의 잔액 기록 조회
-            previous_balance = db.query(models.DailyBalances).filter(
-                models.DailyBalances.ACCOUNT_ID == daily_balance.ACCOUNT_ID,
-                models.DailyBalances.DATE == previous_date
-            ).first()
-            
-            # 전날 기록이 없으면 이자는 0으로 설정
-            if not previous_balance:
-                logger.info(f"계정 ID {daily_balance.ACCOUNT_ID}: 전날({previous_date}) 잔액 기록이 없습니다. 이자는 0원으로 설정.")
-                daily_balance.DAILY_INTEREST = 0
-                processed_accounts += 1
-                continue
-            
-            # 이자율 조회 (실제 이자율은 계정 정보와 미션 달성에 따라 계산)
-            # 기본 이자율 + 우대 이자율 계산
-            from router.mission import mission_crud
-            interest_details = mission_crud.calculate_account_interest_details(db, account.ACCOUNT_ID)
-            total_interest_rate = interest_details['total_interest_rate']
-            
-            # 일일 이자 계산 (연이율 / 365 * 전날 잔액)
-            daily_interest_rate = total_interest_rate / 100 / 365
-            daily_interest_amount = round(previous_balance.CLOSING_BALANCE * daily_interest_rate)
-            
-            # daily_balances 테이블 업데이트
-            daily_balance.DAILY_INTEREST = daily_interest_amount
-            
-            processed_accounts += 1
-            total_interest += daily_interest_amount
-            
-            logger.info(f"계정 ID {daily_balance.ACCOUNT_ID}: 전날 잔액 {previous_balance.CLOSING_BALANCE}원, 이자율 {daily_interest_rate}%, 일일 이자 {daily_interest_amount}원")
+        # 잔액/이자율 조회와 이자 계산, 기록을 계정 수와 관계없이 일정한 쿼리 수로 처리
+        result = calculate_interest_for_date(db, date_param, previous_date)
+        processed_accounts = result["processed_accounts"]
+        total_interest = result["total_interest"]
+        if result["missing_previous"]:
+            logger.info(f"전날({previous_date}) 잔액 기록이 없는 계정 {result['missing_previous']}개는 이자를 0원으로 설정.")
         
         # 변경사항 커밋
         db.commit()
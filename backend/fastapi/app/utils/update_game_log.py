@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 import sys
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
@@ -26,6 +27,7 @@ sys.path.append(project_root)
 # models 모듈 import
 import models
 from database import engine
+from utils.account_stream import iter_account_chunks, JobMemory
 # 데이터베이스 연결 설정
 Session = sessionmaker(bind=engine)
 session = Session()
@@ -60,19 +62,34 @@ record_type_mapping = {
     '경기결과': None  # 이 값은 처리 시 변경됩니다
 }
 
-async def update_team_victory_missions(db_session):
+async def update_team_victory_missions(db_session, chunk_size=None, effective_date=None):
     """
     팀의 승리 횟수를 체크하고, 10승마다 해당 팀을 응원하는 유저들의 미션 카운트를 업데이트합니다.
+    계정은 팀별로 ACCOUNT_ID 순 청크 단위로 읽습니다.
+    카운트가 늘어난 계정은 effective_date부터의 이자만 묶음 단위로 다시 계산합니다.
     
     Args:
         db_session (Session): 데이터베이스 세션
+        chunk_size (int, optional): 청크당 계정 수. 기본값은 ACCOUNT_CHUNK_SIZE (500)
+        effective_date (date, optional): 늘어난 우대 금리를 적용하기 시작하는 날짜. 기본값은 오늘
+    
+    Returns:
+        dict: 처리 결과 요약 정보 (미션이 없으면 None)
     """
-    from utils.interest_utils import recalculate_interest_history
+    from utils.interest_utils import recalculate_interest_history_batch
+    from utils.account_rate import refresh_account_rates
+    
+    if effective_date is None:
+        effective_date = date.today()
     
     logger.info("팀 승리 미션 업데이트 시작...")
+    memory = JobMemory()
     
     # 이자 재계산이 필요한 계정 ID 목록
     accounts_to_recalculate = []
+    changed_accounts = set()
+    processed_accounts = 0
+    updated_missions = 0
     
     # 1. 미션 정보 가져오기 ("응원팀 10승당 우대금리" 미션)
     team_victory_mission = db_session.query(models.Mission).filter(
@@ -100,78 +117,103 @@ async def update_team_victory_missions(db_session):
         logger.info(f"팀 {team_name}(ID: {team_id}) 처리 중...")
         logger.info(f"현재 총 승리 횟수: {total_wins}")
         
-        # 3. 해당 팀을 응원하는 계정들 조회
-        team_accounts = db_session.query(models.Account).filter(
+        # 3. 해당 팀을 응원하는 계정 ID를 청크 단위로 조회 (전체 계정 객체를 한 번에 올리지 않음)
+        account_query = db_session.query(models.Account.ACCOUNT_ID).filter(
             models.Account.TEAM_ID == team_id
-        ).all()
-        
-        if not team_accounts:
-            logger.info(f"팀 {team_name}을 응원하는 계정이 없습니다.")
-            continue
-            
-        logger.info(f"팀 {team_name}을 응원하는 계정 수: {len(team_accounts)}")
+        )
+        new_count = total_wins // 10  # 10승당 1 카운트
+        team_account_count = 0
         
-        # 4. 각 계정별로 미션 업데이트
-        for account in team_accounts:
-            account_id = account.ACCOUNT_ID
-            
-            # 4.1. 해당 미션이 이미 등록되어 있는지 확인
-            used_mission = db_session.query(models.UsedMission).filter(
-                models.UsedMission.ACCOUNT_ID == account_id,
-                models.UsedMission.MISSION_ID == mission_id
-            ).first()
-            
-            if not used_mission:
-                # 4.2. 미션이 등록되어 있지 않으면 새로 생성
-                used_mission = models.UsedMission(
-                    ACCOUNT_ID=account_id,
-                    MISSION_ID=mission_id,
-                    COUNT=0,  # 초기 카운트 0
-                    MAX_COUNT=mission_max_count,
-                    MISSION_RATE=mission_rate,
-                    created_at=datetime.now()
-                )
-                db_session.add(used_mission)
-                db_session.flush()
-                logger.info(f"계정 ID {account_id}에 미션 신규 등록")
-            
-            # 4.3. 현재 미션 카운트 확인
-            current_count = used_mission.COUNT
+        for accounts in iter_account_chunks(account_query, chunk_size, memory):
+            account_ids = [account.ACCOUNT_ID for account in accounts]
+            team_account_count += len(account_ids)
             
-            # 4.4. 총 승리 횟수를 10으로 나눈 몫이 현재 카운트보다 크면 업데이트
-            new_count = total_wins // 10  # 10승당 1 카운트
+            # 청크에 속한 계정들의 미션 등록 정보를 한 번에 조회
+            used_missions = {
+                used_mission.ACCOUNT_ID: used_mission
+                for used_mission in db_session.query(models.UsedMission).filter(
+                    models.UsedMission.ACCOUNT_ID.in_(account_ids),
+                    models.UsedMission.MISSION_ID == mission_id
+                ).all()
+            }
             
-            if new_count > current_count:
+            # 4. 각 계정별로 미션 업데이트
+            for account_id in account_ids:
+                # 4.1. 해당 미션이 이미 등록되어 있는지 확인
+                used_mission = used_missions.get(account_id)
+                
+                if not used_mission:
+                    # 4.2. 미션이 등록되어 있지 않으면 새로 생성
+                    used_mission = models.UsedMission(
+                        ACCOUNT_ID=account_id,
+                        MISSION_ID=mission_id,
+                        COUNT=0,  # 초기 카운트 0
+                        MAX_COUNT=mission_max_count,
+                        MISSION_RATE=mission_rate,
+                        created_at=datetime.now()
+                    )
+                    db_session.add(used_mission)
+                    logger.info(f"계정 ID {account_id}에 미션 신규 등록")
+                
+                # 4.3. 현재 미션 카운트 확인
+                current_count = used_mission.COUNT
+                
+                # 4.4. 총 승리 횟수를 10으로 나눈 몫이 현재 카운트보다 크면 업데이트
                 # 최대 카운트를 초과하지 않도록 체크
-                if new_count > used_mission.MAX_COUNT:
-                    new_count = used_mission.MAX_COUNT
+                target_count = min(new_count, used_mission.MAX_COUNT)
                 
                 # 카운트가 실제로 증가했을 때만 기록 남기기
-                if new_count > current_count:
-                    old_count = current_count
-                    used_mission.COUNT = new_count
-                    logger.info(f"계정 ID {account_id}의 미션 카운트 업데이트: {old_count} -> {new_count}")
+                if target_count > current_count:
+                    used_mission.COUNT = target_count
+                    updated_missions += 1
+                    logger.info(f"계정 ID {account_id}의 미션 카운트 업데이트: {current_count} -> {target_count}")
                     
                     # 이자 재계산이 필요한 계정으로 추가
                     accounts_to_recalculate.append(account_id)
+                    changed_accounts.add(account_id)
                     
                     # 최대 카운트에 도달했는지 체크
-                    if new_count >= used_mission.MAX_COUNT:
+                    if target_count >= used_mission.MAX_COUNT:
                         logger.info(f"계정 ID {account_id}의 미션 카운트가 최대치({used_mission.MAX_COUNT})에 도달했습니다.")
+            
+            # 청크 단위로 반영해 세션에 객체가 쌓이지 않도록 함
+            db_session.flush()
+            
+            # 미션이 새로 등록되었거나 카운트가 바뀐 계정의 적용 이자율 갱신 (커밋과 같은 트랜잭션)
+            changed_account_ids = [
+                account_id for account_id in account_ids
+                if account_id not in used_missions or account_id in changed_accounts
+            ]
+            if changed_account_ids:
+                refresh_account_rates(db_session, changed_account_ids)
+        
+        if team_account_count == 0:
+            logger.info(f"팀 {team_name}을 응원하는 계정이 없습니다.")
+        else:
+            logger.info(f"팀 {team_name}을 응원하는 계정 수: {team_account_count}")
+        processed_accounts += team_account_count
     
     # 변경사항 커밋
     db_session.commit()
     
-    # 비동기 이자 재계산 실행
+    # 이자 재계산 실행 (적용일 이후만, 계정 묶음마다 bulk UPDATE 한 번)
     if accounts_to_recalculate:
-        logger.info(f"{len(accounts_to_recalculate)}개 계정의 이자 소급 재계산 실행")
+        logger.info(f"{len(accounts_to_recalculate)}개 계정의 이자 재계산 실행 ({effective_date}부터)")
         
-        for account_id in accounts_to_recalculate:
-            await recalculate_interest_history(db_session, account_id)
+        await recalculate_interest_history_batch(
+            db_session, accounts_to_recalculate, from_date=effective_date, batch_size=chunk_size
+        )
         
-        logger.info(f"{len(accounts_to_recalculate)}개 계정의 이자 소급 재계산 완료")
+        logger.info(f"{len(accounts_to_recalculate)}개 계정의 이자 재계산 완료")
     
-    logger.info("팀 승리 미션 업데이트 완료")
+    summary = {
+        "processed_accounts": processed_accounts,
+        "updated_missions": updated_missions,
+        "recalculated_accounts": len(accounts_to_recalculate),
+        **memory.summary()
+    }
+    logger.info(f"팀 승리 미션 업데이트 완료: {summary}")
+    return summary
 
 def process_json_game_logs(json_dir="baseball_data/json_data"):
     """
@@ -315,7 +357,7 @@ def process_json_game_logs(json_dir="baseball_data/json_data"):
     # 팀 승리 미션 업데이트 실행
     try:
         logger.info("팀 승리 관련 미션 업데이트 시작...")
-        update_team_victory_missions(session)
+        asyncio.run(update_team_victory_missions(session))
         session.commit()
         logger.info("팀 승리 관련 미션 업데이트 완료")
     except Exception as e:
@@ -334,7 +376,7 @@ if __name__ == "__main__":
         
         # 직접 미션 업데이트 함수 호출 추가
         logger.info("팀 승리 미션 직접 업데이트 시작...")
-        update_team_victory_missions(session)
+        asyncio.run(update_team_victory_missions(session))
         logger.info("팀 승리 미션 직접 업데이트 완료")
     except Exception as e:
         logger.error(f"처리 중 오류 발생: {str(e)}")